@@ -0,0 +1,102 @@
+"""
+Casos de benchmark dos caminhos quentes da estação
+
+Cada caso prepara os objetos fora da medição e retorna a chamada medida.
+"""
+from bench_runner import case
+
+# Leitura típica do ciclo, usada nos casos do display
+SAMPLE = {
+    'bmp_temp': 24.37, 'bmp_pressure': 101325.0, 'bmp_altitude': 12.4,
+    'dht_temp': 24, 'dht_humidity': 61,
+    'rain_value': 3580, 'rain_status': "Seco",
+}
+
+def _pulses(values):
+    """Durações dos 40 pulsos do DHT11 para os bytes dados (bit 1 = 70 us, bit 0 = 26 us)"""
+    from array import array
+    pulses = array('H')
+    for byte in values:
+        for bit in range(7, -1, -1):
+            pulses.append(70 if byte >> bit & 1 else 26)
+    return pulses
+
+@case("bmp280.read", 20)
+def bmp280_read(rig):
+    from bmp280 import BMP280
+    return BMP280(rig.i2c, rig.bmp_addr).read
+
+@case("bmp280.read_calibration", 50)
+def bmp280_calibration(rig):
+    from bmp280 import BMP280
+    return BMP280(rig.i2c, rig.bmp_addr)._read_calibration
+
+@case("dht11.decode", 200)
+def dht11_decode(rig):
+    import dht11
+    pulses = _pulses((61, 0, 24, 0, 85))
+    data = bytearray(5)
+
+    def decode():
+        if dht11.decode(pulses, data) is None:
+            raise ValueError("checksum")
+    return decode
+
+@case("read_rain_sensor", 2)
+def read_rain_sensor(rig):
+    station = rig.station
+    station.rain_sensor = rig.rain_adc
+    return station.read_rain_sensor
+
+@case("st7789.text", 5)
+def st7789_text(rig):
+    d = rig.display()
+    return lambda: d.text("Weather Station", 5, 5, d.CYAN)
+
+@case("st7789.fill_rect", 20)
+def st7789_fill_rect(rig):
+    d = rig.display()
+    return lambda: d.fill_rect(10, 40, 100, 50, d.BLUE)
+
+@case("st7789.fill", 2)
+def st7789_fill(rig):
+    d = rig.display()
+    return lambda: d.fill(d.BLACK)
+
+@case("update_display_data", 3)
+def update_display_data(rig):
+    station = rig.station
+    station.display = rig.display()
+    return lambda: station.update_display_data(SAMPLE, 123, 0)
+
+@case("filters.apply", 200)
+def filters_apply(rig):
+    from array import array
+    from filters import StreamFilter
+    import reading
+    f = StreamFilter(rig.station.FILTERS)
+    values = array('i', [2437, 101325, 2400, 6100, 3580])
+    flags = reading.encode(SAMPLE, values)
+    state = [0]
+
+    def apply():
+        state[0] += 8
+        values[0] = 2437 + (state[0] & 15)
+        f.apply(state[0], flags, values)
+    return apply
+
+@case("alerts.update", 200)
+def alerts_update(rig):
+    from array import array
+    from alerts import AlertEngine
+    import reading
+    engine = AlertEngine(rig.station.ALERT_RULES)
+    values = array('i', [2437, 101325, 2400, 6100, 3580])
+    flags = reading.encode(SAMPLE, values)
+    state = [0]
+
+    def update():
+        state[0] += 8
+        values[4] = 3580 + (state[0] & 15)
+        engine.update(state[0], flags, values)
+    return update
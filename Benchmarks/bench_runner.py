@@ -0,0 +1,279 @@
+"""
+Executor dos benchmarks (roda no ESP32 e no CPython)
+
+Mede o tempo por chamada de cada caso registrado em bench_cases.py e
+conta as operações de barramento (transações I2C, escritas SPI, pinos,
+leituras do ADC) feitas em uma chamada, por meio de proxies em volta
+dos periféricos. O resultado vai para um JSON e pode ser comparado com
+um resultado anterior (baseline).
+
+No ESP32 (com bench_runner.py, bench_cases.py e as bibliotecas na placa):
+    import bench_runner
+    bench_runner.run(out="bench.json", baseline="bench_base.json")
+
+No computador, com o hardware simulado: Benchmarks/run_benchmarks.py
+"""
+import gc
+import json
+import sys
+import time
+
+try:
+    from time import perf_counter
+    # CPython (também com o simulador, cujo time repassa o relógio real)
+
+    def now_us():
+        return int(perf_counter() * 1000000)
+
+    def elapsed_us(t0):
+        return now_us() - t0
+except ImportError:
+    def now_us():
+        return time.ticks_us()
+
+    def elapsed_us(t0):
+        return time.ticks_diff(time.ticks_us(), t0)
+
+COUNTERS = ("i2c", "i2c_bytes", "spi_writes", "spi_bytes", "pin_writes", "adc_reads")
+REGRESSION = 0.10              # Variação de tempo considerada significativa (10%)
+
+# --- Contagem das operações de barramento ---
+
+class Counters:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for name in COUNTERS:
+            setattr(self, name, 0)
+
+    def snapshot(self):
+        return [getattr(self, name) for name in COUNTERS]
+
+class CountingI2C:
+    """Proxy de machine.I2C que conta transações e bytes"""
+    def __init__(self, i2c, counters):
+        self._i2c = i2c
+        self._c = counters
+
+    def scan(self):
+        self._c.i2c += 1
+        return self._i2c.scan()
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *args, **kwargs):
+        self._c.i2c += 1
+        self._c.i2c_bytes += nbytes
+        return self._i2c.readfrom_mem(addr, memaddr, nbytes, *args, **kwargs)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *args, **kwargs):
+        self._c.i2c += 1
+        self._c.i2c_bytes += len(buf)
+        return self._i2c.readfrom_mem_into(addr, memaddr, buf, *args, **kwargs)
+
+    def writeto_mem(self, addr, memaddr, buf, *args, **kwargs):
+        self._c.i2c += 1
+        self._c.i2c_bytes += len(buf)
+        return self._i2c.writeto_mem(addr, memaddr, buf, *args, **kwargs)
+
+    def readfrom(self, addr, nbytes, *args):
+        self._c.i2c += 1
+        self._c.i2c_bytes += nbytes
+        return self._i2c.readfrom(addr, nbytes, *args)
+
+    def writeto(self, addr, buf, *args):
+        self._c.i2c += 1
+        self._c.i2c_bytes += len(buf)
+        return self._i2c.writeto(addr, buf, *args)
+
+class CountingSPI:
+    """Proxy de machine.SPI que conta escritas e bytes"""
+    def __init__(self, spi, counters):
+        self._spi = spi
+        self._c = counters
+
+    def write(self, buf):
+        self._c.spi_writes += 1
+        self._c.spi_bytes += len(buf)
+        return self._spi.write(buf)
+
+    def __getattr__(self, name):
+        return getattr(self._spi, name)
+
+class CountingPin:
+    """Proxy de machine.Pin que conta as escritas (ex.: o pino DC do display)"""
+    def __init__(self, pin, counters):
+        self._pin = pin
+        self._c = counters
+
+    def value(self, v=None):
+        if v is None:
+            return self._pin.value()
+        self._c.pin_writes += 1
+        self._pin.value(v)
+
+    def on(self):
+        self._c.pin_writes += 1
+        self._pin.on()
+
+    def off(self):
+        self._c.pin_writes += 1
+        self._pin.off()
+
+    def __getattr__(self, name):
+        return getattr(self._pin, name)
+
+class CountingADC:
+    """Proxy de machine.ADC que conta as leituras"""
+    def __init__(self, adc, counters):
+        self._adc = adc
+        self._c = counters
+
+    def read(self):
+        self._c.adc_reads += 1
+        return self._adc.read()
+
+    def __getattr__(self, name):
+        return getattr(self._adc, name)
+
+# --- Registro dos casos ---
+
+CASES = []
+
+def case(name, number=10):
+    """
+    Registra um caso. A função recebe o Rig, faz a preparação (não medida)
+    e retorna a função sem argumentos que é medida `number` vezes.
+    """
+    def register(setup):
+        CASES.append((name, number, setup))
+        return setup
+    return register
+
+class Rig:
+    """Periféricos dos casos, com contadores, na pinagem do display_data"""
+    def __init__(self):
+        import display_data
+        from machine import I2C, Pin, ADC
+        self.station = display_data
+        self.counters = Counters()
+        self.i2c = CountingI2C(I2C(0, scl=Pin(display_data.BMP280_SCL_PIN), sda=Pin(display_data.BMP280_SDA_PIN),
+                                   freq=display_data.BMP280_I2C_FREQ), self.counters)
+        self.bmp_addr = display_data.BMP280_ADDR
+        adc = ADC(Pin(display_data.RAIN_SENSOR_PIN))
+        adc.atten(ADC.ATTN_11DB)
+        self.rain_adc = CountingADC(adc, self.counters)
+        self._display = None
+        # Relógio do hardware simulado (tempo de barramento e esperas), se houver
+        self.virtual_ns = None
+
+    def display(self):
+        """Display ST7789 (criado uma vez) com SPI e pino DC contados"""
+        if self._display is None:
+            from st7789_simplified import ST7789
+            st = self.station
+            d = ST7789(spi_sck=st.SPI_SCK, spi_mosi=st.SPI_MOSI, rst=st.RST, dc=st.DC, bl=st.BLK)
+            d.spi = CountingSPI(d.spi, self.counters)
+            d.dc = CountingPin(d.dc, self.counters)
+            self._display = d
+        return self._display
+
+# --- Execução ---
+
+def measure(fn, number, repeat, counters, virtual_ns=None):
+    """Mediana e mínimo do tempo por chamada (us) e contadores de uma chamada"""
+    counters.reset()
+    v0 = virtual_ns() if virtual_ns else 0
+    fn()
+    ops = counters.snapshot()
+    virtual = (virtual_ns() - v0) // 1000 if virtual_ns else None
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = now_us()
+        for _ in range(number):
+            fn()
+        times.append(elapsed_us(t0) / number)
+    times.sort()
+    result = {"us": round(times[len(times) // 2], 2), "min_us": round(times[0], 2), "calls": number * repeat}
+    for name, value in zip(COUNTERS, ops):
+        if value:
+            result[name] = value
+    if virtual is not None:
+        result["virtual_us"] = virtual
+    return result
+
+def run_cases(rig, names=None, repeat=5, scale=1.0):
+    """Roda os casos (todos ou os nomes dados); retorna {nome: resultado}"""
+    import bench_cases  # noqa: F401 (registra os casos)
+    results = {}
+    for name, number, setup in CASES:
+        if names and name not in names:
+            continue
+        try:
+            fn = setup(rig)
+            results[name] = measure(fn, max(1, int(number * scale)), repeat, rig.counters, rig.virtual_ns)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+        r = results[name]
+        if "error" in r:
+            print(f"✗ {name:<26} {r['error']}")
+        else:
+            ops = ", ".join(f"{k} {r[k]}" for k in COUNTERS if k in r)
+            print(f"✓ {name:<26} {r['us']:>11.1f} us  {ops}")
+    return results
+
+def report(results):
+    """Documento JSON com os resultados e o ambiente de execução"""
+    impl = sys.implementation
+    return {
+        "implementation": impl.name,
+        "version": ".".join(str(v) for v in impl.version[:3]),
+        "platform": sys.platform,
+        "results": results,
+    }
+
+def compare(current, baseline, threshold=REGRESSION):
+    """
+    Imprime a variação em relação ao baseline; retorna o número de regressões.
+    Compara o tempo mínimo, menos sensível a interrupções que a mediana.
+    """
+    base = baseline.get("results", baseline)
+    if baseline.get("implementation", current["implementation"]) != current["implementation"]:
+        print("Aviso: baseline de outra implementação - tempos não comparáveis")
+    regressions = 0
+    print(f"\n{'caso':<26} {'base min':>11} {'atual min':>11} {'variação':>9}  barramento")
+    for name, r in current["results"].items():
+        b = base.get(name)
+        if b is None or "error" in r or "error" in b:
+            print(f"{name:<26} {'-':>11} {r.get('min_us', '-'):>11}")
+            continue
+        change = (r["min_us"] - b["min_us"]) / b["min_us"] if b["min_us"] else 0
+        ops = []
+        for k in COUNTERS:
+            if r.get(k, 0) != b.get(k, 0):
+                ops.append(f"{k} {b.get(k, 0)}->{r.get(k, 0)}")
+        mark = " "
+        if change > threshold:
+            mark = "✗"
+            regressions += 1
+        elif change < -threshold:
+            mark = "✓"
+        print(f"{name:<26} {b['min_us']:>11.1f} {r['min_us']:>11.1f} {change * 100:>+8.1f}% {mark} {', '.join(ops)}")
+    return regressions
+
+def run(names=None, out="bench.json", baseline=None, repeat=5, scale=1.0, rig=None):
+    """Roda os benchmarks, grava o JSON e compara com o baseline (se houver)"""
+    rig = rig or Rig()
+    doc = report(run_cases(rig, names, repeat, scale))
+    if out:
+        with open(out, "w") as f:
+            json.dump(doc, f)
+        print(f"Resultados em {out}")
+    regressions = 0
+    if baseline:
+        try:
+            with open(baseline) as f:
+                regressions = compare(doc, json.load(f))
+        except OSError:
+            print(f"Baseline {baseline} não encontrado")
+    return doc, regressions
@@ -0,0 +1,68 @@
+"""
+Benchmarks dos caminhos quentes no CPython, com o hardware simulado
+
+Usa o mesmo bench_runner.py do ESP32 sobre a placa do Simulator
+(BMP280 em nível de registradores, ADC do sensor de chuva, SPI do
+display). Os tempos medidos são do CPython: servem para comparar antes
+e depois de uma mudança, e as contagens de operações de barramento são
+as mesmas da placa. virtual_us é o tempo que o barramento e as esperas
+levariam no ESP32, segundo o modelo do simulador.
+
+Uso (na raiz do repositório):
+    python Benchmarks/run_benchmarks.py --out bench.json
+    python Benchmarks/run_benchmarks.py --baseline bench.json --out novo.json
+    python Benchmarks/run_benchmarks.py --only bmp280.read --only st7789.text
+
+No ESP32: envie Benchmarks/bench_runner.py, Benchmarks/bench_cases.py,
+Display_data/display_data.py e as bibliotecas, e rode no REPL:
+    import bench_runner; bench_runner.run(baseline="bench_base.json")
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import json  # noqa: E402,F401 (carregado antes da troca do `time`)
+
+from Simulator import board as sim_board  # noqa: E402
+from Simulator.models import SyntheticWeather, BMP280Model, RainModel  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default="bench.json", help="Arquivo JSON dos resultados")
+    parser.add_argument("--baseline", help="Resultado anterior para comparação")
+    parser.add_argument("--only", action="append", help="Roda só este caso (pode repetir)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições (vale a mediana)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplica as chamadas por repetição")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Sai com erro se algum caso ficar mais lento que o baseline")
+    args = parser.parse_args()
+    out = os.path.abspath(args.out)
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    board = sim_board.install(sim_board.Board())
+    weather = SyntheticWeather()
+    sys.path[:0] = [HERE, os.path.join(ROOT, "Libraries"), os.path.join(ROOT, "Display_data")]
+    os.chdir(tempfile.mkdtemp(prefix="bench_flash_"))
+
+    import bench_runner
+    # O import do display_data imprime o banner de boot
+    with contextlib.redirect_stdout(io.StringIO()):
+        import display_data
+    board.attach_i2c(display_data.BMP280_ADDR, BMP280Model(weather, board.clock))
+    board.attach_adc(display_data.RAIN_SENSOR_PIN, RainModel(weather, board.clock))
+
+    rig = bench_runner.Rig()
+    rig.virtual_ns = lambda: board.clock.ns
+    _, regressions = bench_runner.run(args.only, out, baseline, args.repeat, args.scale, rig)
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 # main.py - Este arquivo roda automaticamente quando o ESP32 liga
 import time
-from machine import I2C, Pin, reset, freq, ADC
-import st7789_simplified
-from bmp280 import BMP280
-import dht
+from machine import I2C, Pin, freq, ADC
 import gc
+from array import array
+from boot_profiler import BootProfiler
+
+# Mede o custo de cada import e etapa do boot
+profiler = BootProfiler()
+
+from supervisor import Supervisor
+from governor import Governor
+import persist
+import reading
+from telemetry_events import EV_BOOT, EV_SENSOR_FAIL, EV_WIFI_UP, EV_WIFI_DOWN, EV_HISTORY_ERROR, EV_SHUTDOWN
+
+# Drivers dos sensores e do display são importados sob demanda
+# (apenas os habilitados na configuração) em safe_*_init()
+BMP280 = None
 
 print("=== ESP32 WEATHER STATION COMPLETA ===")
 print("Iniciando sistema...")
@@ -32,11 +44,128 @@ BMP280_I2C_FREQ = 50000
 BMP280_ADDR = 0x76
 SEA_LEVEL_PRESSURE = 101325
 
+# Previsão pela tendência da pressão nas últimas 3 h (requer BMP280)
+ENABLE_FORECAST = True
+STATION_ALTITUDE_M = 0         # Altitude da estação (redução ao nível do mar)
+FORECAST_SOUTHERN = True       # Hemisfério sul (estações do ano invertidas)
+
 # Configurações do sensor de chuva
 RAIN_THRESHOLD_DRY = 3000      # Valor acima = seco
 RAIN_THRESHOLD_WET = 1500      # Valor abaixo = chuva forte
 RAIN_SAMPLES = 5               # Número de amostras para média
 
+# Início da chuva por interrupção: rajada de leituras sem esperar o próximo ciclo
+ENABLE_RAIN_WATCH = True
+RAIN_DIGITAL_PIN = None        # Saída DO do módulo (LOW = molhado, pino RTC); None = vigia pelo ADC
+RAIN_WATCH_PERIOD_MS = 1000    # Sem DO: leitura do ADC por Timer (não roda em lightsleep)
+RAIN_WATCH_HYSTERESIS = 200    # Sem DO: rearma acima de RAIN_THRESHOLD_DRY + histerese
+RAIN_BURST_MS = 1000           # Intervalo do sensor de chuva durante a rajada
+RAIN_BURST_S = 60              # Duração da rajada depois do início da chuva
+
+# Alertas com histerese (faixa no display, evento "alert" em /events, mensagem MQTT)
+ENABLE_ALERTS = True
+# Nome (sem acentos, fonte do display): (canal, tipo, limiar de entrada, limiar de saída,
+# duração mínima em s). Tipos 'acima'/'abaixo' comparam o valor, 'sobe'/'desce' a
+# variação por hora (em módulo); a saída fica do lado de dentro da entrada
+ALERT_RULES = {
+    'Chuva': ('rain_value', 'abaixo', RAIN_THRESHOLD_DRY, RAIN_THRESHOLD_DRY + 200, 0),
+    'Chuva forte': ('rain_value', 'abaixo', RAIN_THRESHOLD_WET, RAIN_THRESHOLD_WET + 200, 30),
+    'Calor': ('dht_temp', 'acima', 32, 30, 600),
+    'Umidade alta': ('dht_humidity', 'acima', 90, 85, 600),
+    'Pressao caindo': ('bmp_pressure', 'desce', 150, 50, 0),     # Pa/h
+}
+
+# Ciclo de leitura
+READ_INTERVAL_MS = 8000        # Intervalo entre leituras
+
+# Filtros por canal entre a leitura e os consumidores (picos, ruído)
+ENABLE_FILTERS = True
+# Canal: (janela do Hampel, limiar em desvios, desvio mínimo, EWMA 1/2^k (0 = sem),
+#         variação máxima por segundo), valores no ponto fixo de reading.py
+FILTERS = {
+    'bmp_temp': (5, 3, 10, 1, 20),         # 0.01 °C
+    'bmp_pressure': (5, 3, 20, 1, 50),     # Pa
+    'dht_temp': (5, 3, 100, 0, 50),        # DHT11 em passos de 1 °C: sem EWMA
+    'dht_humidity': (5, 3, 200, 0, 100),   # 0.01 %
+}
+
+# Amostragem adaptativa (modo de uma thread): cada sensor tem o próprio intervalo,
+# maior com leituras estáveis e menor quando os valores mudam ou oscilam
+ENABLE_ADAPTIVE_SAMPLING = True
+# Sensor: (intervalo mínimo ms, máximo ms, ((canal, zona morta), ...)); o máximo
+# fica limitado à metade dos prazos do supervisor
+ADAPTIVE_SAMPLING = {
+    'bmp': (4000, 30000, (('bmp_temp', 0.2), ('bmp_pressure', 30))),    # °C, Pa
+    'dht': (4000, 30000, (('dht_temp', 1), ('dht_humidity', 2))),       # DHT11: passos de 1
+    'rain': (2000, 24000, (('rain_value', 100),)),                      # Contagens do ADC
+}
+
+# Modo dual-core: aquisição em uma thread (_thread), display/log/rede na principal
+ENABLE_DUAL_CORE = False
+SAMPLE_BUFFER_SIZE = 16        # Amostras no buffer circular entre as threads
+SAMPLE_POLL_MS = 100           # Intervalo de verificação do buffer
+ACQUISITION_STACK_SIZE = 8192  # Pilha da thread de aquisição
+
+# Governador de CPU: 80MHz em espera, 240MHz em rajadas de processamento
+CPU_IDLE_FREQ = 80000000
+CPU_BURST_FREQ = 240000000
+CPU_LIGHTSLEEP = False         # lightsleep entre leituras (desliga USB/serial)
+
+# Histórico na flash (log circular de registros binários de 32 bytes)
+ENABLE_HISTORY = True
+HISTORY_DIR = "/log"
+HISTORY_INTERVAL_S = 60        # Uma amostra por minuto no histórico
+HISTORY_SEGMENTS = 12          # 12 x 32KB = 384KB, ~8 dias de histórico
+HISTORY_SEGMENT_SIZE = 32768
+ROLLUP_CAPACITY = (360, 336, 365)  # Agregados por minuto (6h), hora (14d) e dia (1 ano)
+
+# Servidor web (painel no celular) - requer Wi-Fi
+ENABLE_WEBSERVER = False
+WIFI_SSID = "sua_rede"
+WIFI_PASSWORD = "sua_senha"
+WIFI_TIMEOUT_S = 15            # Tempo máximo para conectar no boot
+WIFI_CHECK_S = 10              # Intervalo de verificação da conexão
+NTP_HOST = "pool.ntp.org"      # Acerta o relógio (perdido a cada boot) ao conectar
+NETWORK_DEADLINE_MS = 600000   # Reinicia se ficar 10 min sem Wi-Fi
+WEB_PORT = 80
+WEB_MAX_CLIENTS = 4            # Conexões simultâneas (demais recebem 503)
+WEB_MAX_STREAMS = 2            # Painéis recebendo leituras ao vivo (/events)
+
+# MQTT: lotes de amostras com fila na flash quando sem conexão
+ENABLE_MQTT = False
+MQTT_BROKER = "192.168.0.10"
+MQTT_PORT = 1883
+MQTT_CLIENT_ID = "estacao-esp32"
+MQTT_TOPIC = b"estacao/lotes"
+MQTT_ALERT_TOPIC = b"estacao/alertas"
+MQTT_BATCH_SIZE = 15           # Amostras por mensagem (2 min com leituras a cada 8 s)
+MQTT_SPOOL_DIR = "/mqtt"
+MQTT_SPOOL_MAX = 256           # Lotes guardados na flash sem conexão (~8 h)
+MQTT_DRAIN_PER_S = 1           # Lotes atrasados enviados por segundo ao reconectar
+
+# Saída serial: telemetria binária e texto
+ENABLE_TELEMETRY = False       # Quadros binários (ler com Host_tools/telemetry_decoder.py)
+VERBOSITY = 2                  # 0 = só erros, 1 = + avisos, 2 = + leituras de cada ciclo
+LOG_WARN = 1
+LOG_INFO = 2
+
+# Gravação dos dados brutos dos sensores (reproduzir com Simulator/replay.py)
+ENABLE_RECORDER = False
+RECORDER_DIR = "/rec"
+RECORDER_MAX_BYTES = 524288    # ~2 dias de leituras a cada 8 s; depois para de gravar
+
+# Supervisão (watchdog de hardware)
+WDT_TIMEOUT_MS = 6000          # Reset em até 6s se o sistema travar
+SENSORS_DEADLINE_MS = 60000    # Sensores precisam de leitura válida a cada 60s
+DISPLAY_DEADLINE_MS = 60000    # Display precisa atualizar a cada 60s
+
+# Boot rápido após reset "quente" (watchdog, software, deep sleep)
+FAST_BOOT = True               # Pula atrasos cosméticos e reusa descoberta de sensores
+COLD_BOOT_DIAGNOSTICS = True   # Mostra sequência completa de boot ao ligar a placa
+WARM_RESET_CAUSES = ('WDT', 'SOFT', 'DEEPSLEEP')
+BOOT_CACHE_FILE = "boot_cache.json"
+BOOT_PROFILE_FILE = "boot_profile.json"
+
 # Variáveis globais
 display = None
 bmp = None
@@ -44,6 +173,33 @@ dht11 = None
 rain_sensor = None
 i2c = None
 boot_count = 0
+supervisor = None
+governor = None
+boot_state = None
+warm_boot = False
+samples = None
+acquisition_running = False
+history = None
+rollups = None
+derived = None
+forecaster = None
+stream_filter = None
+sampler = None
+held_data = {}
+rain_watch = None
+alert_engine = None
+sample_values = array('i', [0] * reading.NUM_CHANNELS)
+last_history_time = None
+wlan = None
+clock_synced = False
+webserver = None
+mqtt = None
+telemetry_link = None
+recorder = None
+last_sensor_ms = 0
+loop_count = 0
+error_count = 0
+last_good_data = {}
 
 def startup_sequence():
     """Sequência de inicialização com indicadores visuais"""
@@ -51,19 +207,18 @@ def startup_sequence():
     
     print("Executando sequência de boot...")
     
-    # Economia de energia - reduz CPU para 80MHz
-    freq(80000000)
+    # Economia de energia - CPU em 80MHz, 240MHz apenas em rajadas
+    governor.start()
     print(f"CPU reduzida para: {freq()}Hz")
     
-    # Configura LED do backlight como indicador
-    status_led = Pin(BLK, Pin.OUT)
-    
-    # Pisca 3 vezes para indicar boot
-    for i in range(3):
-        status_led.on()
-        time.sleep(0.2)
-        status_led.off()
-        time.sleep(0.2)
+    # Pisca 3 vezes para indicar boot (apenas em boot frio com diagnóstico)
+    if not warm_boot and COLD_BOOT_DIAGNOSTICS:
+        status_led = Pin(BLK, Pin.OUT)
+        for i in range(3):
+            status_led.on()
+            time.sleep(0.2)
+            status_led.off()
+            time.sleep(0.2)
     
     boot_count += 1
     print(f"Boot #{boot_count} concluído")
@@ -74,20 +229,25 @@ def safe_display_init():
     
     print("Inicializando display...")
     
-    # Reset físico do display
-    rst_pin = Pin(RST, Pin.OUT)
-    rst_pin.off()
-    time.sleep(0.1)
-    rst_pin.on()
-    time.sleep(0.2)
+    # Em boot quente o driver já faz o reset do display, sem pulso extra
+    attempts = 2 if warm_boot else 5
+    if not warm_boot:
+        # Reset físico do display
+        rst_pin = Pin(RST, Pin.OUT)
+        rst_pin.off()
+        time.sleep(0.1)
+        rst_pin.on()
+        time.sleep(0.2)
+        
+        # Liga backlight
+        bl_pin = Pin(BLK, Pin.OUT)
+        bl_pin.on()
     
-    # Liga backlight
-    bl_pin = Pin(BLK, Pin.OUT)
-    bl_pin.on()
+    st7789_simplified = profiler.load('st7789_simplified')
     
-    for attempt in range(5):
+    for attempt in range(attempts):
         try:
-            print(f"Tentativa display {attempt + 1}/5")
+            print(f"Tentativa display {attempt + 1}/{attempts}")
             
             display = st7789_simplified.ST7789(
                 spi_sck=SPI_SCK,
@@ -99,8 +259,9 @@ def safe_display_init():
             
             # Teste rápido
             display.fill(display.BLACK)
-            display.text("BOOT OK", 50, 100, display.GREEN)
-            time.sleep(1)
+            if not warm_boot:
+                display.text("BOOT OK", 50, 100, display.GREEN)
+                time.sleep(1)
             
             print("✓ Display inicializado!")
             return True
@@ -109,43 +270,71 @@ def safe_display_init():
             print(f"✗ Tentativa {attempt + 1} falhou: {e}")
             time.sleep(0.5)
             gc.collect()
+            supervisor.feed()
     
     print("✗ Display falhou - continuando sem display")
     return False
 
+def discover_bmp280():
+    """Procura o BMP280 no barramento I2C, retorna o endereço ou None"""
+    global bmp
+    
+    devices = i2c.scan()
+    if not devices:
+        print("✗ Nenhum dispositivo I2C encontrado")
+        return None
+    
+    print(f"I2C devices: {[hex(d) for d in devices]}")
+    
+    # Tenta endereços comuns do BMP280
+    for addr in [0x76, 0x77]:
+        if addr in devices:
+            try:
+                bmp = BMP280(i2c, addr=addr)
+                print(f"✓ BMP280 OK no endereço {hex(addr)}")
+                return addr
+            except Exception as e:
+                print(f"✗ BMP280 falhou no {hex(addr)}: {e}")
+    
+    print("✗ BMP280 não inicializou em nenhum endereço")
+    return None
+
 def safe_sensor_init():
     """Inicialização segura dos sensores"""
-    global i2c, bmp, dht11, rain_sensor
+    global i2c, bmp, dht11, rain_sensor, BMP280
     
     print("Inicializando sensores...")
     sensors_ok = 0
     
+    # Resultado da descoberta do último boot (reusado em boot quente)
+    cache = persist.load(BOOT_CACHE_FILE, None) or {}
+    discovery = {}
+    
     # === BMP280 ===
     if ENABLE_BMP280:
         try:
+            BMP280 = profiler.load('bmp280').BMP280
             i2c = I2C(0, scl=Pin(BMP280_SCL_PIN), sda=Pin(BMP280_SDA_PIN), freq=BMP280_I2C_FREQ)
-            devices = i2c.scan()
+            if recorder is not None:
+                i2c = recorder.i2c(i2c)
+            bmp = None
+            addr = cache.get('bmp_addr') if warm_boot else None
             
-            if devices:
-                print(f"I2C devices: {[hex(d) for d in devices]}")
-                
-                # Tenta endereços comuns do BMP280
-                for addr in [0x76, 0x77]:
-                    if addr in devices:
-                        try:
-                            bmp = BMP280(i2c, addr=addr)
-                            print(f"✓ BMP280 OK no endereço {hex(addr)}")
-                            sensors_ok += 1
-                            break
-                        except Exception as e:
-                            print(f"✗ BMP280 falhou no {hex(addr)}: {e}")
-                            continue
-                else:
-                    print("✗ BMP280 não inicializou em nenhum endereço")
-                    bmp = None
-            else:
-                print("✗ Nenhum dispositivo I2C encontrado")
-                bmp = None
+            if addr is not None:
+                # Boot quente: usa o endereço já descoberto, sem scan
+                try:
+                    bmp = BMP280(i2c, addr=addr)
+                    print(f"✓ BMP280 OK no endereço {hex(addr)} (cache)")
+                except Exception as e:
+                    print(f"✗ BMP280 falhou no {hex(addr)} (cache): {e}")
+                    addr = None
+            
+            if bmp is None:
+                addr = discover_bmp280()
+            
+            if bmp is not None:
+                discovery['bmp_addr'] = addr
+                sensors_ok += 1
                 
         except Exception as e:
             print(f"✗ Erro I2C geral: {e}")
@@ -158,7 +347,10 @@ def safe_sensor_init():
     # === DHT11 ===
     if ENABLE_DHT11:
         try:
+            dht = profiler.load('dht')
             dht11 = dht.DHT11(Pin(DHT11_PIN))
+            if recorder is not None:
+                dht11 = recorder.dht(dht11, DHT11_PIN)
             print("✓ DHT11 configurado")
             sensors_ok += 1
         except Exception as e:
@@ -173,6 +365,8 @@ def safe_sensor_init():
         try:
             rain_sensor = ADC(Pin(RAIN_SENSOR_PIN))
             rain_sensor.atten(ADC.ATTN_11DB)  # Permite leitura de 0 - 3.3V
+            if recorder is not None:
+                rain_sensor = recorder.adc(rain_sensor, RAIN_SENSOR_PIN)
             
             # Teste de leitura
             test_value = rain_sensor.read()
@@ -190,9 +384,21 @@ def safe_sensor_init():
         print("- Sensor de chuva desabilitado na configuração")
         rain_sensor = None
     
+    # Grava a descoberta apenas se mudou (evita escrita na flash a cada boot)
+    if discovery != cache:
+        persist.save(BOOT_CACHE_FILE, discovery)
+    
     print(f"Sensores ativos: {sensors_ok}")
     return sensors_ok > 0
 
+def classify_rain(value):
+    """Interpreta o valor do sensor de chuva"""
+    if value > RAIN_THRESHOLD_DRY:
+        return "Seco"
+    elif value < RAIN_THRESHOLD_WET:
+        return "Chuva"
+    return "Umido"
+
 def read_rain_sensor():
     """Lê o sensor de chuva e retorna status interpretado"""
     if rain_sensor is None:
@@ -208,15 +414,7 @@ def read_rain_sensor():
         # Calcula média
         avg_value = sum(readings) / len(readings)
         
-        # Interpreta o valor
-        if avg_value > RAIN_THRESHOLD_DRY:
-            status = "Seco"
-        elif avg_value < RAIN_THRESHOLD_WET:
-            status = "Chuva"
-        else:
-            status = "Umido"
-        
-        return int(avg_value), status
+        return int(avg_value), classify_rain(avg_value)
         
     except Exception as e:
         print(f"Erro lendo sensor de chuva: {e}")
@@ -233,6 +431,14 @@ def show_boot_info():
         display.text("Versao Completa", 10, 30, display.WHITE)
         display.text(f"Boot #{boot_count}", 10, 60, display.GREEN)
         
+        # Causa do último reset (e tarefa travada, se houver)
+        if boot_state is not None:
+            cause = boot_state['cause']
+            if boot_state['task']:
+                display.text(f"Reset: {cause} ({boot_state['task']})", 10, 75, display.RED)
+            else:
+                display.text(f"Reset: {cause}", 10, 75, display.WHITE)
+        
         # Mostra status dos componentes
         y = 90
         
@@ -263,122 +469,775 @@ def show_boot_info():
             display.text("CHUVA: OFF", 10, y, display.YELLOW)
             
         display.text("Iniciando...", 10, 200, display.YELLOW)
-        time.sleep(4)
+        supervisor.sleep(4)
         
     except Exception as e:
         print(f"Erro show_boot_info: {e}")
 
-def read_and_display_data():
-    """Loop principal de leitura e exibição"""
-    loop_count = 0
-    error_count = 0
-    last_good_data = {}
-    
-    print("Iniciando loop principal...")
+# Sensores como bits (leitura parcial na amostragem adaptativa)
+SENSOR_BMP = 1
+SENSOR_DHT = 2
+SENSOR_RAIN = 4
+ALL_SENSORS = SENSOR_BMP | SENSOR_DHT | SENSOR_RAIN
+# Prefixo das chaves e campos de cada sensor no dicionário de dados
+SENSOR_FIELDS = (
+    (SENSOR_BMP, 'bmp', ('bmp_temp', 'bmp_pressure', 'bmp_altitude')),
+    (SENSOR_DHT, 'dht', ('dht_temp', 'dht_humidity')),
+    (SENSOR_RAIN, 'rain', ('rain_value', 'rain_status')),
+)
+
+def read_sensors(which=ALL_SENSORS):
+    """Lê os sensores habilitados em `which` (SENSOR_*) e retorna o dicionário de dados"""
+    current_data = {}
     
-    while True:
+    # === Lê BMP280 ===
+    if bmp is not None and which & SENSOR_BMP:
         try:
-            print(f"\n--- Ciclo {loop_count} ---")
-            current_data = {}
+            temp, pressure = bmp.read()
+            altitude = 44330.0 * (1.0 - (pressure / SEA_LEVEL_PRESSURE) ** (1.0 / 5.255))
             
-            # === Lê BMP280 ===
-            if bmp is not None:
-                try:
-                    temp = bmp.temperature
-                    pressure = bmp.pressure
-                    altitude = 44330.0 * (1.0 - (pressure / SEA_LEVEL_PRESSURE) ** (1.0 / 5.255))
-                    
-                    current_data.update({
-                        'bmp_temp': temp,
-                        'bmp_pressure': pressure,
-                        'bmp_altitude': altitude
-                    })
-                    
-                    print(f"BMP280: {temp:.1f}°C, {pressure:.0f}hPa, {altitude:.0f}m")
-                    
-                except Exception as e:
-                    print(f"Erro BMP280: {e}")
-                    current_data['bmp_error'] = str(e)
+            current_data.update({
+                'bmp_temp': temp,
+                'bmp_pressure': pressure,
+                'bmp_altitude': altitude
+            })
             
-            # === Lê DHT11 ===
-            if dht11 is not None:
-                try:
-                    dht11.measure()
-                    time.sleep(0.5)  # DHT11 precisa de tempo entre leituras
-                    
-                    temp = dht11.temperature()
-                    humidity = dht11.humidity()
-                    
-                    if temp is not None and humidity is not None:
-                        current_data.update({
-                            'dht_temp': temp,
-                            'dht_humidity': humidity
-                        })
-                        print(f"DHT11: {temp}°C, {humidity}%")
-                    else:
-                        print("DHT11: Dados inválidos")
-                        current_data['dht_error'] = "Dados inválidos"
-                    
-                except Exception as e:
-                    print(f"Erro DHT11: {e}")
-                    current_data['dht_error'] = str(e)
+            if VERBOSITY >= LOG_INFO:
+                print(f"BMP280: {temp:.1f}°C, {pressure:.0f}hPa, {altitude:.0f}m")
             
-            # === Lê Sensor de Chuva ===
-            if rain_sensor is not None:
-                try:
-                    rain_value, rain_status = read_rain_sensor()
-                    
-                    if rain_value is not None:
-                        current_data.update({
-                            'rain_value': rain_value,
-                            'rain_status': rain_status
-                        })
-                        print(f"Chuva: {rain_value} ({rain_status})")
-                    else:
-                        current_data['rain_error'] = "Leitura falhou"
-                    
-                except Exception as e:
-                    print(f"Erro sensor chuva: {e}")
-                    current_data['rain_error'] = str(e)
+        except Exception as e:
+            print(f"Erro BMP280: {e}")
+            current_data['bmp_error'] = str(e)
+    
+    # === Lê DHT11 ===
+    if dht11 is not None and which & SENSOR_DHT:
+        try:
+            # Decodificação dos bits do DHT11 em frequência alta
+            with governor.burst():
+                dht11.measure()
+            time.sleep(0.5)  # DHT11 precisa de tempo entre leituras
             
-            # === Atualiza Display ===
-            if display is not None:
-                try:
-                    update_display_data(current_data, loop_count, error_count)
-                except Exception as e:
-                    print(f"Erro display: {e}")
-                    error_count += 1
+            temp = dht11.temperature()
+            humidity = dht11.humidity()
             
-            # Guarda últimos dados bons
-            if any(k for k in current_data.keys() if not k.endswith('_error')):
-                last_good_data = current_data.copy()
-                error_count = 0
+            if temp is not None and humidity is not None:
+                current_data.update({
+                    'dht_temp': temp,
+                    'dht_humidity': humidity
+                })
+                if VERBOSITY >= LOG_INFO:
+                    print(f"DHT11: {temp}°C, {humidity}%")
             else:
-                error_count += 1
+                if VERBOSITY >= LOG_WARN:
+                    print("DHT11: Dados inválidos")
+                current_data['dht_error'] = "Dados inválidos"
+            
+        except Exception as e:
+            print(f"Erro DHT11: {e}")
+            current_data['dht_error'] = str(e)
+    
+    # === Lê Sensor de Chuva ===
+    if rain_sensor is not None and which & SENSOR_RAIN:
+        try:
+            rain_value, rain_status = read_rain_sensor()
             
-            loop_count += 1
+            if rain_value is not None:
+                current_data.update({
+                    'rain_value': rain_value,
+                    'rain_status': rain_status
+                })
+                if VERBOSITY >= LOG_INFO:
+                    print(f"Chuva: {rain_value} ({rain_status})")
+            else:
+                current_data['rain_error'] = "Leitura falhou"
             
-            # Reinicia se muitos erros consecutivos
-            if error_count > 15:
-                print("Muitos erros consecutivos - reiniciando sistema...")
-                time.sleep(3)
-                reset()
+        except Exception as e:
+            print(f"Erro sensor chuva: {e}")
+            current_data['rain_error'] = str(e)
+    
+    return current_data
+
+def hold_reading(data):
+    """
+    Completa a leitura com os últimos valores dos sensores que não foram
+    lidos neste ciclo, para os consumidores sempre receberem todos os campos
+    """
+    for _, prefix, keys in SENSOR_FIELDS:
+        if prefix + '_error' in data:
+            # Sensor com erro: não mostra valor antigo como atual
+            for key in keys:
+                held_data.pop(key, None)
+        elif keys[0] in data:
+            for key in keys:
+                if key in data:
+                    held_data[key] = data[key]
+        else:
+            for key in keys:
+                if key in held_data:
+                    data[key] = held_data[key]
+
+def has_valid_data(data):
+    """True se algum sensor trouxe dado válido"""
+    return any(k for k in data.keys() if not k.endswith('_error'))
+
+def complete_data(data):
+    """Recalcula os campos derivados de uma amostra vinda do buffer"""
+    if 'bmp_pressure' in data and 'bmp_altitude' not in data:
+        pressure = data['bmp_pressure']
+        data['bmp_altitude'] = 44330.0 * (1.0 - (pressure / SEA_LEVEL_PRESSURE) ** (1.0 / 5.255))
+    if 'rain_value' in data and 'rain_status' not in data:
+        data['rain_status'] = classify_rain(data['rain_value'])
+    return data
+
+def acquisition_worker():
+    """Thread de aquisição: lê os sensores e publica no buffer circular"""
+    global last_sensor_ms
+    values = array('i', [0] * reading.NUM_CHANNELS)
+    print("Thread de aquisição iniciada")
+    
+    while acquisition_running:
+        t0 = time.ticks_ms()
+        try:
+            current_data = read_sensors()
+            last_sensor_ms = time.ticks_diff(time.ticks_ms(), t0)
+            flags = reading.encode(current_data, values)
+            if not samples.push(time.time(), flags, values):
+                print("Buffer de amostras cheio - amostra descartada")
+            # Sem breadcrumb na RTC aqui: só a thread principal escreve nela
+            if has_valid_data(current_data):
+                supervisor.checkin('sensors')
+        except Exception as e:
+            print(f"Erro na thread de aquisição: {e}")
+        
+        # Mantém a cadência independente do tempo de renderização
+        elapsed = time.ticks_diff(time.ticks_ms(), t0)
+        if elapsed < READ_INTERVAL_MS:
+            time.sleep_ms(READ_INTERVAL_MS - elapsed)
+
+def start_acquisition():
+    """Inicia a thread de aquisição (modo dual-core)"""
+    global samples, acquisition_running
+    import _thread
+    from ringbuffer import RingBuffer
+    
+    samples = RingBuffer(SAMPLE_BUFFER_SIZE)
+    acquisition_running = True
+    _thread.start_new_thread(acquisition_worker, ())
+
+def init_dual_core():
+    """Prepara a thread de aquisição; sem suporte a threads segue com uma thread só"""
+    global ENABLE_DUAL_CORE
+    
+    if not ENABLE_DUAL_CORE:
+        return
+    try:
+        import _thread
+        _thread.stack_size(ACQUISITION_STACK_SIZE)
+        print(f"✓ Dual-core: pilha de aquisição {ACQUISITION_STACK_SIZE} bytes")
+    except Exception as e:
+        # Ex.: firmware sem _thread ou pilha recusada - não vale um reset
+        print(f"✗ Dual-core indisponível ({e}), usando uma thread")
+        ENABLE_DUAL_CORE = False
+
+def wait_sample():
+    """Aguarda a próxima amostra do buffer (alimentando o watchdog)"""
+    while True:
+        sample = samples.pop()
+        if sample is not None:
+            if VERBOSITY >= LOG_INFO:
+                print(f"\n--- Ciclo {loop_count} ---")
+            return complete_data(reading.decode(sample[1], sample[2:]))
+        supervisor.sleep(SAMPLE_POLL_MS / 1000)
+
+def init_history():
+    """Abre o log circular de histórico e os agregados na flash"""
+    global history, rollups
+    
+    if not ENABLE_HISTORY:
+        print("- Histórico desabilitado na configuração")
+        return
+    
+    try:
+        import os
+        from tslog import TimeSeriesLog
+        from rollup import RollupEngine
+        history = TimeSeriesLog(HISTORY_DIR, HISTORY_SEGMENTS, HISTORY_SEGMENT_SIZE)
+        rollups = RollupEngine(HISTORY_DIR, ROLLUP_CAPACITY)
+        used, capacity = history.usage()
+        s = os.statvfs('/')
+        print(f"✓ Histórico: {used}/{capacity} registros, flash livre: {s[0] * s[3] // 1024} KB")
+    except Exception as e:
+        print(f"✗ Histórico erro: {e}")
+        history = None
+        rollups = None
+
+def record_history(now, flags):
+    """Atualiza os agregados e grava no histórico a cada HISTORY_INTERVAL_S"""
+    global last_history_time
+    
+    # Agregados recebem todas as amostras (O(1) por nível)
+    rollups.add(now, flags, sample_values)
+    
+    if last_history_time is not None and now - last_history_time < HISTORY_INTERVAL_S:
+        return
+    last_history_time = now
+    history.append(now, flags, sample_values)
+
+def connect_wifi():
+    """Conecta ao Wi-Fi, retorna o objeto WLAN ou None"""
+    global wlan
+    import network
+    
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    if not wlan.isconnected():
+        print(f"Conectando ao Wi-Fi {WIFI_SSID}...")
+        wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+        for _ in range(WIFI_TIMEOUT_S * 10):
+            if wlan.isconnected():
+                break
+            time.sleep_ms(100)
+            supervisor.feed()
+    
+    if wlan.isconnected():
+        print(f"✓ Wi-Fi conectado: {wlan.ifconfig()[0]}")
+        sync_clock()
+        return wlan
+    print("✗ Wi-Fi não conectou")
+    return None
+
+def sync_clock():
+    """Acerta o RTC por NTP (após o boot time.time() recomeça perto de 2000)"""
+    global clock_synced
+    
+    try:
+        import ntptime
+        ntptime.host = NTP_HOST
+        ntptime.settime()
+        clock_synced = True
+        t = time.gmtime()
+        print(f"✓ Relógio (NTP): {t[0]}-{t[1]:02d}-{t[2]:02d} {t[3]:02d}:{t[4]:02d} UTC")
+    except Exception as e:
+        print(f"✗ NTP erro: {e}")
+
+def init_network():
+    """Conecta ao Wi-Fi e prepara o servidor HTTP e o MQTT"""
+    if ENABLE_WEBSERVER or ENABLE_MQTT:
+        try:
+            connect_wifi()
+        except Exception as e:
+            print(f"✗ Wi-Fi erro: {e}")
+    init_webserver()
+    init_mqtt()
+
+def init_webserver():
+    """Prepara o servidor HTTP do painel (requer Wi-Fi conectado)"""
+    global webserver, derived
+    
+    if not ENABLE_WEBSERVER:
+        print("- Servidor web desabilitado na configuração")
+        return
+    if wlan is None or not wlan.isconnected():
+        print("✗ Servidor web sem Wi-Fi")
+        return
+    
+    try:
+        from webserver import WebServer
+        from derived import Derived
+        import dashboard
+        derived = Derived()
+        webserver = WebServer(WEB_PORT, WEB_MAX_CLIENTS, max_streams=WEB_MAX_STREAMS)
+        webserver.burst = governor.burst
+        webserver.add_page(b"/", dashboard.PAGE)
+        if history is not None:
+            from history_api import history_route
+            webserver.routes[b"/api/history"] = history_route(history, rollups, HISTORY_INTERVAL_S)
+    except Exception as e:
+        print(f"✗ Servidor web erro: {e}")
+        webserver = None
+
+def init_mqtt():
+    """Prepara o envio por MQTT (funciona sem conexão, guardando na flash)"""
+    global mqtt
+    
+    if not ENABLE_MQTT:
+        print("- MQTT desabilitado na configuração")
+        return
+    
+    try:
+        from mqtt_telemetry import MqttClient, MqttPublisher, Spool, WifiRadio
+        # Sem servidor web o Wi-Fi só fica ligado durante os envios
+        radio = None
+        if webserver is None and wlan is not None:
+            radio = WifiRadio(wlan, WIFI_SSID, WIFI_PASSWORD, WIFI_TIMEOUT_S)
+        spool = Spool(MQTT_SPOOL_DIR, MQTT_SPOOL_MAX)
+        client = MqttClient(MQTT_BROKER, MQTT_PORT, MQTT_CLIENT_ID)
+        mqtt = MqttPublisher(client, MQTT_TOPIC, MQTT_BATCH_SIZE, spool, radio,
+                             drain_per_s=MQTT_DRAIN_PER_S)
+        print(f"✓ MQTT: {MQTT_BROKER}, lotes de {MQTT_BATCH_SIZE} amostras, {len(spool)} na fila")
+    except Exception as e:
+        print(f"✗ MQTT erro: {e}")
+        mqtt = None
+
+def init_telemetry():
+    """Ativa a telemetria binária na serial (USB)"""
+    global telemetry_link
+    
+    if not ENABLE_TELEMETRY:
+        return
+    
+    try:
+        from telemetry import Telemetry
+        telemetry_link = Telemetry()
+        telemetry_link.event(EV_BOOT, boot_count)
+    except Exception as e:
+        print(f"✗ Telemetria erro: {e}")
+        telemetry_link = None
+
+def init_recorder():
+    """Abre o arquivo de gravação dos dados brutos (um por boot)"""
+    global recorder
+    
+    if not ENABLE_RECORDER:
+        return
+    if ENABLE_DUAL_CORE:
+        print("✗ Gravação requer o modo de uma thread")
+        return
+    
+    try:
+        from recorder import Recorder
+        path = f"{RECORDER_DIR}/rec{boot_state['boots']:04d}.rpl"
+        recorder = Recorder.open(path, RECORDER_MAX_BYTES)
+        print(f"✓ Gravando dados brutos em {path}")
+    except Exception as e:
+        print(f"✗ Gravação erro: {e}")
+        recorder = None
+
+def init_filters():
+    """Cria os filtros por canal configurados em FILTERS"""
+    global stream_filter
+    
+    if not ENABLE_FILTERS:
+        return
+    try:
+        from filters import StreamFilter
+        stream_filter = StreamFilter(FILTERS)
+    except Exception as e:
+        print(f"✗ Filtros erro: {e}")
+        stream_filter = None
+
+def filter_reading(data):
+    """Filtra os canais da leitura e devolve os valores filtrados ao dicionário"""
+    if stream_filter is None:
+        return
+    flags = reading.encode(data, sample_values)
+    changed = stream_filter.apply(time.time(), flags, sample_values)
+    if not changed:
+        return
+    for ch in range(reading.NUM_CHANNELS):
+        if changed & (1 << ch):
+            key = reading.CHANNEL_KEYS[ch]
+            scale = reading.CHANNEL_SCALES[ch]
+            value = sample_values[ch]
+            # Mantém inteiros os canais lidos como inteiros (DHT11)
+            if scale == 1 or (isinstance(data[key], int) and value % scale == 0):
+                data[key] = value // scale
+            else:
+                data[key] = value / scale
+    if changed & (1 << reading.CH_RAIN):
+        data['rain_status'] = classify_rain(data['rain_value'])
+
+def init_forecast():
+    """Prepara a previsão pela pressão (retoma a janela da RTC no boot quente)"""
+    global forecaster
+    
+    if not ENABLE_FORECAST or bmp is None:
+        return
+    try:
+        from forecast import Forecaster
+        forecaster = Forecaster(STATION_ALTITUDE_M, FORECAST_SOUTHERN)
+        if warm_boot:
+            forecaster.restore(persist.rtc_get('forecast'))
+    except Exception as e:
+        print(f"✗ Previsão erro: {e}")
+        forecaster = None
+
+def update_forecast(data):
+    """Inclui a pressão da leitura na tendência; salva a janela a cada intervalo novo"""
+    if forecaster is None or 'bmp_pressure' not in data:
+        return
+    if forecaster.add(time.time(), data['bmp_pressure'], data.get('bmp_temp')):
+        persist.rtc_set('forecast', forecaster.state())
+
+def alert_changed(name, active, timestamp, value):
+    """Transição de um alerta: serial, /events e MQTT"""
+    print(f"{'Alerta' if active else 'Fim do alerta'}: {name} ({value})")
+    if webserver is None and mqtt is None:
+        return
+    from alerts import event_json
+    payload = event_json(timestamp, name, active, value)
+    if webserver is not None:
+        webserver.alert(payload)
+    if mqtt is not None:
+        mqtt.message(MQTT_ALERT_TOPIC, payload)
+
+def init_alerts():
+    """Compila as regras de ALERT_RULES"""
+    global alert_engine
+    
+    if not ENABLE_ALERTS:
+        return
+    try:
+        from alerts import AlertEngine
+        alert_engine = AlertEngine(ALERT_RULES, alert_changed)
+    except Exception as e:
+        print(f"✗ Alertas erro: {e}")
+        alert_engine = None
+
+def api_fields(data):
+    """Campos extras de /api/latest: grandezas derivadas, previsão e alertas ativos"""
+    extra = derived.fields(data) or {}
+    if forecaster is not None:
+        fields = forecaster.fields()
+        if fields:
+            extra.update(fields)
+    if alert_engine is not None:
+        extra['alerts'] = ",".join(alert_engine.active())
+    return extra
+
+def init_sampling():
+    """Cria a agenda de leitura adaptativa por sensor (ADAPTIVE_SAMPLING)"""
+    global sampler
+    
+    if not ENABLE_ADAPTIVE_SAMPLING:
+        return
+    if ENABLE_DUAL_CORE:
+        print("✗ Amostragem adaptativa requer o modo de uma thread")
+        return
+    try:
+        from adaptive import AdaptiveSampler, SensorSchedule
+        sampler = AdaptiveSampler()
+        # Intervalo máximo dentro dos prazos de check-in dos sensores e do display
+        limit = min(SENSORS_DEADLINE_MS, DISPLAY_DEADLINE_MS) // 2
+        devices = {SENSOR_BMP: bmp, SENSOR_DHT: dht11, SENSOR_RAIN: rain_sensor}
+        for bit, name, _ in SENSOR_FIELDS:
+            if devices[bit] is None:
+                continue
+            # Sensor fora da configuração: intervalo fixo
+            min_ms, max_ms, channels = ADAPTIVE_SAMPLING.get(name, (READ_INTERVAL_MS, READ_INTERVAL_MS, ()))
+            sampler.add(bit, SensorSchedule(name, min_ms, min(max_ms, limit), channels, READ_INTERVAL_MS))
+    except Exception as e:
+        print(f"✗ Amostragem adaptativa erro: {e}")
+        sampler = None
+
+def rain_onset():
+    """Início da chuva detectado pela interrupção: lê o sensor de chuva já, em rajada"""
+    if sampler is not None:
+        sampler.burst(SENSOR_RAIN, RAIN_BURST_MS, RAIN_BURST_S * 1000)
+    if VERBOSITY >= LOG_INFO:
+        print("Início da chuva (interrupção) - rajada de leituras")
+
+def init_rain_watch():
+    """Liga a detecção do início da chuva pela saída DO ou pelo ADC em um Timer"""
+    global rain_watch
+    
+    if not ENABLE_RAIN_WATCH or rain_sensor is None:
+        return
+    if ENABLE_DUAL_CORE:
+        print("✗ Vigia da chuva requer o modo de uma thread")
+        return
+    if RAIN_DIGITAL_PIN is None and CPU_LIGHTSLEEP:
+        print("✗ Vigia da chuva pelo ADC não roda em lightsleep (ligue a saída DO em RAIN_DIGITAL_PIN)")
+        return
+    try:
+        from rainwatch import RainWatch
+        if RAIN_DIGITAL_PIN is not None:
+            rain_watch = RainWatch(rain_onset, pin=RAIN_DIGITAL_PIN, holdoff_ms=RAIN_BURST_S * 1000)
+            print(f"✓ Vigia da chuva pela saída DO (pino {RAIN_DIGITAL_PIN}, acorda do sleep)")
+            # Acordou do deep sleep pela chuva: começa já em rajada
+            if boot_state['cause'] == 'DEEPSLEEP' and rain_watch.wet():
+                rain_onset()
+        else:
+            # ADC próprio: as leituras do Timer não entram na gravação dos ciclos
+            adc = ADC(Pin(RAIN_SENSOR_PIN))
+            adc.atten(ADC.ATTN_11DB)
+            rain_watch = RainWatch(rain_onset, adc=adc, threshold=RAIN_THRESHOLD_DRY,
+                                   hysteresis=RAIN_WATCH_HYSTERESIS, period_ms=RAIN_WATCH_PERIOD_MS,
+                                   holdoff_ms=RAIN_BURST_S * 1000)
+            print(f"✓ Vigia da chuva pelo ADC a cada {RAIN_WATCH_PERIOD_MS} ms")
+    except Exception as e:
+        print(f"✗ Vigia da chuva erro: {e}")
+        rain_watch = None
+
+def read_delay_s():
+    """Pausa até a próxima leitura: o próximo sensor a vencer, ou READ_INTERVAL_MS"""
+    if sampler is None:
+        return READ_INTERVAL_MS / 1000
+    return sampler.delay_ms() / 1000
+
+def rain_woke():
+    """Condição de despertar da espera entre leituras (início da chuva)"""
+    return rain_watch is not None and rain_watch.take()
+
+def acquire_reading():
+    """Lê os sensores na thread principal (modo de uma thread)"""
+    global last_sensor_ms
+    if VERBOSITY >= LOG_INFO:
+        print(f"\n--- Ciclo {loop_count} ---")
+    if recorder is not None:
+        recorder.cycle(time.time())
+    supervisor.begin('sensors')
+    t0 = time.ticks_ms()
+    which = sampler.due(t0) if sampler is not None else ALL_SENSORS
+    current_data = read_sensors(which)
+    last_sensor_ms = time.ticks_diff(time.ticks_ms(), t0)
+    if recorder is not None and has_valid_data(current_data):
+        # Amostra crua (antes dos filtros), comparável com o read_sensors() na reprodução
+        recorder.sample(time.time(), reading.encode(current_data, sample_values), sample_values)
+    if sampler is not None:
+        for name, before, after in sampler.update(which, current_data):
+            if VERBOSITY >= LOG_INFO:
+                print(f"Intervalo {name}: {before / 1000:.1f} -> {after / 1000:.1f} s")
+    
+    # Só conta como check-in se algum sensor trouxe dado válido
+    supervisor.end('sensors', has_valid_data(current_data))
+    return current_data
+
+def process_reading(current_data):
+    """Entrega uma leitura aos consumidores: display, histórico e rede"""
+    global loop_count, error_count, last_good_data
+    
+    sensors_ok = has_valid_data(current_data)
+    display_ms = 0
+    filter_reading(current_data)
+    update_forecast(current_data)
+    hold_reading(current_data)
+    
+    # === Alertas (antes do display, que mostra a faixa) ===
+    if alert_engine is not None and sensors_ok:
+        flags = reading.encode(current_data, sample_values)
+        alert_engine.update(time.time(), flags, sample_values)
+    
+    # === Atualiza Display ===
+    if display is not None:
+        supervisor.begin('display')
+        try:
+            t0 = time.ticks_ms()
+            with governor.burst():
+                update_display_data(current_data, loop_count, error_count)
+            display_ms = time.ticks_diff(time.ticks_ms(), t0)
+            supervisor.end('display')
+        except Exception as e:
+            print(f"Erro display: {e}")
+            supervisor.end('display', False)
+            error_count += 1
+    
+    # Guarda últimos dados bons (também na RTC para o boot rápido)
+    if sensors_ok:
+        last_good_data = current_data.copy()
+        persist.rtc_set('last_data', last_good_data)
+        error_count = 0
+    else:
+        error_count += 1
+        if telemetry_link is not None:
+            telemetry_link.event(EV_SENSOR_FAIL, error_count)
+    
+    if sensors_ok:
+        now = time.time()
+        flags = reading.encode(current_data, sample_values)
+        
+        # === Grava no histórico ===
+        if history is not None:
+            try:
+                record_history(now, flags)
+            except Exception as e:
+                print(f"Erro histórico: {e}")
+                if telemetry_link is not None:
+                    telemetry_link.event(EV_HISTORY_ERROR)
+        
+        # === Publica para o servidor web ===
+        if webserver is not None:
+            webserver.publish(now, flags, sample_values, api_fields(current_data))
+        
+        # === Lote MQTT ===
+        if mqtt is not None:
+            mqtt.add(now, flags, sample_values)
+        
+        # === Telemetria binária ===
+        if telemetry_link is not None:
+            telemetry_link.reading(now, flags, sample_values)
+    
+    if telemetry_link is not None:
+        telemetry_link.stats(loop_count, last_sensor_ms, display_ms, error_count, gc.mem_free())
+    
+    loop_count += 1
+    
+    # Se alguma tarefa ficar fora do prazo o supervisor para de
+    # alimentar o watchdog e a placa reinicia em poucos segundos
+    
+    # Coleta lixo periodicamente
+    if loop_count % 20 == 0:
+        gc.collect()
+        if VERBOSITY >= LOG_INFO:
+            print_stats()
+
+def print_stats():
+    """Mostra memória, uso da CPU e contadores de rede na serial"""
+    print(f"Memória livre: {gc.mem_free()} bytes")
+    governor.report()
+    if stream_filter is not None:
+        counts = ", ".join(f"{k} {o}/{l}" for k, (o, l) in stream_filter.stats().items() if o or l)
+        if counts:
+            print(f"Filtros (substituídas/limitadas): {counts}")
+    if sampler is not None:
+        rates = ", ".join(f"{name} {reads}x {cur / 1000:.1f} s (média {avg / 1000:.1f} s)"
+                          for name, (reads, cur, avg) in sampler.stats().items())
+        print(f"Amostragem: {rates}")
+    if alert_engine is not None:
+        active = alert_engine.active()
+        print(f"Alertas: {', '.join(active) if active else 'nenhum'} "
+              f"({alert_engine.evaluated} avaliações, {alert_engine.skipped} puladas)")
+    if rain_watch is not None and rain_watch.onsets:
+        print(f"Inícios de chuva detectados: {rain_watch.onsets}")
+    if forecaster is not None and forecaster.code is not None:
+        print(f"Previsão: {forecaster.text} ({forecaster.code}, {forecaster.trend:+.1f} hPa/3h)")
+    if ENABLE_DUAL_CORE and samples.dropped:
+        print(f"Amostras descartadas: {samples.dropped}")
+    if webserver is not None:
+        print(f"HTTP: {webserver.requests} req, {webserver.not_modified} 304, {webserver.rejected} rejeitadas")
+        print(f"SSE: {webserver.streams} assinantes, {webserver.events_sent} eventos, {webserver.dropped} lentos")
+    if mqtt is not None:
+        st = mqtt.stats()
+        print(f"MQTT: {st['published']} lotes, {st['backlog']} na fila, {st['failures']} falhas, rádio {st['radio_on_ms'] // 1000} s")
+
+def shutdown():
+    """Encerra threads, servidor e fecha os arquivos do histórico"""
+    global acquisition_running
+    acquisition_running = False
+    if telemetry_link is not None:
+        telemetry_link.event(EV_SHUTDOWN)
+    if webserver is not None:
+        webserver.close()
+    if mqtt is not None:
+        mqtt.spill()
+    if rain_watch is not None:
+        rain_watch.deinit()
+    if recorder is not None:
+        recorder.close()
+    if history is not None:
+        history.close()
+        rollups.close()
+
+def read_and_display_data():
+    """Loop principal de leitura e exibição"""
+    global error_count, ENABLE_DUAL_CORE
+    
+    print("Iniciando loop principal...")
+    
+    if ENABLE_DUAL_CORE:
+        try:
+            start_acquisition()
+        except Exception as e:
+            print(f"✗ Thread de aquisição não iniciou ({e}), usando uma thread")
+            ENABLE_DUAL_CORE = False
+    
+    # Com servidor web ou MQTT, sensores e rede dividem o loop de eventos asyncio
+    if webserver is not None or mqtt is not None:
+        import asyncio
+        try:
+            asyncio.run(station_async())
+        except KeyboardInterrupt:
+            print("Sistema interrompido pelo usuário")
+            shutdown()
+        return
+    
+    while True:
+        try:
+            if ENABLE_DUAL_CORE:
+                # Aquisição roda na outra thread; aqui só consome amostras
+                current_data = wait_sample()
+            else:
+                current_data = acquire_reading()
             
-            # Coleta lixo periodicamente
-            if loop_count % 20 == 0:
-                gc.collect()
-                print(f"Memória livre: {gc.mem_free()} bytes")
+            process_reading(current_data)
             
-            # Pausa entre leituras
-            time.sleep(8)
+            # Pausa entre leituras (alimentando o watchdog)
+            if not ENABLE_DUAL_CORE:
+                supervisor.sleep(read_delay_s(), rain_woke)
             
         except KeyboardInterrupt:
             print("Sistema interrompido pelo usuário")
+            shutdown()
             break
         except Exception as e:
             print(f"Erro no loop principal: {e}")
             error_count += 1
-            time.sleep(5)
+            supervisor.sleep(5)
+
+async def wait_sample_async():
+    """Como wait_sample(), cedendo o loop de eventos enquanto espera"""
+    while True:
+        sample = samples.pop()
+        if sample is not None:
+            if VERBOSITY >= LOG_INFO:
+                print(f"\n--- Ciclo {loop_count} ---")
+            return complete_data(reading.decode(sample[1], sample[2:]))
+        await supervisor.sleep_async(SAMPLE_POLL_MS / 1000)
+
+async def station_task():
+    """Loop de leitura como tarefa asyncio (junto com o servidor web)"""
+    global error_count
+    
+    while True:
+        try:
+            if ENABLE_DUAL_CORE:
+                current_data = await wait_sample_async()
+            else:
+                current_data = acquire_reading()
+            
+            process_reading(current_data)
+            
+            if not ENABLE_DUAL_CORE:
+                await supervisor.sleep_async(read_delay_s(), rain_woke)
+            
+        except Exception as e:
+            print(f"Erro no loop principal: {e}")
+            error_count += 1
+            await supervisor.sleep_async(5)
+
+async def network_watch():
+    """Verifica o Wi-Fi periodicamente e faz check-in da tarefa de rede"""
+    import asyncio
+    
+    was_connected = True
+    while True:
+        connected = wlan.isconnected()
+        if telemetry_link is not None and connected != was_connected:
+            telemetry_link.event(EV_WIFI_UP if connected else EV_WIFI_DOWN)
+        was_connected = connected
+        if connected:
+            supervisor.checkin('network')
+            if not clock_synced:
+                sync_clock()
+        else:
+            print("Wi-Fi desconectado - reconectando...")
+            try:
+                wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+            except OSError as e:
+                print(f"Erro Wi-Fi: {e}")
+        await asyncio.sleep(WIFI_CHECK_S)
+
+async def station_async():
+    """Sensores, servidor HTTP, MQTT e vigilância do Wi-Fi no mesmo loop de eventos"""
+    import asyncio
+    
+    if webserver is not None:
+        await webserver.start()
+        supervisor.add_task('network', NETWORK_DEADLINE_MS)
+        asyncio.create_task(network_watch())
+    if mqtt is not None:
+        asyncio.create_task(mqtt.run())
+    await station_task()
 
 def update_display_data(data, loop_count, error_count):
     """Atualiza dados no display"""
@@ -390,6 +1249,8 @@ def update_display_data(data, loop_count, error_count):
     
     # Cabeçalho
     display.text("Weather Station", 5, y, display.CYAN)
+    if forecaster is not None and forecaster.text is not None:
+        display.text(forecaster.text, 5, y + 12, display.WHITE)
     y += 25
     
     # === BMP280 ===
@@ -440,21 +1301,85 @@ def update_display_data(data, loop_count, error_count):
         display.text("CHUVA: ERRO", 5, y, display.RED)
         y += 25
     
+    # === Alertas ativos ===
+    if alert_engine is not None:
+        active = alert_engine.active()
+        if active:
+            display.text(alert_banner(active, loop_count), 5, y, display.RED)
+            y += 12
+    
     # === Status do Sistema ===
-    display.text(f"Ciclo: {loop_count}", 5, 200, display.GREEN)
+    y = max(y, 200)
+    display.text(f"Ciclo: {loop_count}", 5, y, display.GREEN)
     if error_count > 0:
-        display.text(f"Erros: {error_count}", 5, 220, display.RED)
+        display.text(f"Erros: {error_count}", 5, y + 16, display.RED)
+
+def alert_banner(active, step):
+    """Faixa de alertas em uma linha; se os nomes não cabem, um por atualização"""
+    width = (display.width - 10) // 8       # Fonte de 8 px
+    text = ", ".join(active)
+    if len(text) <= width:
+        return text
+    i = step % len(active)
+    return f"{i + 1}/{len(active)} {active[i]}"[:width]
 
 def main():
     """Função principal do sistema"""
+    global supervisor, governor, boot_state, warm_boot
+    
+    governor = Governor(CPU_IDLE_FREQ, CPU_BURST_FREQ, CPU_LIGHTSLEEP)
+    
+    # Registra a causa do último reset antes de qualquer outra coisa
+    supervisor = Supervisor(timeout_ms=WDT_TIMEOUT_MS)
+    supervisor.sleep_ms = governor.idle
+    with profiler.step('boot_report'):
+        boot_state = supervisor.boot_report()
+    warm_boot = FAST_BOOT and boot_state['cause'] in WARM_RESET_CAUSES
+    if warm_boot:
+        print(f"Boot rápido (reset {boot_state['cause']})")
+    
     try:
-        startup_sequence()
+        with profiler.step('startup_sequence'):
+            startup_sequence()
+        supervisor.start()
         
-        display_ok = safe_display_init()
-        sensors_ok = safe_sensor_init()
+        with profiler.step('display_init'):
+            display_ok = safe_display_init()
+        supervisor.feed()
         
-        if display_ok:
-            show_boot_info()
+        # Boot quente: mostra imediatamente as últimas leituras da RTC
+        last_data = persist.rtc_get('last_data') if warm_boot else None
+        if display_ok and last_data:
+            try:
+                with profiler.step('last_data'), governor.burst():
+                    update_display_data(last_data, 0, 0)
+            except Exception as e:
+                print(f"Erro mostrando últimas leituras: {e}")
+        
+        init_dual_core()
+        init_recorder()
+        with profiler.step('sensor_init'):
+            sensors_ok = safe_sensor_init()
+        supervisor.feed()
+        init_filters()
+        init_forecast()
+        init_sampling()
+        init_rain_watch()
+        init_alerts()
+        
+        with profiler.step('history_init'):
+            init_history()
+        supervisor.feed()
+        
+        with profiler.step('network_init'):
+            init_network()
+        supervisor.feed()
+        
+        init_telemetry()
+        
+        if display_ok and not warm_boot and COLD_BOOT_DIAGNOSTICS:
+            with profiler.step('boot_info'):
+                show_boot_info()
         
         if not sensors_ok:
             print("AVISO: Nenhum sensor funcionando!")
@@ -462,13 +1387,32 @@ def main():
                 display.fill(display.BLACK)
                 display.text("ERRO SENSORES", 10, 100, display.RED)
                 display.text("Verifique conexoes", 10, 120, display.WHITE)
-                time.sleep(5)
+                supervisor.sleep(5)
         
         # Mostra configuração ativa
         print(f"\nConfiguração ativa:")
         print(f"- BMP280: {'ON' if ENABLE_BMP280 else 'OFF'}")
         print(f"- DHT11: {'ON' if ENABLE_DHT11 else 'OFF'}")
         print(f"- Sensor Chuva: {'ON' if ENABLE_RAIN_SENSOR else 'OFF'}")
+        print(f"- Dual-core: {'ON' if ENABLE_DUAL_CORE else 'OFF'}")
+        print(f"- Servidor web: {'ON' if webserver is not None else 'OFF'}")
+        print(f"- MQTT: {'ON' if mqtt is not None else 'OFF'}")
+        print(f"- Telemetria binária: {'ON' if telemetry_link is not None else 'OFF'}")
+        print(f"- Gravação de dados brutos: {'ON' if recorder is not None else 'OFF'}")
+        print(f"- Filtros por canal: {'ON' if stream_filter is not None else 'OFF'}")
+        print(f"- Previsão pela pressão: {'ON' if forecaster is not None else 'OFF'}")
+        print(f"- Amostragem adaptativa: {'ON' if sampler is not None else 'OFF'}")
+        print(f"- Vigia da chuva: {'ON' if rain_watch is not None else 'OFF'}")
+        print(f"- Alertas: {len(alert_engine.names) if alert_engine is not None else 'OFF'}")
+        
+        # Tarefas supervisionadas pelo watchdog
+        if sensors_ok:
+            supervisor.add_task('sensors', SENSORS_DEADLINE_MS)
+        if display_ok:
+            supervisor.add_task('display', DISPLAY_DEADLINE_MS)
+        
+        profiler.report()
+        profiler.save(BOOT_PROFILE_FILE)
         
         # Inicia loop principal
         read_and_display_data()
@@ -484,8 +1428,8 @@ def main():
             except:
                 pass
         
-        time.sleep(5)
-        reset()
+        time.sleep(3)
+        supervisor.reset('main')
 
 # PONTO DE ENTRADA AUTOMÁTICO
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+"""
+Benchmark do codec de séries temporais (delta + varint)
+
+Gera dados realistas da estação (amostras a cada 8 s, ciclo diário de
+temperatura e umidade, pressão em passeio aleatório lento, pancadas de
+chuva), confere a ida e volta nas duas implementações e mede a taxa de
+compressão e a vazão de codificação/decodificação.
+
+Uso:
+    python bench_codec.py [--days 7] [--interval 8]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Libraries"))
+import tscodec
+import tscodec_np
+
+def synthetic_series(days=7, interval=8, seed=1):
+    """Série sintética em ponto fixo no layout de Libraries/reading.py"""
+    rng = np.random.default_rng(seed)
+    n = int(days * 86400 // interval)
+    t = np.arange(n) * interval
+    # Pequeno jitter no relógio: algumas amostras atrasam 1 s
+    jitter = (rng.random(n) < 0.02).astype(np.int64)
+    timestamps = 800000000 + t + np.cumsum(jitter)
+
+    day = 2 * np.pi * t / 86400
+    temp = 22 + 5 * np.sin(day - np.pi / 2) + rng.normal(0, 0.05, n).cumsum() * 0.01
+    humidity = np.clip(60 - 15 * np.sin(day - np.pi / 2) + rng.normal(0, 0.3, n), 5, 95)
+    pressure = 101325 + np.cumsum(rng.normal(0, 0.8, n)) + 150 * np.sin(day / 3.5)
+
+    # Sensor de chuva: seco (~3600) com algumas pancadas
+    rain = np.full(n, 3600.0) + rng.normal(0, 8, n)
+    for start in rng.integers(0, n, size=max(1, days // 2)):
+        length = int(rng.integers(200, 900))
+        rain[start:start + length] -= np.linspace(2600, 600, len(rain[start:start + length]))
+
+    values = np.empty((n, 5), dtype=np.int64)
+    values[:, 0] = np.round(temp * 100)
+    values[:, 1] = np.round(pressure)
+    # DHT11 tem resolução de 1 °C / 1 %
+    values[:, 2] = np.round(temp) * 100
+    values[:, 3] = np.round(humidity) * 100
+    values[:, 4] = np.round(rain)
+    flags = np.full(n, 0x1F, dtype=np.int64)
+    return timestamps, flags, values
+
+def timed(fn, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None or elapsed < best else best
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--interval", type=int, default=8)
+    args = parser.parse_args()
+
+    ts, flags, values = synthetic_series(args.days, args.interval)
+    n = len(ts)
+    raw_floats = n * (4 + 4 * values.shape[1])   # timestamp + float32 por canal
+    raw_records = n * 32                          # registro do log (tslog)
+    print(f"{n} amostras ({args.days} dias a cada {args.interval} s)")
+
+    # NumPy
+    blob, t_enc = timed(tscodec_np.encode, ts, flags, values)
+    (ts2, flags2, values2), t_dec = timed(tscodec_np.decode, blob)
+    assert np.array_equal(ts, ts2) and np.array_equal(flags, flags2) and np.array_equal(values, values2)
+
+    # Implementação do dispositivo (Python puro) - mesmo formato
+    records = [(int(ts[i]), int(flags[i])) + tuple(int(v) for v in values[i]) for i in range(n)]
+    blob_py, t_enc_py = timed(tscodec.encode, records, repeat=1)
+    assert bytes(blob_py) == blob
+    decoded, t_dec_py = timed(lambda b: list(tscodec.decode(b)), blob_py, repeat=1)
+    assert decoded == records
+
+    print(f"\nTamanho codificado: {len(blob)} bytes ({len(blob) / n:.2f} bytes/amostra)")
+    print(f"vs floats de 4 bytes: {raw_floats} bytes -> {raw_floats / len(blob):.1f}x menor")
+    print(f"vs registros do log:  {raw_records} bytes -> {raw_records / len(blob):.1f}x menor")
+
+    print(f"\n{'':<18}{'codificar':>14}{'decodificar':>14}")
+    print(f"{'NumPy':<18}{n / t_enc / 1e6:>10.2f} M/s{n / t_dec / 1e6:>10.2f} M/s")
+    print(f"{'Python puro':<18}{n / t_enc_py / 1e3:>10.1f} k/s{n / t_dec_py / 1e3:>10.1f} k/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Compensação vetorizada (NumPy) do BMP280 para reprocessar valores brutos
+
+Mesma aritmética inteira do datasheet que BMP280.compensate() em
+Libraries/bmp280.py, aplicada a arrays inteiros de adc_T/adc_P: os
+resultados são idênticos bit a bit aos do driver. Com os valores brutos
+registrados (ex.: gravações do recorder, ENABLE_RECORDER), meses de
+dados podem ser recalculados com outra calibração em segundos.
+
+Uso:
+    python bmp280_np.py --validate 200000 --bench 5000000
+    python bmp280_np.py ../rec/*.rpl --csv bmp280.csv
+    python bmp280_np.py ../rec/*.rpl --calibration 27504,26435,-1000,36477,-10685,3024,2855,140,-7,15500,-14600,6000
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "Libraries"))
+
+# Registradores de Libraries/bmp280.py
+REG_CALIBRATION = 0x88
+REG_PRESS_MSB = 0xF7
+REG_TEMP_MSB = 0xFA
+CALIBRATION_FMT = "<HhhHhhhhhhhh"
+CALIBRATION_SIZE = struct.calcsize(CALIBRATION_FMT)
+CALIBRATION_NAMES = ("dig_T1", "dig_T2", "dig_T3", "dig_P1", "dig_P2", "dig_P3",
+                     "dig_P4", "dig_P5", "dig_P6", "dig_P7", "dig_P8", "dig_P9")
+
+# Coeficientes do exemplo do datasheet (seção 8.2)
+DATASHEET_CALIBRATION = (27504, 26435, -1000, 36477, -10685, 3024, 2855, 140, -7, 15500, -14600, 6000)
+
+_INT64_MAX = (1 << 63) - 1
+
+def calibration_from_bytes(data):
+    """Coeficientes dig_T1..dig_P9 a partir dos 24 bytes em 0x88..0x9F"""
+    return struct.unpack(CALIBRATION_FMT, bytes(data[:CALIBRATION_SIZE]))
+
+def _compensate_scalar(adc_t, adc_p, cal):
+    """Uma amostra em inteiros do Python (sem limite): (temperatura x100, pressão Q24.8)"""
+    t1, t2, t3, p1, p2, p3, p4, p5, p6, p7, p8, p9 = cal
+    var1 = (((adc_t >> 3) - (t1 << 1)) * t2) >> 11
+    var2 = (((((adc_t >> 4) - t1) * ((adc_t >> 4) - t1)) >> 12) * t3) >> 14
+    t_fine = var1 + var2
+    temp = (t_fine * 5 + 128) >> 8
+    var1 = t_fine - 128000
+    var2 = var1 * var1 * p6
+    var2 = var2 + ((var1 * p5) << 17)
+    var2 = var2 + (p4 << 35)
+    var1 = ((var1 * var1 * p3) >> 8) + ((var1 * p2) << 12)
+    var1 = ((1 << 47) + var1) * p1 >> 33
+    if var1 == 0:
+        return temp, 0
+    p = 1048576 - adc_p
+    p = (((p << 31) - var2) * 3125) // var1
+    var1 = (p9 * (p >> 13) * (p >> 13)) >> 25
+    var2 = (p8 * p) >> 19
+    return temp, ((p + var1 + var2) >> 8) + (p7 << 4)
+
+def compensate_fixed(adc_t, adc_p, cal):
+    """
+    Compensação em ponto fixo, como no datasheet.
+
+    Args:
+        adc_t, adc_p: arrays de valores brutos de 20 bits
+        cal: dig_T1..dig_P9 (tupla de 12 inteiros)
+
+    Returns:
+        (temperatura em centésimos de °C, pressão em Q24.8 = Pa * 256), arrays int64
+    """
+    adc_t = np.asarray(adc_t, dtype=np.int64)
+    adc_p = np.asarray(adc_p, dtype=np.int64)
+    t1, t2, t3, p1, p2, p3, p4, p5, p6, p7, p8, p9 = (int(c) for c in cal)
+
+    # Temperatura: cabe em int64 para qualquer valor de 20 bits
+    var1 = (((adc_t >> 3) - (t1 << 1)) * t2) >> 11
+    d = (adc_t >> 4) - t1
+    var2 = (((d * d) >> 12) * t3) >> 14
+    t_fine = var1 + var2
+    temp = (t_fine * 5 + 128) >> 8
+
+    # Pressão: o datasheet usa int64; os produtos de (1 << 47) + var1 por
+    # dig_P1 e da divisão por 3125 podem estourar com valores fora da faixa
+    # física. Essas amostras são refeitas com inteiros do Python.
+    var1 = t_fine - 128000
+    var2 = var1 * var1 * p6
+    var2 = var2 + ((var1 * p5) << 17)
+    var2 = var2 + (p4 << 35)
+    var1 = ((var1 * var1 * p3) >> 8) + ((var1 * p2) << 12)
+    base = (1 << 47) + var1
+    overflow = np.abs(base) > (_INT64_MAX // p1 if p1 else _INT64_MAX)
+    var1 = (base * p1) >> 33
+    p = 1048576 - adc_p
+    num = (p << 31) - var2
+    overflow |= np.abs(num) > _INT64_MAX // 3125
+    zero = var1 == 0
+    # Divisor seguro nas amostras com var1 == 0 (resultado zerado abaixo)
+    p = (num * 3125) // np.where(zero, 1, var1)
+    q = p >> 13
+    var1 = (p9 * q * q) >> 25
+    var2 = (p8 * p) >> 19
+    pressure = ((p + var1 + var2) >> 8) + (p7 << 4)
+    pressure[zero] = 0
+
+    for i in np.flatnonzero(overflow):
+        temp[i], pressure[i] = _compensate_scalar(int(adc_t[i]), int(adc_p[i]), cal)
+    return temp, pressure
+
+def compensate(adc_t, adc_p, cal):
+    """
+    Temperatura (°C) e pressão (Pa) como floats, iguais aos de BMP280.read().
+
+    Returns:
+        (temperatura, pressão), arrays float64
+    """
+    temp, pressure = compensate_fixed(adc_t, adc_p, cal)
+    return temp / 100, pressure / 256
+
+# --- Gravações do recorder ---
+
+def load_recording(path):
+    """
+    Valores brutos do BMP280 em uma gravação (.rpl) de Libraries/recorder.py.
+
+    Returns:
+        dict com timestamp, adc_t, adc_p (arrays), a calibração lida no
+        boot e as amostras calculadas na placa (bmp_temp x100, bmp_pressure)
+    """
+    from Simulator.replay import read_events
+    from recorder import EV_CYCLE, EV_I2C, EV_SAMPLE
+    import reading
+
+    with open(path, "rb") as f:
+        events = read_events(f.read())
+    regs = bytearray(256)
+    timestamps, adc_t, adc_p, board = [], [], [], []
+    timestamp = 0
+    calibration = None
+    for kind, body in events:
+        if kind == EV_CYCLE:
+            timestamp = struct.unpack("<I", body)[0]
+        elif kind == EV_I2C:
+            reg, n = body[1], body[2]
+            regs[reg:reg + n] = body[3:]
+            # O driver lê a pressão por último (0xF9): amostra completa
+            if reg <= REG_PRESS_MSB + 2 < reg + n:
+                timestamps.append(timestamp)
+                adc_t.append(regs[REG_TEMP_MSB] << 12 | regs[REG_TEMP_MSB + 1] << 4 | regs[REG_TEMP_MSB + 2] >> 4)
+                adc_p.append(regs[REG_PRESS_MSB] << 12 | regs[REG_PRESS_MSB + 1] << 4 | regs[REG_PRESS_MSB + 2] >> 4)
+                board.append(None)
+            elif calibration is None and reg < REG_CALIBRATION + CALIBRATION_SIZE <= reg + n:
+                calibration = calibration_from_bytes(regs[REG_CALIBRATION:])
+        elif kind == EV_SAMPLE and board and board[-1] is None:
+            sample = reading.unpack_from(body)
+            if sample[1] & (1 << reading.CH_BMP_TEMP):
+                board[-1] = (sample[2 + reading.CH_BMP_TEMP], sample[2 + reading.CH_BMP_PRESSURE])
+    return {
+        "timestamp": np.array(timestamps, dtype=np.int64),
+        "adc_t": np.array(adc_t, dtype=np.int64),
+        "adc_p": np.array(adc_p, dtype=np.int64),
+        "calibration": calibration,
+        "board": board,
+    }
+
+# --- Validação e benchmark ---
+
+def driver(cal):
+    """BMP280 de Libraries/bmp280.py com a calibração dada, sem barramento"""
+    mpy = os.path.join(ROOT, "Simulator", "mpy")     # micropython.const
+    if mpy not in sys.path:
+        sys.path.insert(0, mpy)
+    from bmp280 import BMP280
+    sensor = BMP280.__new__(BMP280)
+    for name, value in zip(CALIBRATION_NAMES, cal):
+        setattr(sensor, name, value)
+    return sensor
+
+def random_calibration(rng, physical=True):
+    """Calibração aleatória: perto da faixa dos sensores reais, ou qualquer valor de 16 bits"""
+    if physical:
+        base = np.array(DATASHEET_CALIBRATION)
+        spread = np.maximum(np.abs(base) // 20, 3)
+        cal = base + rng.integers(-spread, spread + 1)
+    else:
+        cal = rng.integers(-32768, 32768, size=12)
+        cal[0] = rng.integers(0, 65536)
+        cal[3] = rng.integers(0, 65536)
+    return tuple(int(c) for c in cal)
+
+def validate(n, seed=1, calibrations=8):
+    """Compara com BMP280.compensate() em n amostras; retorna o número de diferenças"""
+    rng = np.random.default_rng(seed)
+    per_cal = max(1, n // calibrations)
+    differences = 0
+    checked = 0
+    for k in range(calibrations):
+        cal = DATASHEET_CALIBRATION if k == 0 else random_calibration(rng, physical=k % 2 == 1)
+        sensor = driver(cal)
+        adc_t = rng.integers(0, 1 << 20, size=per_cal)
+        adc_p = rng.integers(0, 1 << 20, size=per_cal)
+        # Extremos da faixa de 20 bits
+        adc_t[:4] = (0, 0, (1 << 20) - 1, (1 << 20) - 1)
+        adc_p[:4] = (0, (1 << 20) - 1, 0, (1 << 20) - 1)
+        temp, pressure = compensate(adc_t, adc_p, cal)
+        for i in range(per_cal):
+            t, p = sensor.compensate(int(adc_t[i]), int(adc_p[i]))
+            if t != temp[i] or p != pressure[i]:
+                if differences < 5:
+                    print(f"✗ cal={cal} adc_T={adc_t[i]} adc_P={adc_p[i]}: "
+                          f"driver ({t}, {p}), numpy ({temp[i]}, {pressure[i]})")
+                differences += 1
+        checked += per_cal
+    return checked, differences
+
+def bench(n, seed=1):
+    """Amostras por segundo da versão vetorizada e do driver (uma a uma)"""
+    rng = np.random.default_rng(seed)
+    cal = DATASHEET_CALIBRATION
+    # Faixa física: 0-40 °C, 950-1050 hPa
+    adc_t = rng.integers(480000, 560000, size=n)
+    adc_p = rng.integers(380000, 460000, size=n)
+    best = None
+    for _ in range(3):
+        t0 = time.perf_counter()
+        compensate(adc_t, adc_p, cal)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None or elapsed < best else best
+    sensor = driver(cal)
+    m = min(n, 100000)
+    t0 = time.perf_counter()
+    for i in range(m):
+        sensor.compensate(int(adc_t[i]), int(adc_p[i]))
+    scalar = (time.perf_counter() - t0) / m
+    return n / best, 1 / scalar
+
+def parse_calibration(text):
+    values = tuple(int(v) for v in text.split(","))
+    if len(values) != 12:
+        raise argparse.ArgumentTypeError("a calibração tem 12 coeficientes (dig_T1..dig_P9)")
+    return values
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*", help="Gravações (.rpl) do recorder")
+    parser.add_argument("--calibration", type=parse_calibration,
+                        help="dig_T1..dig_P9 separados por vírgula (padrão: a lida no boot de cada gravação)")
+    parser.add_argument("--csv", help="Grava timestamp, valores brutos, temperatura e pressão em CSV")
+    parser.add_argument("--validate", type=int, default=0, metavar="N",
+                        help="Compara N amostras aleatórias com o driver")
+    parser.add_argument("--bench", type=int, default=0, metavar="N", help="Mede a vazão com N amostras")
+    args = parser.parse_args()
+
+    failed = False
+    if args.validate:
+        checked, differences = validate(args.validate)
+        if differences:
+            print(f"✗ {differences} de {checked} amostras diferentes do driver")
+            failed = True
+        else:
+            print(f"✓ {checked} amostras idênticas às do driver")
+    if args.bench:
+        vector, scalar = bench(args.bench)
+        print(f"NumPy:  {vector / 1e6:8.2f} M amostras/s")
+        print(f"Driver: {scalar / 1e6:8.3f} M amostras/s ({vector / scalar:.0f}x)")
+
+    rows = []
+    for path in args.files:
+        rec = load_recording(path)
+        cal = args.calibration or rec["calibration"]
+        if cal is None:
+            print(f"✗ {path}: sem calibração na gravação (use --calibration)")
+            failed = True
+            continue
+        temp, pressure = compensate(rec["adc_t"], rec["adc_p"], cal)
+        n = len(temp)
+        # Conferência com as amostras calculadas na placa (mesmo ponto fixo de reading.py)
+        compared = mismatches = 0
+        for i, sample in enumerate(rec["board"]):
+            if sample is not None:
+                compared += 1
+                if sample != (int(round(temp[i] * 100)), int(round(pressure[i]))):
+                    mismatches += 1
+        note = f", {mismatches} de {compared} diferentes da placa" if mismatches else \
+               f", {compared} iguais às da placa" if compared and args.calibration is None else ""
+        print(f"{path}: {n} amostras{note}")
+        rows.append((rec["timestamp"], rec["adc_t"], rec["adc_p"], temp, pressure))
+
+    if args.csv and rows:
+        data = np.concatenate([np.column_stack(r) for r in rows])
+        np.savetxt(args.csv, data, delimiter=",", fmt=("%d", "%d", "%d", "%.2f", "%.8f"),
+                   header="timestamp,adc_T,adc_P,temperature,pressure", comments="")
+        print(f"Amostras em {args.csv}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Versão vetorizada (NumPy) das grandezas derivadas de Libraries/derived.py
+
+Sensação térmica, ponto de orvalho, umidade absoluta e classe de
+conforto sobre arrays inteiros de temperatura e umidade (ex.: o
+histórico exportado por export_history.py), com as mesmas fórmulas e
+faixas da versão da placa, sem laço Python por amostra.
+
+Uso:
+    python derived_np.py --validate 100000 --bench 5000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Libraries"))
+import derived
+
+def heat_index(temperature, humidity):
+    """Sensação térmica em °C"""
+    t = np.asarray(temperature, dtype=np.float64)
+    h = np.asarray(humidity, dtype=np.float64)
+    temp_f = t * 9 / 5 + 32
+    hi = 0.5 * (temp_f + 61.0 + ((temp_f - 68.0) * 1.2) + (h * 0.094))
+    full = -42.379 + 2.04901523 * temp_f + 10.14333127 * h
+    full = full - 0.22475541 * temp_f * h - 6.83783e-3 * temp_f * temp_f
+    full = full - 5.481717e-2 * h * h + 1.22874e-3 * temp_f * temp_f * h
+    full = full + 8.5282e-4 * temp_f * h * h - 1.99e-6 * temp_f * temp_f * h * h
+    hi = np.where(hi > 80, full, hi)
+    return (hi - 32) * 5 / 9
+
+def dew_point(temperature, humidity):
+    """Ponto de orvalho em °C (NaN com umidade 0)"""
+    t = np.asarray(temperature, dtype=np.float64)
+    h = np.asarray(humidity, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = np.log(h / 100) + derived.MAGNUS_A * t / (derived.MAGNUS_B + t)
+        dp = derived.MAGNUS_B * gamma / (derived.MAGNUS_A - gamma)
+    return np.where(h > 0, dp, np.nan)
+
+def absolute_humidity(temperature, humidity):
+    """Umidade absoluta em g/m³"""
+    t = np.asarray(temperature, dtype=np.float64)
+    h = np.asarray(humidity, dtype=np.float64)
+    es = 6.112 * np.exp(derived.MAGNUS_A * t / (derived.MAGNUS_B + t))
+    return 216.7 * es * h / 100 / (273.15 + t)
+
+def comfort(temperature, humidity):
+    """Classe de conforto (derived.COMFORT_*) como array int8"""
+    t = np.asarray(temperature, dtype=np.float64)
+    h = np.asarray(humidity, dtype=np.float64)
+    lo_h, hi_h = derived.COMFORT_HUMIDITY
+    lo_t, hi_t = derived.COMFORT_TEMP
+    return np.select(
+        [h < lo_h, h > hi_h, t < lo_t, t > hi_t],
+        [derived.COMFORT_DRY, derived.COMFORT_HUMID, derived.COMFORT_COOL, derived.COMFORT_WARM],
+        derived.COMFORT_OK).astype(np.int8)
+
+def quantize(temperature, humidity):
+    """Entradas arredondadas como no cache da placa (0.1 °C, 1 %)"""
+    t = np.round(np.asarray(temperature, dtype=np.float64) * derived.TEMP_QUANTUM) / derived.TEMP_QUANTUM
+    return t, np.round(np.asarray(humidity, dtype=np.float64))
+
+def compute(temperature, humidity):
+    """Todas as grandezas: dict de arrays (heat_index, dew_point, abs_humidity, comfort)"""
+    return {
+        "heat_index": heat_index(temperature, humidity),
+        "dew_point": dew_point(temperature, humidity),
+        "abs_humidity": absolute_humidity(temperature, humidity),
+        "comfort": comfort(temperature, humidity),
+    }
+
+def validate(n, seed=1):
+    """Compara com as funções de Libraries/derived.py; retorna o número de diferenças"""
+    rng = np.random.default_rng(seed)
+    t = np.round(rng.uniform(-20, 50, n), 2)
+    h = np.round(rng.uniform(0, 100, n))
+    # Limites das faixas de conforto e do ramo da fórmula completa
+    t[:6] = (20, 26, 19.99, 26.01, 26.7, 40)
+    h[:6] = (40, 60, 39, 61, 0, 100)
+    result = compute(t, h)
+    differences = 0
+    for i in range(n):
+        ti, hi = float(t[i]), float(h[i])
+        dp = derived.dew_point(ti, hi)
+        expected = (derived.heat_index(ti, hi), np.nan if dp is None else dp,
+                    derived.absolute_humidity(ti, hi), derived.comfort(ti, hi))
+        got = (result["heat_index"][i], result["dew_point"][i], result["abs_humidity"][i], result["comfort"][i])
+        same = expected[3] == got[3] and all(
+            (np.isnan(a) and np.isnan(b)) or abs(a - b) <= 1e-9 * max(1.0, abs(a))
+            for a, b in zip(expected[:3], got[:3]))
+        if not same:
+            if differences < 5:
+                print(f"✗ t={ti} h={hi}: placa {expected}, numpy {got}")
+            differences += 1
+    return differences
+
+def bench(n, seed=1):
+    """Amostras por segundo da versão vetorizada e da versão da placa (com e sem cache)"""
+    rng = np.random.default_rng(seed)
+    # Série lenta como a da estação (leituras a cada 8 s)
+    t = np.round(24 + np.cumsum(rng.normal(0, 0.01, n)), 2)
+    h = np.round(np.clip(60 + np.cumsum(rng.normal(0, 0.05, n)), 0, 100))
+    t0 = time.perf_counter()
+    compute(t, h)
+    vector = n / (time.perf_counter() - t0)
+    m = min(n, 100000)
+    ts, hs = t[:m].tolist(), h[:m].tolist()
+    t0 = time.perf_counter()
+    for i in range(m):
+        ti, hi = ts[i], hs[i]
+        derived.heat_index(ti, hi), derived.dew_point(ti, hi), derived.absolute_humidity(ti, hi), derived.comfort(ti, hi)
+    scalar = m / (time.perf_counter() - t0)
+    cache = derived.Derived()
+    t0 = time.perf_counter()
+    for i in range(m):
+        cache.compute(ts[i], hs[i])
+    cached = m / (time.perf_counter() - t0)
+    return vector, scalar, cached, cache.hits / m
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--validate", type=int, default=0, metavar="N",
+                        help="Compara N amostras aleatórias com Libraries/derived.py")
+    parser.add_argument("--bench", type=int, default=0, metavar="N", help="Mede a vazão com N amostras")
+    args = parser.parse_args()
+    if not (args.validate or args.bench):
+        parser.error("use --validate e/ou --bench")
+
+    if args.validate:
+        differences = validate(args.validate)
+        if differences:
+            sys.exit(f"✗ {differences} de {args.validate} amostras diferentes de Libraries/derived.py")
+        print(f"✓ {args.validate} amostras iguais às de Libraries/derived.py")
+    if args.bench:
+        vector, scalar, cached, hit_rate = bench(args.bench)
+        print(f"NumPy:         {vector / 1e6:8.2f} M amostras/s")
+        print(f"Placa:         {scalar / 1e6:8.3f} M amostras/s")
+        print(f"Placa (cache): {cached / 1e6:8.3f} M amostras/s ({hit_rate * 100:.0f}% de acertos)")
+
+if __name__ == "__main__":
+    main()
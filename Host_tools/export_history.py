@@ -0,0 +1,351 @@
+"""
+Exportação incremental do histórico da estação para Parquet/Arrow
+
+Conversa com Libraries/export_agent.py pelo raw REPL (o mesmo protocolo
+usado pelo mpremote) e baixa apenas os blocos de 4096 bytes do log que
+contêm registros mais novos que a última sincronização (nada, se já
+está em dia). Cada bloco
+chega com CRC32 e é pedido de novo se corrompido; os registros
+conferidos vão para um arquivo de preparação e o último seq é salvo a
+cada lote, então uma transferência interrompida continua de onde
+parou. O deslocamento da época do relógio vem da própria placa. No fim os registros são decodificados de uma vez com NumPy
+(incluindo o CRC16 de cada registro) e gravados em um arquivo colunar.
+
+Uso:
+    python export_history.py --port /dev/ttyUSB0 --out dados/
+    python export_history.py --dir copia_do_log/ --out dados/   (segmentos já copiados)
+    python export_history.py --dir sim/log/ --epoch-offset 0 --out dados/   (log do simulador)
+
+Requer NumPy e pyarrow; --port requer pyserial.
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import zlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Libraries"))
+import reading
+
+ESP32_EPOCH_OFFSET = 946684800      # Época do MicroPython no ESP32 (2000-01-01)
+RECORD_SIZE = 32
+BLOCK_SIZE = 4096
+RECORDS_PER_BLOCK = BLOCK_SIZE // RECORD_SIZE
+BLOCKS_PER_REQUEST = 4
+RETRIES = 3
+STATE_FILE = "sync_state.json"
+STAGING_FILE = "staging.bin"
+
+LOG_DTYPE = np.dtype([("ts", "<u4"), ("flags", "<u2"), ("values", "<i4", (5,)),
+                      ("seq", "<u4"), ("crc", "<u2")])
+
+def _crc_table():
+    table = np.zeros(256, dtype=np.uint16)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+        table[i] = crc
+    return table
+
+_CRC_TABLE = _crc_table()
+
+def crc16_records(raw):
+    """CRC-16/CCITT-FALSE dos 30 primeiros bytes de cada registro (vetorizado)"""
+    data = raw.view(np.uint8).reshape(-1, RECORD_SIZE)
+    crc = np.full(len(data), 0xFFFF, dtype=np.uint16)
+    for col in range(RECORD_SIZE - 2):
+        idx = ((crc >> 8) ^ data[:, col]) & 0xFF
+        crc = ((crc << 8) & 0xFF00) ^ _CRC_TABLE[idx]
+    return crc
+
+def decode_records(buf):
+    """Registros válidos (CRC conferido) de um buffer de blocos do log"""
+    buf = bytes(buf[:len(buf) - len(buf) % RECORD_SIZE])
+    records = np.frombuffer(buf, dtype=LOG_DTYPE)
+    return records[crc16_records(records) == records["crc"]]
+
+class RawRepl:
+    """Cliente mínimo do raw REPL do MicroPython sobre pyserial"""
+    def __init__(self, port, baud):
+        try:
+            import serial
+        except ImportError:
+            sys.exit("pyserial não instalado: pip install pyserial")
+        self.ser = serial.Serial(port, baud, timeout=0.5)
+
+    def _read_until(self, ending, timeout=10):
+        data = bytearray()
+        deadline = time.monotonic() + timeout
+        while not data.endswith(ending):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"sem resposta do ESP32 (esperando {ending!r})")
+            data += self.ser.read(max(1, min(self.ser.in_waiting, 4096)))
+        return bytes(data[:-len(ending)])
+
+    def enter(self):
+        # Ctrl+C interrompe o main.py (que fecha o log); Ctrl+A entra no raw REPL
+        self.ser.write(b"\r\x03\x03")
+        time.sleep(0.5)
+        self.ser.reset_input_buffer()
+        self.ser.write(b"\r\x01")
+        self._read_until(b"raw REPL; CTRL-B to exit\r\n>")
+
+    def exec(self, code, timeout=10):
+        self.ser.write(code.encode() + b"\x04")
+        if self.ser.read(2) != b"OK":
+            raise RuntimeError("raw REPL não aceitou o comando")
+        out = self._read_until(b"\x04", timeout)
+        err = self._read_until(b"\x04", timeout)
+        self._read_until(b">", timeout)
+        if err:
+            raise RuntimeError(err.decode(errors="replace"))
+        return out
+
+    def close(self, restart=True):
+        # Ctrl+B volta ao REPL normal; Ctrl+D reinicia e roda o main.py
+        self.ser.write(b"\x02")
+        if restart:
+            self.ser.write(b"\x04")
+        self.ser.close()
+
+class DeviceSource:
+    """Blocos do log lidos do ESP32 pelo export_agent"""
+    def __init__(self, port, baud, path):
+        self.repl = RawRepl(port, baud)
+        self.path = path
+        self.repl.enter()
+        self.repl.exec("import export_agent")
+
+    def manifest(self, since=-1):
+        return json.loads(self.repl.exec(f"export_agent.manifest({self.path!r}, {since})"))
+
+    def read_blocks(self, name, first, count):
+        out = self.repl.exec(f"export_agent.read_blocks({name!r}, {first}, {count}, {self.path!r})")
+        blocks = []
+        for line in out.decode().splitlines():
+            index, crc, data = line.split()
+            blocks.append((int(index), int(crc, 16), base64.b64decode(data)))
+        return blocks
+
+    def close(self):
+        self.repl.close()
+
+class DirectorySource:
+    """Blocos lidos de uma cópia local dos segmentos (mpremote fs cp)"""
+    def __init__(self, path, epoch_offset=ESP32_EPOCH_OFFSET):
+        self.path = path
+        self.epoch_offset = epoch_offset
+
+    def manifest(self, since=-1):
+        segments = []
+        for name in sorted(os.listdir(self.path)):
+            if not (name.startswith("seg") and name.endswith(".bin")):
+                continue
+            full = os.path.join(self.path, name)
+            with open(full, "rb") as f:
+                records = decode_records(f.read())
+            if not len(records):
+                continue
+            # Registros contínuos a partir do início, como no export_agent
+            seq0 = int(records["seq"][0])
+            contiguous = records["seq"] - seq0 == np.arange(len(records))
+            last = seq0 + (len(records) if contiguous.all() else int(np.argmin(contiguous))) - 1
+            if last >= since:
+                segments.append([name, os.path.getsize(full), seq0, last])
+        return {"record_size": RECORD_SIZE, "block_size": BLOCK_SIZE,
+                "epoch_offset": self.epoch_offset, "segments": segments}
+
+    def read_blocks(self, name, first, count):
+        blocks = []
+        with open(os.path.join(self.path, name), "rb") as f:
+            f.seek(first * BLOCK_SIZE)
+            for index in range(first, first + count):
+                data = f.read(BLOCK_SIZE)
+                if not data:
+                    break
+                blocks.append((index, zlib.crc32(data), data))
+        return blocks
+
+    def close(self):
+        pass
+
+def load_state(out_dir):
+    try:
+        with open(os.path.join(out_dir, STATE_FILE)) as f:
+            state = json.load(f)
+        state.setdefault("epoch_offset", ESP32_EPOCH_OFFSET)
+        return state
+    except (OSError, ValueError):
+        return {"last_seq": -1, "epoch_offset": ESP32_EPOCH_OFFSET, "files": []}
+
+def save_state(out_dir, state):
+    tmp = os.path.join(out_dir, STATE_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, os.path.join(out_dir, STATE_FILE))
+
+def fetch(source, name, first, count):
+    """Lê blocos conferindo o CRC32; repete os corrompidos"""
+    for attempt in range(RETRIES):
+        blocks = source.read_blocks(name, first, count)
+        if all(zlib.crc32(data) == crc for _, crc, data in blocks):
+            return blocks
+        print(f"  CRC divergente em {name} bloco {first} - tentativa {attempt + 2}")
+    raise RuntimeError(f"{name}: blocos {first}..{first + count - 1} corrompidos")
+
+def sync(source, out_dir):
+    """Baixa para o arquivo de preparação os registros novos. Retorna bytes transferidos"""
+    state = load_state(out_dir)
+    info = source.manifest(state["last_seq"])
+    if info["record_size"] != RECORD_SIZE or info["block_size"] != BLOCK_SIZE:
+        raise RuntimeError("formato do log diferente do esperado")
+    state["epoch_offset"] = info["epoch_offset"]
+
+    # Só vêm segmentos com registros a partir do último seq sincronizado
+    segments = sorted(info["segments"], key=lambda s: s[2])
+    if segments and state["last_seq"] >= 0 and segments[0][2] > state["last_seq"] + 1:
+        print(f"Aviso: registros {state['last_seq'] + 1}..{segments[0][2] - 1} já foram sobrescritos")
+
+    transferred = 0
+    staging = os.path.join(out_dir, STAGING_FILE)
+    for name, size, seq0, last in segments:
+        if last <= state["last_seq"]:
+            continue
+        # Do primeiro bloco com registros além do último sincronizado
+        # até o bloco do último registro gravado no segmento
+        block = max(0, (state["last_seq"] + 1 - seq0) // RECORDS_PER_BLOCK)
+        end_block = min(size // BLOCK_SIZE, (last - seq0) // RECORDS_PER_BLOCK + 1)
+        while block < end_block:
+            count = min(BLOCKS_PER_REQUEST, end_block - block)
+            blocks = fetch(source, name, block, count)
+            raw = b"".join(data for _, _, data in blocks)
+            transferred += len(raw)
+            records = decode_records(raw)
+            # Só a sequência contínua a partir do início do bloco
+            expected = seq0 + block * RECORDS_PER_BLOCK + np.arange(len(records))
+            contiguous = records["seq"] == expected[:len(records)]
+            end = len(records) if contiguous.all() else int(np.argmin(contiguous))
+            new = records[:end]
+            new = new[new["seq"] > state["last_seq"]]
+            if len(new):
+                with open(staging, "ab") as f:
+                    f.write(new.tobytes())
+                state["last_seq"] = int(new["seq"][-1])
+                save_state(out_dir, state)
+            if end < count * RECORDS_PER_BLOCK:
+                break           # Fim dos dados gravados neste segmento
+            block += count
+    return transferred
+
+def to_table(records, epoch_offset, with_derived=False):
+    """Converte registros do log em colunas (pyarrow.Table)"""
+    import pyarrow as pa
+    columns = {
+        "time": pa.array(records["ts"].astype(np.int64) + epoch_offset, type=pa.timestamp("s", tz="UTC")),
+        "seq": pa.array(np.ascontiguousarray(records["seq"])),
+        "flags": pa.array(np.ascontiguousarray(records["flags"])),
+    }
+    for ch, key in enumerate(reading.CHANNEL_KEYS):
+        valid = (records["flags"] & (1 << ch)) != 0
+        values = records["values"][:, ch] / reading.CHANNEL_SCALES[ch]
+        columns[key] = pa.array(values, mask=~valid)
+    if with_derived:
+        columns.update(derived_columns(records))
+    return pa.table(columns)
+
+def derived_columns(records):
+    """Sensação térmica, ponto de orvalho, umidade absoluta e conforto (derived_np.py)"""
+    import pyarrow as pa
+    import derived
+    import derived_np
+    flags = records["flags"]
+    values = records["values"]
+    valid = ((flags & (1 << reading.CH_DHT_TEMP)) != 0) & ((flags & (1 << reading.CH_DHT_HUMIDITY)) != 0)
+    temp_dht = values[:, reading.CH_DHT_TEMP] / reading.CHANNEL_SCALES[reading.CH_DHT_TEMP]
+    humidity = values[:, reading.CH_DHT_HUMIDITY] / reading.CHANNEL_SCALES[reading.CH_DHT_HUMIDITY]
+    # Conforto com a temperatura do BMP280 quando houver, como na placa
+    has_bmp = (flags & (1 << reading.CH_BMP_TEMP)) != 0
+    temp = np.where(has_bmp, values[:, reading.CH_BMP_TEMP] / reading.CHANNEL_SCALES[reading.CH_BMP_TEMP], temp_dht)
+    dp = derived_np.dew_point(temp_dht, humidity)
+    labels = pa.array(derived.COMFORT_LABELS)
+    return {
+        "heat_index": pa.array(derived_np.heat_index(temp_dht, humidity), mask=~valid),
+        "dew_point": pa.array(dp, mask=~valid | np.isnan(dp)),
+        "abs_humidity": pa.array(derived_np.absolute_humidity(temp_dht, humidity), mask=~valid),
+        "comfort": pa.DictionaryArray.from_arrays(
+            pa.array(derived_np.comfort(temp, humidity), mask=~valid), labels),
+    }
+
+def finalize(out_dir, fmt, with_derived=False):
+    """Converte o arquivo de preparação em um arquivo Parquet/Arrow"""
+    staging = os.path.join(out_dir, STAGING_FILE)
+    if not os.path.exists(staging):
+        return None
+    with open(staging, "rb") as f:
+        records = np.frombuffer(f.read(), dtype=LOG_DTYPE)
+    if not len(records):
+        os.remove(staging)
+        return None
+
+    state = load_state(out_dir)
+    table = to_table(records, state["epoch_offset"], with_derived)
+    name = f"history_{records['seq'][0]:08d}_{records['seq'][-1]:08d}.{fmt}"
+    path = os.path.join(out_dir, name)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression="zstd")
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path)
+
+    state["files"].append(name)
+    save_state(out_dir, state)
+    os.remove(staging)
+    return path, len(records)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--port", help="Porta serial do ESP32")
+    source.add_argument("--dir", help="Diretório com cópia local dos segmentos")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--log-path", default="/log", help="Diretório do log no ESP32")
+    parser.add_argument("--epoch-offset", type=int, default=ESP32_EPOCH_OFFSET,
+                        help="Com --dir: segundos somados aos timestamps (0 para o log do simulador)")
+    parser.add_argument("--out", required=True, help="Diretório de saída")
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet")
+    parser.add_argument("--derived", action="store_true",
+                        help="Inclui sensação térmica, ponto de orvalho, umidade absoluta e conforto")
+    args = parser.parse_args()
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        sys.exit("pyarrow não instalado: pip install pyarrow")
+
+    os.makedirs(args.out, exist_ok=True)
+    t0 = time.perf_counter()
+    if args.port:
+        src = DeviceSource(args.port, args.baud, args.log_path)
+    else:
+        src = DirectorySource(args.dir, args.epoch_offset)
+    try:
+        transferred = sync(src, args.out)
+    finally:
+        src.close()
+    result = finalize(args.out, args.format, args.derived)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{transferred} bytes transferidos em {elapsed:.1f} s")
+    if result:
+        print(f"{result[1]} registros novos em {result[0]}")
+    else:
+        print("Nenhum registro novo")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Teste de resistência do publicador MQTT (Libraries/mqtt_telemetry.py)
+
+Roda o mesmo código do ESP32 no CPython contra um broker MQTT falso no
+próprio processo (ou um mosquitto em --broker host:porta), com tempo
+acelerado: amostras a cada --sample-ms, quedas periódicas do broker e
+um rádio simulado que leva --radio-ms para conectar. No fim confere que
+todas as amostras chegaram (fora as descartadas com a fila cheia) e
+mostra vazão, bytes por amostra e tempo de rádio ligado.
+
+Uso:
+    python mqtt_soak.py [--samples 5000] [--batch 16] [--outage-every 2] [--outage-s 0.5]
+    python mqtt_soak.py --broker localhost:1883
+"""
+import argparse
+import asyncio
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Libraries"))
+import tscodec
+from mqtt_telemetry import MqttClient, MqttPublisher, Spool
+
+TOPIC = b"estacao/soak/lotes"
+
+class FakeBroker:
+    """Broker MQTT mínimo (CONNECT, PUBLISH QoS 0/1, DISCONNECT) com quedas programadas"""
+    def __init__(self):
+        self.payloads = []
+        self.online = True
+        self.connections = 0
+        self._server = None
+        self._writers = set()
+
+    async def start(self, port=0):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+        return self._server.sockets[0].getsockname()[1]
+
+    def set_online(self, online):
+        self.online = online
+        if not online:
+            # Derruba as conexões abertas, como um broker que caiu
+            for writer in list(self._writers):
+                writer.close()
+
+    async def _read_packet(self, reader):
+        head = await reader.readexactly(1)
+        length = 0
+        shift = 0
+        while True:
+            b = (await reader.readexactly(1))[0]
+            length |= (b & 0x7F) << shift
+            shift += 7
+            if not b & 0x80:
+                break
+        return head[0], await reader.readexactly(length)
+
+    async def _handle(self, reader, writer):
+        if not self.online:
+            writer.close()
+            return
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                kind, body = await self._read_packet(reader)
+                if kind == 0x10:
+                    writer.write(b"\x20\x02\x00\x00")
+                elif kind & 0xF0 == 0x30:
+                    size = struct.unpack("!H", body[:2])[0]
+                    pos = 2 + size
+                    if kind & 0x06:
+                        pid = body[pos:pos + 2]
+                        pos += 2
+                        writer.write(b"\x40\x02" + pid)
+                    self.payloads.append(body[pos:])
+                elif kind == 0xE0:
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+class FakeRadio:
+    """Rádio simulado: on() leva o tempo de associação ao Wi-Fi"""
+    def __init__(self, connect_s):
+        self.connect_s = connect_s
+        self.cycles = 0
+
+    async def on(self):
+        self.cycles += 1
+        await asyncio.sleep(self.connect_s)
+
+    def off(self):
+        pass
+
+async def soak(args):
+    broker = None
+    if args.broker:
+        host, port = args.broker.split(":")
+        client = MqttClient(host, int(port), client_id="soak")
+    else:
+        broker = FakeBroker()
+        port = await broker.start()
+        client = MqttClient("127.0.0.1", port, client_id="soak", timeout_s=1)
+
+    spool_dir = tempfile.mkdtemp(prefix="mqtt_spool_")
+    radio = FakeRadio(args.radio_ms / 1000)
+    publisher = MqttPublisher(client, TOPIC, batch_size=args.batch, spool=Spool(spool_dir, args.spool_max),
+                              radio=radio, drain_per_s=args.drain_per_s, retry_s=0.05, max_retry_s=0.4)
+    task = asyncio.create_task(publisher.run())
+
+    async def outages():
+        while True:
+            await asyncio.sleep(args.outage_every)
+            broker.set_online(False)
+            await asyncio.sleep(args.outage_s)
+            broker.set_online(True)
+
+    outage_task = None
+    if broker is not None and args.outage_every:
+        outage_task = asyncio.create_task(outages())
+
+    values = [2500, 101325, 2500, 6000, 3600]
+    t_start = time.perf_counter()
+    for i in range(args.samples):
+        values[0] = 2500 + i % 37
+        values[1] = 101325 + (i // 10) % 50
+        publisher.add(800000000 + i * 8, 0x1F, values)
+        await asyncio.sleep(args.sample_ms / 1000)
+    if outage_task is not None:
+        outage_task.cancel()
+        broker.set_online(True)
+
+    # Espera esvaziar a fila
+    deadline = time.perf_counter() + 30
+    while publisher.backlog() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    wall = time.perf_counter() - t_start
+    task.cancel()
+
+    stats = publisher.stats()
+    print(f"Amostras geradas:   {stats['samples']} em {wall:.1f} s")
+    print(f"Lotes publicados:   {stats['published']} ({stats['published_samples']} amostras), "
+          f"{stats['failures']} falhas, {stats['spooled']} para a flash, {stats['dropped']} descartados")
+    print(f"Vazão:              {stats['published_samples'] / wall:.0f} amostras/s")
+    if stats['published_samples']:
+        print(f"Tamanho:            {stats['bytes_sent'] / stats['published_samples']:.2f} bytes/amostra")
+    print(f"Rádio ligado:       {stats['radio_on_ms'] / 1000:.2f} s ({100 * stats['radio_on_ms'] / 1000 / wall:.1f}% do tempo), "
+          f"{radio.cycles} ciclos")
+
+    if broker is not None:
+        received = set()
+        for payload in broker.payloads:
+            for rec in tscodec.decode(payload):
+                received.add(rec[0])
+        expected = {800000000 + i * 8 for i in range(args.samples - args.samples % args.batch)}
+        missing = len(expected - received)
+        print(f"Broker:             {len(broker.payloads)} mensagens, {broker.connections} conexões, "
+              f"{len(received)} amostras distintas, {missing} faltando")
+        if missing != stats['dropped'] * args.batch:
+            print("✗ Amostras perdidas além das descartadas pela fila cheia")
+            return 1
+        print("✓ Todas as amostras não descartadas foram entregues")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--sample-ms", type=float, default=1, help="Intervalo entre amostras (tempo acelerado)")
+    parser.add_argument("--radio-ms", type=float, default=20, help="Tempo para o rádio conectar")
+    parser.add_argument("--drain-per-s", type=float, default=50)
+    parser.add_argument("--spool-max", type=int, default=64)
+    parser.add_argument("--outage-every", type=float, default=2, help="Segundos entre quedas do broker (0 = nunca)")
+    parser.add_argument("--outage-s", type=float, default=0.5)
+    parser.add_argument("--broker", help="host:porta de um broker real (ex.: mosquitto)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(soak(args)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Decodificador da telemetria binária da estação (Libraries/telemetry.py)
+
+Lê um fluxo da serial (ou de um arquivo capturado), separa os quadros
+pelo sincronismo + CRC, ignora o texto misturado e junta os payloads
+por tipo. Os payloads de tamanho fixo são convertidos de uma vez em
+arrays NumPy estruturados, sem laço Python por campo.
+
+Uso:
+    python telemetry_decoder.py --port /dev/ttyUSB0 [--baud 115200] [--seconds 60] [--out captura.npz]
+    python telemetry_decoder.py --file captura.bin [--out captura.npz]
+
+--port requer pyserial (pip install pyserial).
+"""
+import argparse
+import binascii
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Libraries"))
+import telemetry
+
+SYNC = telemetry.SYNC
+HEADER_SIZE = telemetry.HEADER_SIZE
+CRC_SIZE = telemetry.CRC_SIZE
+
+READING_DTYPE = np.dtype([("ts", "<u4"), ("flags", "<u2"), ("values", "<i4", (5,))])
+STATS_DTYPE = np.dtype([("cycle", "<u4"), ("sensor_ms", "<u2"), ("display_ms", "<u2"),
+                        ("errors", "<u2"), ("mem_free", "<u4")])
+EVENT_DTYPE = np.dtype([("code", "u1"), ("arg", "<i4")])
+
+_FIXED = {
+    telemetry.TYPE_READING: READING_DTYPE,
+    telemetry.TYPE_STATS: STATS_DTYPE,
+    telemetry.TYPE_EVENT: EVENT_DTYPE,
+}
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE (mesmo de Libraries/crc16.py), em C via binascii"""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+class FrameDecoder:
+    """Decodificador incremental: feed() com blocos lidos da serial"""
+    def __init__(self):
+        self._buf = bytearray()
+        self.payloads = {t: bytearray() for t in _FIXED}
+        self.texts = []
+        self.noise = bytearray()        # Bytes fora de quadros (print, REPL)
+        self.frames = 0
+        self.crc_errors = 0
+
+    def feed(self, data):
+        buf = self._buf
+        buf += data
+        pos = 0
+        end = len(buf)
+        while True:
+            start = buf.find(SYNC, pos)
+            if start < 0:
+                # Guarda um possível primeiro byte do sincronismo
+                keep = end - 1 if end and buf[-1] == SYNC[0] else end
+                self.noise += buf[pos:keep]
+                pos = keep
+                break
+            self.noise += buf[pos:start]
+            if start + HEADER_SIZE > end:
+                pos = start
+                break
+            size = buf[start + 2]
+            frame_end = start + HEADER_SIZE + size + CRC_SIZE
+            if frame_end > end:
+                pos = start
+                break
+            crc = buf[frame_end - 2] | buf[frame_end - 1] << 8
+            if crc != crc16(buf[start + 2:frame_end - 2]):
+                # Falso sincronismo: o primeiro byte vira ruído
+                self.crc_errors += 1
+                self.noise += buf[start:start + 1]
+                pos = start + 1
+                continue
+            self._frame(buf[start + 3], buf[start + HEADER_SIZE:frame_end - 2])
+            pos = frame_end
+        del buf[:pos]
+
+    def _frame(self, frame_type, payload):
+        self.frames += 1
+        fixed = _FIXED.get(frame_type)
+        if fixed is not None:
+            if len(payload) == fixed.itemsize:
+                self.payloads[frame_type] += payload
+        elif frame_type == telemetry.TYPE_TEXT:
+            self.texts.append(payload.decode("utf-8", "replace"))
+
+    def arrays(self):
+        """Retorna {'readings': ..., 'stats': ..., 'events': ...} como arrays estruturados"""
+        return {
+            "readings": np.frombuffer(bytes(self.payloads[telemetry.TYPE_READING]), READING_DTYPE),
+            "stats": np.frombuffer(bytes(self.payloads[telemetry.TYPE_STATS]), STATS_DTYPE),
+            "events": np.frombuffer(bytes(self.payloads[telemetry.TYPE_EVENT]), EVENT_DTYPE),
+        }
+
+def read_serial(decoder, port, baud, seconds):
+    try:
+        import serial
+    except ImportError:
+        sys.exit("pyserial não instalado: pip install pyserial")
+    deadline = time.monotonic() + seconds if seconds else None
+    with serial.Serial(port, baud, timeout=0.1) as ser:
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                data = ser.read(max(1, ser.in_waiting))
+                if data:
+                    decoder.feed(data)
+        except KeyboardInterrupt:
+            pass
+
+def read_file(decoder, path, block=65536):
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(block)
+            if not data:
+                break
+            decoder.feed(data)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--port", help="Porta serial do ESP32")
+    source.add_argument("--file", help="Arquivo com o fluxo capturado")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--seconds", type=float, default=0, help="Duração da captura (0 = até Ctrl+C)")
+    parser.add_argument("--out", help="Salva os arrays em um arquivo .npz")
+    parser.add_argument("--show-text", action="store_true", help="Mostra o texto fora dos quadros")
+    args = parser.parse_args()
+
+    decoder = FrameDecoder()
+    t0 = time.perf_counter()
+    if args.port:
+        read_serial(decoder, args.port, args.baud, args.seconds)
+    else:
+        read_file(decoder, args.file)
+    elapsed = time.perf_counter() - t0
+
+    result = decoder.arrays()
+    readings = result["readings"]
+    print(f"{decoder.frames} quadros em {elapsed:.2f} s, {decoder.crc_errors} erros de CRC, "
+          f"{len(decoder.noise)} bytes de texto")
+    print(f"Leituras: {len(readings)}, estatísticas: {len(result['stats'])}, eventos: {len(result['events'])}")
+    if len(readings):
+        temps = readings["values"][:, 0][readings["flags"] & 1 != 0] / 100
+        if len(temps):
+            print(f"BMP280 temp.: min {temps.min():.2f} / média {temps.mean():.2f} / máx {temps.max():.2f} °C")
+    if args.show_text:
+        print(decoder.noise.decode("utf-8", "replace"))
+        for text in decoder.texts:
+            print(f"[texto] {text}")
+    if args.out:
+        np.savez(args.out, **result)
+        print(f"Salvo em {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Intervalo de amostragem adaptativo por sensor
+
+Cada sensor tem o próprio intervalo entre `min_ms` e `max_ms`. Depois de
+cada leitura, para cada canal do sensor:
+
+- variação: o valor se afastou mais que a zona morta (`deadband`) do
+  valor de referência (o da última mudança);
+- tendência: a variação desde a leitura anterior, projetada para o
+  intervalo atual, passaria da zona morta;
+- ruído: a média móvel (EWMA) do quadrado das variações passou de
+  (deadband / 2)².
+
+Se algum canal acusar atividade o intervalo cai para 1/SHRINK (até o
+mínimo); com todos os canais estáveis cresce GROW_PCT% (até o máximo).
+Leituras com erro mantêm o intervalo. O agendamento usa ticks_ms.
+
+burst() força leituras em intervalo curto por um tempo (ex.: início da
+chuva detectado por interrupção), sem esperar a adaptação.
+"""
+import time
+
+SHRINK = 4                  # Atividade: intervalo / 4
+GROW_PCT = 150              # Estável: intervalo * 1.5
+DUE_TOLERANCE_MS = 50       # Sensores que vencem nessa folga são lidos juntos
+
+class _Channel:
+    def __init__(self, key, deadband):
+        self.key = key
+        self.deadband = deadband
+        self.ref = None
+        self.last = None
+        self.var = 0.0
+
+class SensorSchedule:
+    def __init__(self, name, min_ms, max_ms, channels, interval_ms=None):
+        """
+        Args:
+            name: Nome do sensor (relatórios)
+            min_ms, max_ms: Limites do intervalo entre leituras
+            channels: ((chave do dicionário de dados, zona morta), ...)
+            interval_ms: Intervalo inicial (padrão: min_ms)
+        """
+        self.name = name
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.channels = [_Channel(key, deadband) for key, deadband in channels]
+        self.interval_ms = max(min_ms, min(max_ms, interval_ms or min_ms))
+        self.next_ms = time.ticks_ms()
+        self.last_ms = None
+        self.reads = 0
+        self.changes = 0            # Vezes em que o intervalo caiu por atividade
+        self.burst_ms = 0
+        self.burst_until = None
+        self._first_ms = None
+
+    def burst(self, now_ms, interval_ms, duration_ms):
+        """Lê agora e a cada interval_ms durante duration_ms"""
+        self.burst_ms = interval_ms
+        self.burst_until = time.ticks_add(now_ms, duration_ms)
+        self.next_ms = now_ms
+
+    def update(self, now_ms, data):
+        """Ajusta o intervalo depois de uma leitura; retorna o novo intervalo"""
+        dt = time.ticks_diff(now_ms, self.last_ms) if self.last_ms is not None else 0
+        if self._first_ms is None:
+            self._first_ms = now_ms
+        self.last_ms = now_ms
+        self.reads += 1
+
+        active = False
+        valid = True
+        for ch in self.channels:
+            value = data.get(ch.key)
+            if value is None:
+                valid = False
+                continue
+            if ch.ref is None:
+                ch.ref = ch.last = value
+                continue
+            d = value - ch.last
+            ch.last = value
+            ch.var += (d * d - ch.var) / 4
+            limit = ch.deadband
+            if abs(value - ch.ref) > limit:
+                active = True
+            elif dt > 0 and abs(d) * self.interval_ms / dt > limit:
+                active = True
+            elif ch.var * 4 > limit * limit:
+                active = True
+            if active:
+                ch.ref = value
+
+        if active:
+            interval = self.interval_ms // SHRINK
+            if interval < self.min_ms:
+                interval = self.min_ms
+            if interval < self.interval_ms:
+                self.changes += 1
+            self.interval_ms = interval
+            # Atualiza as referências dos demais canais do sensor
+            for ch in self.channels:
+                if ch.last is not None:
+                    ch.ref = ch.last
+        elif valid:
+            interval = self.interval_ms * GROW_PCT // 100
+            self.interval_ms = interval if interval < self.max_ms else self.max_ms
+        step = self.interval_ms
+        if self.burst_until is not None:
+            if time.ticks_diff(self.burst_until, now_ms) > 0:
+                step = self.burst_ms
+            else:
+                self.burst_until = None
+        self.next_ms = time.ticks_add(now_ms, step)
+        return self.interval_ms
+
+    def effective_ms(self):
+        """Intervalo médio real desde a primeira leitura"""
+        if self.reads < 2:
+            return self.interval_ms
+        return time.ticks_diff(self.last_ms, self._first_ms) // (self.reads - 1)
+
+class AdaptiveSampler:
+    """Agenda de leitura dos sensores (cada um identificado por um bit)"""
+    def __init__(self):
+        self.sensors = {}
+
+    def add(self, bit, schedule):
+        self.sensors[bit] = schedule
+
+    def due(self, now_ms=None):
+        """Máscara dos sensores a ler agora (ao menos o próximo a vencer)"""
+        if now_ms is None:
+            now_ms = time.ticks_ms()
+        mask = 0
+        earliest = None
+        earliest_wait = None
+        for bit, s in self.sensors.items():
+            wait = time.ticks_diff(s.next_ms, now_ms)
+            if wait <= DUE_TOLERANCE_MS:
+                mask |= bit
+            if earliest_wait is None or wait < earliest_wait:
+                earliest, earliest_wait = bit, wait
+        if not mask and earliest is not None:
+            mask = earliest
+        return mask
+
+    def burst(self, bit, interval_ms, duration_ms, now_ms=None):
+        """Rajada de leituras de um sensor (ver SensorSchedule.burst)"""
+        s = self.sensors.get(bit)
+        if s is not None:
+            s.burst(time.ticks_ms() if now_ms is None else now_ms, interval_ms, duration_ms)
+
+    def delay_ms(self, now_ms=None):
+        """Tempo até o próximo sensor vencer"""
+        if not self.sensors:
+            return 0
+        if now_ms is None:
+            now_ms = time.ticks_ms()
+        wait = min(time.ticks_diff(s.next_ms, now_ms) for s in self.sensors.values())
+        return wait if wait > 0 else 0
+
+    def update(self, mask, data, now_ms=None):
+        """Registra a leitura dos sensores em `mask`; retorna [(nome, antes, depois)] das mudanças"""
+        if now_ms is None:
+            now_ms = time.ticks_ms()
+        changed = []
+        for bit, s in self.sensors.items():
+            if mask & bit:
+                before = s.interval_ms
+                after = s.update(now_ms, data)
+                if after != before:
+                    changed.append((s.name, before, after))
+        return changed
+
+    def stats(self):
+        """{nome: (leituras, intervalo atual ms, intervalo médio ms)}"""
+        return {s.name: (s.reads, s.interval_ms, s.effective_ms()) for s in self.sensors.values()}
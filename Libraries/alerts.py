@@ -0,0 +1,188 @@
+"""
+Alertas por regras com histerese, avaliados a cada amostra
+
+As regras da configuração são compiladas uma vez em arrays planos
+(canal, sinal, limiares de entrada e saída no ponto fixo de reading.py,
+duração mínima), agrupados por canal. Cada regra é uma máquina de
+estados pequena:
+
+    inativo --(passa da entrada)--> pendente --(dura `duração` s)--> ativo
+    pendente --(volta da entrada)--> inativo
+    ativo --(passa da saída, do outro lado da entrada)--> inativo
+
+Como a saída fica do lado de dentro da entrada, um valor oscilando no
+limiar (ex.: RAIN_THRESHOLD_DRY) não faz o alerta piscar. Tipos:
+
+- 'acima' / 'abaixo': o valor do canal;
+- 'sobe' / 'desce': a variação por hora, medida em janelas de
+  RATE_WINDOW_S (uma taxa por canal, compartilhada pelas regras).
+
+Regras "abaixo"/"desce" viram "acima" com o sinal trocado, então a
+avaliação é a mesma comparação para todas. Um canal só é avaliado se o
+valor mudou, se a taxa foi atualizada ou se há regra pendente nele; com
+a estação estável o custo por amostra não cresce com o número de
+regras. Só as transições são entregues (on_change).
+"""
+import time
+from array import array
+import reading
+
+RATE_WINDOW_S = 600             # Taxa de variação medida em janelas de 10 min
+RATE_MAX_GAP_S = 1800           # Sem leituras por mais que isso: recomeça a taxa
+
+# Tipo: (sinal, regra de taxa)
+KINDS = {
+    'acima': (1, False),
+    'abaixo': (-1, False),
+    'sobe': (1, True),
+    'desce': (-1, True),
+}
+
+STATE_IDLE = 0
+STATE_PENDING = 1
+STATE_ACTIVE = 2
+
+# Timestamps do MicroPython no ESP32 contam a partir de 2000-01-01 (como em webserver.py)
+UNIX_EPOCH_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
+
+def event_json(timestamp, name, active, value):
+    """Evento de transição em JSON (HTTP e MQTT)"""
+    return ('{"ts":%d,"alert":"%s","active":%s,"value":%s}' % (
+        timestamp + UNIX_EPOCH_OFFSET, name, "true" if active else "false", value)).encode()
+
+class AlertEngine:
+    def __init__(self, rules, on_change=None, rate_window_s=RATE_WINDOW_S):
+        """
+        Args:
+            rules: {nome: (canal, tipo, limiar de entrada, limiar de saída, duração s)}
+                   com limiares nas unidades do canal (taxas por hora, em módulo)
+            on_change: Função (nome, ativo, timestamp, valor) chamada nas transições
+            rate_window_s: Janela da taxa de variação
+        """
+        self.on_change = on_change
+        self.rate_window_s = rate_window_s
+        # Regras ordenadas por canal; _first[ch]:_first[ch + 1] são as do canal
+        order = sorted(rules.items(), key=lambda item: reading.CHANNEL_KEYS.index(item[1][0]))
+        n = len(order)
+        self.names = [name for name, _ in order]
+        self._sign = array('b', [0] * n)
+        self._rate = array('b', [0] * n)
+        self._enter = array('i', [0] * n)
+        self._exit = array('i', [0] * n)
+        self._duration = array('i', [0] * n)
+        self._since = array('i', [0] * n)
+        self.state = array('b', [STATE_IDLE] * n)
+        self._first = array('H', [0] * (reading.NUM_CHANNELS + 1))
+        self._has_rate = array('b', [0] * reading.NUM_CHANNELS)
+        for i, (name, (key, kind, enter, leave, duration)) in enumerate(order):
+            if kind not in KINDS:
+                raise ValueError(f"alerta {name}: tipo desconhecido {kind}")
+            ch = reading.CHANNEL_KEYS.index(key)
+            sign, rate = KINDS[kind]
+            scale = reading.CHANNEL_SCALES[ch]
+            enter = int(round(enter * scale))
+            leave = int(round(leave * scale))
+            if not rate:
+                enter, leave = sign * enter, sign * leave
+            if leave > enter:
+                raise ValueError(f"alerta {name}: saída do lado de fora da entrada")
+            self._sign[i] = sign
+            self._rate[i] = rate
+            self._enter[i] = enter
+            self._exit[i] = leave
+            self._duration[i] = duration
+            self._first[ch + 1] = i + 1
+            if rate:
+                self._has_rate[ch] = 1
+        for ch in range(reading.NUM_CHANNELS):
+            if self._first[ch + 1] < self._first[ch]:
+                self._first[ch + 1] = self._first[ch]
+
+        # Estado por canal
+        self._last = array('i', [0] * reading.NUM_CHANNELS)
+        self._seen = array('b', [0] * reading.NUM_CHANNELS)
+        self._pending = array('b', [0] * reading.NUM_CHANNELS)
+        self._ref_ts = array('i', [0] * reading.NUM_CHANNELS)
+        self._ref_value = array('i', [0] * reading.NUM_CHANNELS)
+        self._rate_value = array('i', [0] * reading.NUM_CHANNELS)     # Por hora, ponto fixo
+        self._rate_ok = array('b', [0] * reading.NUM_CHANNELS)
+
+        self.evaluated = 0
+        self.skipped = 0
+        self.transitions = 0
+
+    def _update_rate(self, ch, ts, value):
+        """Fecha a janela da taxa do canal; True se a taxa mudou"""
+        if not self._seen[ch] or ts - self._ref_ts[ch] > RATE_MAX_GAP_S:
+            self._ref_ts[ch] = ts
+            self._ref_value[ch] = value
+            self._rate_ok[ch] = 0
+            return False
+        dt = ts - self._ref_ts[ch]
+        if dt < self.rate_window_s:
+            return False
+        self._rate_value[ch] = (value - self._ref_value[ch]) * 3600 // dt
+        self._rate_ok[ch] = 1
+        self._ref_ts[ch] = ts
+        self._ref_value[ch] = value
+        return True
+
+    def update(self, timestamp, flags, values):
+        """
+        Avalia as regras com uma amostra (flags e valores de reading.py).
+
+        Returns:
+            número de transições
+        """
+        changes = 0
+        for ch in range(reading.NUM_CHANNELS):
+            first = self._first[ch]
+            last = self._first[ch + 1]
+            if first == last or not flags & (1 << ch):
+                continue
+            value = values[ch]
+            rate_new = self._has_rate[ch] and self._update_rate(ch, timestamp, value)
+            if self._seen[ch] and value == self._last[ch] and not rate_new and not self._pending[ch]:
+                self.skipped += last - first
+                continue
+            self._seen[ch] = 1
+            self._last[ch] = value
+            self.evaluated += last - first
+            for i in range(first, last):
+                if self._rate[i]:
+                    if not self._rate_ok[ch]:
+                        continue
+                    x = self._sign[i] * self._rate_value[ch]
+                    shown = self._rate_value[ch]
+                else:
+                    x = self._sign[i] * value
+                    shown = value
+                state = self.state[i]
+                if state == STATE_ACTIVE:
+                    if x < self._exit[i]:
+                        self.state[i] = STATE_IDLE
+                        changes += self._emit(i, False, timestamp, ch, shown)
+                elif x > self._enter[i]:
+                    if state == STATE_IDLE:
+                        self._since[i] = timestamp
+                        self.state[i] = STATE_PENDING
+                        self._pending[ch] += 1
+                    if timestamp - self._since[i] >= self._duration[i]:
+                        self.state[i] = STATE_ACTIVE
+                        self._pending[ch] -= 1
+                        changes += self._emit(i, True, timestamp, ch, shown)
+                elif state == STATE_PENDING:
+                    self.state[i] = STATE_IDLE
+                    self._pending[ch] -= 1
+        return changes
+
+    def _emit(self, i, active, timestamp, ch, value):
+        self.transitions += 1
+        if self.on_change is not None:
+            scale = reading.CHANNEL_SCALES[ch]
+            self.on_change(self.names[i], active, timestamp, value if scale == 1 else value / scale)
+        return 1
+
+    def active(self):
+        """Nomes dos alertas ativos"""
+        return [self.names[i] for i in range(len(self.names)) if self.state[i] == STATE_ACTIVE]
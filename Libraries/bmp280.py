@@ -50,6 +50,8 @@ class BMP280:
         # Variáveis para armazenar os últimos valores lidos
         self.temperature = 0
         self.pressure = 0
+        self.adc_T = 0
+        self.adc_P = 0
     
     def _read_reg(self, reg, size=1):
         """Lê bytes de um registrador."""
@@ -93,15 +95,26 @@ class BMP280:
         # Lê temperatura (0xFA, 0xFB, 0xFC)
         adc_T = (self._read_reg(BMP280_REG_TEMP_MSB) << 12) | (self._read_reg(BMP280_REG_TEMP_MSB + 1) << 4) | (self._read_reg(BMP280_REG_TEMP_MSB + 2) >> 4)
         
+        # Lê pressão (0xF7, 0xF8, 0xF9)
+        adc_P = (self._read_reg(BMP280_REG_PRESS_MSB) << 12) | (self._read_reg(BMP280_REG_PRESS_MSB + 1) << 4) | (self._read_reg(BMP280_REG_PRESS_MSB + 2) >> 4)
+        
+        # Valores brutos guardados para registro (recompensação posterior no computador)
+        self.adc_T = adc_T
+        self.adc_P = adc_P
+        return self.compensate(adc_T, adc_P)
+    
+    def compensate(self, adc_T, adc_P):
+        """Calcula temperatura e pressão a partir dos valores brutos (20 bits).
+        
+        Mesma aritmética inteira do datasheet usada por Host_tools/bmp280_np.py,
+        que reprocessa os valores brutos registrados em lote.
+        """
         # Cálculo de temperatura conforme datasheet
         var1 = ((((adc_T >> 3) - (self.dig_T1 << 1))) * self.dig_T2) >> 11
         var2 = (((((adc_T >> 4) - self.dig_T1) * ((adc_T >> 4) - self.dig_T1)) >> 12) * self.dig_T3) >> 14
         t_fine = var1 + var2
         self.temperature = ((t_fine * 5 + 128) >> 8) / 100  # Temperatura em °C
         
-        # Lê pressão (0xF7, 0xF8, 0xF9)
-        adc_P = (self._read_reg(BMP280_REG_PRESS_MSB) << 12) | (self._read_reg(BMP280_REG_PRESS_MSB + 1) << 4) | (self._read_reg(BMP280_REG_PRESS_MSB + 2) >> 4)
-        
         # Cálculo de pressão conforme datasheet
         var1 = t_fine - 128000
         var2 = var1 * var1 * self.dig_P6
@@ -124,6 +137,12 @@ class BMP280:
         
         return self.temperature, self.pressure
     
+    def calibration(self):
+        """Coeficientes de calibração (dig_T1..dig_P9) na ordem do datasheet."""
+        return (self.dig_T1, self.dig_T2, self.dig_T3,
+                self.dig_P1, self.dig_P2, self.dig_P3, self.dig_P4, self.dig_P5,
+                self.dig_P6, self.dig_P7, self.dig_P8, self.dig_P9)
+    
     def get_temperature(self):
         """Retorna a temperatura em graus Celsius."""
         self.read()
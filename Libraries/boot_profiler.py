@@ -0,0 +1,63 @@
+"""
+Profiler de inicialização para MicroPython
+
+Registra o tempo (ms) e a variação de heap (bytes) de cada import e
+etapa de inicialização, para acompanhar e reduzir o custo do boot.
+
+Uso:
+    profiler = BootProfiler()
+    with profiler.step("display"):
+        init_display()
+    bmp280 = profiler.load("bmp280")
+    profiler.report()
+"""
+import time
+import gc
+import persist
+
+class _Step:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.ticks_us()
+        self.m0 = gc.mem_alloc()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_us = time.ticks_diff(time.ticks_us(), self.t0)
+        # Negativo se o coletor de lixo rodou durante a etapa
+        heap = gc.mem_alloc() - self.m0
+        self.profiler.steps.append((self.name, elapsed_us // 1000, heap))
+        return False
+
+class BootProfiler:
+    def __init__(self):
+        self.t_start = time.ticks_ms()
+        # Lista de (nome, tempo_ms, delta_heap_bytes)
+        self.steps = []
+
+    def step(self, name):
+        """Context manager que mede uma etapa"""
+        return _Step(self, name)
+
+    def load(self, module):
+        """Importa um módulo medindo o custo do import"""
+        with _Step(self, "import " + module):
+            return __import__(module)
+
+    def total_ms(self):
+        """Tempo desde a criação do profiler"""
+        return time.ticks_diff(time.ticks_ms(), self.t_start)
+
+    def report(self):
+        """Imprime a tabela de custos do boot"""
+        print("\n--- Perfil do boot ---")
+        for name, ms, heap in self.steps:
+            print(f"{name:<24} {ms:>6} ms {heap:>7} B")
+        print(f"{'total':<24} {self.total_ms():>6} ms  livre: {gc.mem_free()} B")
+
+    def save(self, path="boot_profile.json"):
+        """Grava o perfil do último boot na flash"""
+        persist.save(path, {"total_ms": self.total_ms(), "steps": self.steps})
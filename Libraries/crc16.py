@@ -0,0 +1,27 @@
+"""
+CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) com tabela pré-calculada
+"""
+from array import array
+
+def _make_table():
+    table = array('H', [0] * 256)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+        table[i] = crc
+    return table
+
+_TABLE = _make_table()
+
+def crc16(data, start=0, end=None, crc=0xFFFF):
+    """Calcula o CRC16 de data[start:end] sem copiar o buffer"""
+    if end is None:
+        end = len(data)
+    table = _TABLE
+    for i in range(start, end):
+        crc = ((crc << 8) & 0xFF00) ^ table[((crc >> 8) ^ data[i]) & 0xFF]
+    return crc
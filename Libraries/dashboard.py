@@ -0,0 +1,79 @@
+"""
+Página do painel da estação servida pelo webserver
+
+A página é estática: é enviada uma única vez (com ETag/304 nas visitas
+seguintes) e recebe as novas leituras por /events (Server-Sent Events),
+com as transições de alerta como eventos "alert".
+Se o servidor recusar a transmissão, volta a consultar /api/latest.
+O gráfico busca /api/history em binário e decodifica com DataView;
+começa pela temperatura do DHT11 e, se o canal escolhido não tem dados
+(sensor desabilitado), passa para o primeiro da lista que tem.
+"""
+
+PAGE = b"""<!DOCTYPE html>
+<html lang="pt-br"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width,initial-scale=1">
+<title>Estacao Meteorologica</title>
+<style>
+body{font-family:sans-serif;background:#111;color:#eee;margin:0;padding:1em}
+h1{font-size:1.3em;color:#0ff}
+.c{display:grid;grid-template-columns:repeat(auto-fit,minmax(9em,1fr));gap:.6em}
+.v{background:#222;border-radius:.5em;padding:.7em}
+.v b{display:block;font-size:1.6em;color:#ff0}
+small{color:#888}
+</style></head><body>
+<h1>Estacao Meteorologica ESP32</h1>
+<p id="alerts" style="color:#f44"></p>
+<div class="c">
+<div class="v">BMP280 temp.<b id="bmp_temp">-</b></div>
+<div class="v">Pressao (hPa)<b id="bmp_pressure">-</b></div>
+<div class="v">DHT11 temp.<b id="dht_temp">-</b></div>
+<div class="v">Umidade (%)<b id="dht_humidity">-</b></div>
+<div class="v">Chuva<b id="rain_value">-</b></div>
+<div class="v">Sensacao term.<b id="heat_index">-</b></div>
+<div class="v">Ponto de orvalho<b id="dew_point">-</b></div>
+<div class="v">Conforto<b id="comfort">-</b></div>
+<div class="v">Tendencia (hPa/3h)<b id="pressure_trend">-</b></div>
+<div class="v">Previsao<b id="forecast">-</b></div>
+</div>
+<p><small id="ts">aguardando dados...</small></p>
+<p><select id="ch" onchange="hist()"><option value="2">Temperatura (DHT11)</option>
+<option value="3">Umidade</option><option value="0">Temperatura (BMP280)</option>
+<option value="1">Pressao</option><option value="4">Chuva</option></select>
+<select id="sp" onchange="hist()"><option value="86400">24 h</option>
+<option value="604800">7 dias</option></select></p>
+<canvas id="g" width="600" height="200" style="width:100%;background:#222"></canvas>
+<script>
+var K={bmp_temp:1,bmp_pressure:0.01,dht_temp:1,dht_humidity:1,rain_value:1,heat_index:1,dew_point:1,pressure_trend:1},et="",A={};
+function alerts(){var n=Object.keys(A);document.getElementById("alerts").textContent=n.length?"Alerta: "+n.join(", "):"";}
+function show(d){for(var k in K){var e=document.getElementById(k);
+if(k in d)e.textContent=(d[k]*K[k]).toFixed(k=="rain_value"?0:1);}
+if(d.comfort)document.getElementById("comfort").textContent=d.comfort;
+if(d.forecast)document.getElementById("forecast").textContent=d.forecast;
+if("alerts" in d){A={};if(d.alerts)d.alerts.split(",").forEach(function(a){A[a]=1;});alerts();}
+document.getElementById("ts").textContent="Atualizado: "+new Date(d.ts*1000).toLocaleTimeString();}
+function poll(){fetch("/api/latest",{headers:et?{"If-None-Match":et}:{}}).then(function(r){
+if(r.status==200){et=r.headers.get("ETag")||"";return r.json().then(show);}}).catch(function(){});}
+function start(){if(!window.EventSource){poll();setInterval(poll,5000);return;}
+var es=new EventSource("/events");es.onmessage=function(m){show(JSON.parse(m.data));};
+es.addEventListener("alert",function(m){var a=JSON.parse(m.data);if(a.active)A[a.alert]=1;else delete A[a.alert];alerts();});
+es.onerror=function(){if(es.readyState==2){poll();setInterval(poll,5000);}};}
+start();
+var S=[100,100,100,100,1],U=[1,0.01,1,1,1];
+function plot(xs,ys){var c=document.getElementById("g"),g=c.getContext("2d"),W=c.width,H=c.height;
+g.clearRect(0,0,W,H);if(ys.length<2)return;
+var lo=Math.min.apply(0,ys),hi=Math.max.apply(0,ys),t0=xs[0],dt=xs[xs.length-1]-t0||1;if(hi==lo)hi=lo+1;
+g.strokeStyle="#0ff";g.beginPath();
+for(var i=0;i<ys.length;i++){var x=(xs[i]-t0)/dt*W,y=H-10-(ys[i]-lo)/(hi-lo)*(H-20);if(i)g.lineTo(x,y);else g.moveTo(x,y);}
+g.stroke();g.fillStyle="#888";g.fillText(hi.toFixed(1),2,10);g.fillText(lo.toFixed(1),2,H-2);}
+function hist(){var sel=document.getElementById("ch"),sp=document.getElementById("sp").value;
+fetch("/api/history?points=240&span="+sp).then(function(r){return r.ok?r.arrayBuffer():null;}).then(function(b){
+if(!b)return;var v=new DataView(b),n=(b.byteLength-12)/24;
+function col(ch){var xs=[],ys=[];for(var i=0;i<n;i++){var o=12+i*24,y=v.getInt32(o+4+ch*4,true);
+if(y!=-2147483648){xs.push(v.getUint32(o,true));ys.push(y/S[ch]*U[ch]);}}return [xs,ys];}
+var p=col(+sel.value);
+for(var j=0;!p[1].length&&j<sel.options.length;j++){p=col(+sel.options[j].value);if(p[1].length)sel.selectedIndex=j;}
+plot(p[0],p[1]);}).catch(function(){});}
+hist();setInterval(hist,300000);
+</script></body></html>
+"""
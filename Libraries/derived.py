@@ -0,0 +1,120 @@
+"""
+Grandezas derivadas de temperatura e umidade
+
+Sensação térmica (índice de calor), ponto de orvalho, umidade absoluta
+e classe de conforto. As funções recebem uma leitura; Derived guarda
+os resultados em um cache indexado pelas entradas quantizadas (0.1 °C,
+1 %), já que a estação repete as mesmas leituras por horas e o DHT11 só
+tem resolução de 1 °C / 1 %.
+
+A versão vetorizada para o histórico inteiro fica em Host_tools/derived_np.py
+e segue exatamente as mesmas fórmulas.
+"""
+import math
+
+# Classes de conforto (índice em COMFORT_LABELS)
+COMFORT_OK = 0
+COMFORT_COOL = 1
+COMFORT_WARM = 2
+COMFORT_DRY = 3
+COMFORT_HUMID = 4
+COMFORT_LABELS = ("Confortável", "Um pouco fria", "Um pouco quente", "Ar seco", "Úmido")
+
+# Faixa de conforto
+COMFORT_HUMIDITY = (40, 60)     # %
+COMFORT_TEMP = (20, 26)         # °C
+
+# Coeficientes de Magnus (Sonntag, 1990)
+MAGNUS_A = 17.62
+MAGNUS_B = 243.12               # °C
+
+TEMP_QUANTUM = 10               # Cache: temperatura em décimos de °C
+CACHE_SIZE = 64
+
+def heat_index(temperature, humidity):
+    """
+    Sensação térmica em °C (temperatura em °C, umidade em %).
+    Fórmula simplificada do NWS; acima de 80 °F usa a regressão de Rothfusz.
+    """
+    temp_f = temperature * 9 / 5 + 32
+    hi = 0.5 * (temp_f + 61.0 + ((temp_f - 68.0) * 1.2) + (humidity * 0.094))
+    if hi > 80:
+        hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity
+        hi = hi - 0.22475541 * temp_f * humidity - 6.83783e-3 * temp_f * temp_f
+        hi = hi - 5.481717e-2 * humidity * humidity + 1.22874e-3 * temp_f * temp_f * humidity
+        hi = hi + 8.5282e-4 * temp_f * humidity * humidity - 1.99e-6 * temp_f * temp_f * humidity * humidity
+    return (hi - 32) * 5 / 9
+
+def dew_point(temperature, humidity):
+    """Ponto de orvalho em °C (fórmula de Magnus); None com umidade 0"""
+    if humidity <= 0:
+        return None
+    gamma = math.log(humidity / 100) + MAGNUS_A * temperature / (MAGNUS_B + temperature)
+    return MAGNUS_B * gamma / (MAGNUS_A - gamma)
+
+def absolute_humidity(temperature, humidity):
+    """Umidade absoluta em g/m³"""
+    # Pressão de vapor de saturação (hPa, Magnus) * umidade relativa / (R_v * T)
+    es = 6.112 * math.exp(MAGNUS_A * temperature / (MAGNUS_B + temperature))
+    return 216.7 * es * humidity / 100 / (273.15 + temperature)
+
+def comfort(temperature, humidity):
+    """Classe de conforto (COMFORT_*) pela umidade e temperatura"""
+    if humidity < COMFORT_HUMIDITY[0]:
+        return COMFORT_DRY
+    if humidity > COMFORT_HUMIDITY[1]:
+        return COMFORT_HUMID
+    if temperature < COMFORT_TEMP[0]:
+        return COMFORT_COOL
+    if temperature > COMFORT_TEMP[1]:
+        return COMFORT_WARM
+    return COMFORT_OK
+
+class Derived:
+    """Grandezas derivadas com cache pelas entradas quantizadas"""
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, temperature, humidity):
+        """
+        Returns:
+            (sensação térmica, ponto de orvalho, umidade absoluta, classe de conforto)
+            calculados com a temperatura em décimos de °C e a umidade em %
+        """
+        t = int(round(temperature * TEMP_QUANTUM))
+        h = int(round(humidity))
+        key = t << 8 | h
+        result = self._cache.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        if len(self._cache) >= self.size:
+            self._cache.clear()
+        temperature = t / TEMP_QUANTUM
+        result = (heat_index(temperature, h), dew_point(temperature, h),
+                  absolute_humidity(temperature, h), comfort(temperature, h))
+        self._cache[key] = result
+        return result
+
+    def fields(self, data):
+        """
+        Campos derivados de um dicionário de leitura (chaves do display_data),
+        ou None sem umidade. A sensação térmica usa a temperatura do DHT11
+        (mesmo ponto do higrômetro); o conforto prefere a do BMP280.
+        """
+        humidity = data.get('dht_humidity')
+        temp_dht = data.get('dht_temp')
+        if humidity is None or temp_dht is None:
+            return None
+        hi, dp, ah, _ = self.compute(temp_dht, humidity)
+        temp = data.get('bmp_temp')
+        cls = comfort(temp if temp is not None else temp_dht, humidity)
+        fields = {'heat_index': round(hi, 1), 'abs_humidity': round(ah, 1),
+                  'comfort': COMFORT_LABELS[cls]}
+        if dp is not None:
+            fields['dew_point'] = round(dp, 1)
+        return fields
@@ -3,8 +3,36 @@ Driver DHT11 para MicroPython em ESP32
 Leitura de temperatura e umidade do sensor DHT11
 """
 from machine import Pin
+from array import array
 import utime
 
+# Pulso alto mais longo que isso (us) é um bit 1
+BIT_THRESHOLD_US = 40
+
+def decode(pulses, data=None):
+    """
+    Converte as durações dos 40 pulsos altos nos 5 bytes do DHT11
+
+    Args:
+        pulses: Durações em us (umidade, decimal, temperatura, decimal, checksum)
+        data: bytearray(5) reutilizado para o resultado (opcional)
+
+    Returns:
+        data preenchido, ou None se o checksum não confere
+    """
+    if data is None:
+        data = bytearray(5)
+    i = 0
+    for n in range(5):
+        byte = 0
+        for _ in range(8):
+            byte = (byte << 1) | (1 if pulses[i] > BIT_THRESHOLD_US else 0)
+            i += 1
+        data[n] = byte
+    if ((data[0] + data[1] + data[2] + data[3]) & 0xFF) != data[4]:
+        return None
+    return data
+
 class DHT11:
     def __init__(self, pin):
         """
@@ -18,6 +46,9 @@ class DHT11:
         self._humidity = 0
         self.last_read = 0
         self._last_read_success = False
+        # Durações dos pulsos, decodificadas só depois da captura
+        self._pulses = array('H', [0] * 40)
+        self._data = bytearray(5)
    
     def measure(self):
         """
@@ -31,13 +62,6 @@ class DHT11:
        
         self.last_read = current_time
        
-        # Buffers de dados
-        data = bytearray(5)
-        
-        # Reset todos os bytes para 0
-        for i in range(5):
-            data[i] = 0
-       
         # Sinal inicial - pull down por 18ms
         self.pin.init(Pin.OUT)
         self.pin.value(1)
@@ -68,7 +92,8 @@ class DHT11:
                 return False
             utime.sleep_us(1)
        
-        # Ler 40 bits (5 bytes) de dados
+        # Capturar os 40 pulsos (5 bytes) de dados
+        pulses = self._pulses
         for i in range(40):
             # Esperar pelo início do bit (sinal baixo)
             timeout = 0
@@ -89,14 +114,12 @@ class DHT11:
                     return False
                 utime.sleep_us(1)
             
-            pulse_duration = utime.ticks_diff(utime.ticks_us(), pulse_start)
-           
-            # Se o pulso alto for longo (>40us), é bit 1, caso contrário é bit 0
-            data[i // 8] = (data[i // 8] << 1) | (1 if pulse_duration > 40 else 0)
+            pulses[i] = utime.ticks_diff(utime.ticks_us(), pulse_start)
        
-        # Verificar checksum
-        if ((data[0] + data[1] + data[2] + data[3]) & 0xFF) != data[4]:
-            print("Erro de checksum:", data)
+        # Pulso alto longo (>40us) é bit 1, curto é bit 0; confere o checksum
+        data = decode(pulses, self._data)
+        if data is None:
+            print("Erro de checksum:", self._data)
             self._last_read_success = False
             return False
        
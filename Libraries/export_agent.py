@@ -0,0 +1,81 @@
+"""
+Agente de exportação do histórico (lado do ESP32)
+
+Chamado pelo raw REPL por Host_tools/export_history.py, com a estação
+interrompida (o Ctrl+C fecha o log e grava os registros pendentes):
+
+    import export_agent
+    export_agent.manifest(since=1234)            # segmentos com seq >= 1234
+    export_agent.read_blocks("seg03.bin", 2, 4)  # blocos de 4096 bytes
+
+O manifesto traz o último seq de cada segmento e o deslocamento da
+época do relógio da placa, então o computador pede só os blocos com
+registros novos e nada quando já está em dia.
+
+Cada bloco é enviado como uma linha "índice crc32 base64", para que o
+computador confira o CRC e peça de novo só o bloco corrompido.
+"""
+import os
+import json
+import time
+import binascii
+from tslog import LOG_RECORD_SIZE, FLASH_PAGE_SIZE, record_seq
+
+# Mesma detecção de webserver.py / alerts.py
+UNIX_EPOCH_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
+
+def _read_seq(f, rec, idx):
+    f.seek(idx * LOG_RECORD_SIZE)
+    f.readinto(rec)
+    return record_seq(rec)
+
+def _last_seq(f, rec, seq0, records):
+    """Seq do último registro gravado (busca binária, como tslog._recover)"""
+    lo, hi = 0, records - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if _read_seq(f, rec, mid) == seq0 + mid:
+            lo = mid
+        else:
+            hi = mid - 1
+    return seq0 + lo
+
+def manifest(path="/log", since=-1):
+    """
+    Mostra em JSON os segmentos do log com registros de seq >= since:
+    [nome, tamanho, seq do 1º registro, seq do último registro]
+    """
+    rec = bytearray(LOG_RECORD_SIZE)
+    segments = []
+    for name in sorted(os.listdir(path)):
+        if not (name.startswith("seg") and name.endswith(".bin")):
+            continue
+        full = f"{path}/{name}"
+        size = os.stat(full)[6]
+        with open(full, "rb") as f:
+            seq0 = _read_seq(f, rec, 0)
+            if seq0 is None:
+                continue
+            last = _last_seq(f, rec, seq0, size // LOG_RECORD_SIZE)
+        if last >= since:
+            segments.append([name, size, seq0, last])
+    print(json.dumps({
+        "record_size": LOG_RECORD_SIZE,
+        "block_size": FLASH_PAGE_SIZE,
+        "epoch_offset": UNIX_EPOCH_OFFSET,
+        "segments": segments,
+    }))
+
+def read_blocks(name, first, count, path="/log"):
+    """Envia `count` blocos de um segmento a partir do bloco `first`"""
+    buf = bytearray(FLASH_PAGE_SIZE)
+    mv = memoryview(buf)
+    with open(f"{path}/{name}", "rb") as f:
+        f.seek(first * FLASH_PAGE_SIZE)
+        for block in range(first, first + count):
+            n = f.readinto(buf)
+            if not n:
+                break
+            data = mv[:n]
+            print(block, "%08x" % (binascii.crc32(data) & 0xFFFFFFFF),
+                  binascii.b2a_base64(data).decode(), end="")
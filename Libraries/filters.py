@@ -0,0 +1,178 @@
+"""
+Filtros em fluxo por canal: Hampel (mediana móvel), limite de variação e EWMA
+
+Trabalham sobre os valores em ponto fixo de reading.py (array 'i'), entre
+a aquisição e os consumidores (display, histórico, rede). Cada canal tem
+buffers de tamanho fixo alocados uma vez; a atualização não aloca:
+
+- Hampel: a janela das últimas `window` leituras é mantida também em
+  ordem (busca binária + deslocamento de no máximo `window` posições).
+  Mediana e quartis saem direto da janela ordenada; uma leitura a mais
+  de `threshold` desvios da mediana (desvio estimado pelo intervalo
+  interquartil, com piso `min_scale`) é trocada pela mediana.
+- Limite de variação: uma mudança maior que `max_rate` por segundo em
+  relação ao último valor aceito é descartada, até `max_rejects`
+  leituras seguidas (aí é uma mudança real e passa).
+- EWMA: y += (x - y) >> shift, suavização com alfa = 1/2^shift.
+"""
+from array import array
+import reading
+
+RESET_AFTER_S = 600             # Sem leituras por 10 min: a janela antiga não vale mais
+
+class ChannelFilter:
+    def __init__(self, window=5, threshold=3, min_scale=0, ewma_shift=0, max_rate=0, max_rejects=3):
+        """
+        Args:
+            window: Leituras na janela do Hampel (0 = sem Hampel)
+            threshold: Limiar em desvios-padrão estimados
+            min_scale: Desvio mínimo (ponto fixo), para sensores com valores inteiros
+            ewma_shift: Suavização com alfa = 1/2^shift (0 = sem EWMA)
+            max_rate: Variação máxima por segundo (ponto fixo, 0 = sem limite)
+            max_rejects: Leituras seguidas descartadas antes de aceitar a mudança
+        """
+        self.window = window
+        self.threshold = threshold
+        self.min_scale = min_scale
+        self.ewma_shift = ewma_shift
+        self.max_rate = max_rate
+        self.max_rejects = max_rejects
+        self._ring = array('i', [0] * max(window, 1))      # Ordem de chegada
+        self._sorted = array('i', [0] * max(window, 1))    # Mesmos valores ordenados
+        self.outliers = 0
+        self.limited = 0
+        self.reset()
+
+    def reset(self):
+        self._pos = 0
+        self._n = 0
+        self._last = 0
+        self._last_ts = None
+        self._rejects = 0
+        self._ewma = 0
+
+    # --- Janela ordenada ---
+
+    def _find(self, value, n):
+        """Primeira posição em _sorted[:n] com valor >= value (busca binária)"""
+        s = self._sorted
+        lo = 0
+        hi = n
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            if s[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _push(self, value):
+        s = self._sorted
+        n = self._n
+        if n == self.window:
+            # Sai a leitura mais antiga
+            i = self._find(self._ring[self._pos], n)
+            n -= 1
+            while i < n:
+                s[i] = s[i + 1]
+                i += 1
+        i = self._find(value, n)
+        j = n
+        while j > i:
+            s[j] = s[j - 1]
+            j -= 1
+        s[i] = value
+        self._n = n + 1
+        self._ring[self._pos] = value
+        self._pos = self._pos + 1 if self._pos + 1 < self.window else 0
+
+    def median(self):
+        n = self._n
+        s = self._sorted
+        if n & 1:
+            return s[n >> 1]
+        return (s[(n >> 1) - 1] + s[n >> 1]) >> 1
+
+    def _scale(self):
+        """Desvio-padrão estimado pelo intervalo interquartil (IQR / 1.349)"""
+        n = self._n
+        s = self._sorted
+        iqr = s[(3 * n) >> 2] - s[n >> 2]
+        scale = iqr * 1000 // 1349
+        return scale if scale > self.min_scale else self.min_scale
+
+    # --- Atualização ---
+
+    def update(self, timestamp, value):
+        """Filtra uma leitura (ponto fixo); retorna o valor filtrado"""
+        if self._last_ts is not None and timestamp - self._last_ts > RESET_AFTER_S:
+            self.reset()
+        x = value
+        if self.window:
+            # Compara com a janela anterior; a leitura bruta entra na janela
+            # (um degrau real passa a ser a mediana em window // 2 leituras)
+            if self._n >= 3:
+                med = self.median()
+                d = x - med
+                if d < 0:
+                    d = -d
+                if d > self.threshold * self._scale():
+                    self.outliers += 1
+                    x = med
+            self._push(value)
+
+        if self.max_rate and self._last_ts is not None:
+            dt = timestamp - self._last_ts
+            step = x - self._last
+            if step < 0:
+                step = -step
+            if step > self.max_rate * (dt if dt > 0 else 1) and self._rejects < self.max_rejects:
+                self._rejects += 1
+                self.limited += 1
+                return self._ewma if self.ewma_shift else self._last
+        self._rejects = 0
+        first = self._last_ts is None
+        self._last = x
+        self._last_ts = timestamp
+        if self.ewma_shift:
+            if first:
+                self._ewma = x
+            else:
+                self._ewma += (x - self._ewma) >> self.ewma_shift
+            return self._ewma
+        return x
+
+class StreamFilter:
+    """Filtros dos canais de reading.py, configurados pela chave do canal"""
+    def __init__(self, config):
+        """
+        Args:
+            config: {chave do canal: (window, threshold, min_scale, ewma_shift, max_rate)}
+        """
+        self.channels = [None] * reading.NUM_CHANNELS
+        for ch in range(reading.NUM_CHANNELS):
+            params = config.get(reading.CHANNEL_KEYS[ch])
+            if params:
+                self.channels[ch] = ChannelFilter(*params)
+
+    def apply(self, timestamp, flags, values):
+        """
+        Filtra in-place os canais válidos de uma amostra.
+
+        Returns:
+            máscara dos canais cujo valor mudou
+        """
+        changed = 0
+        for ch in range(reading.NUM_CHANNELS):
+            f = self.channels[ch]
+            if f is not None and flags & (1 << ch):
+                v = f.update(timestamp, values[ch])
+                if v != values[ch]:
+                    values[ch] = v
+                    changed |= 1 << ch
+        return changed
+
+    def stats(self):
+        """{chave: (substituídas pelo Hampel, descartadas pelo limite)}"""
+        return {reading.CHANNEL_KEYS[ch]: (f.outliers, f.limited)
+                for ch, f in enumerate(self.channels) if f is not None}
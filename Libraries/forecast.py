@@ -0,0 +1,285 @@
+"""
+Previsão do tempo pela tendência da pressão (estilo Zambretti)
+
+A pressão é agrupada em intervalos fixos (SLOT_S) e as médias ficam em
+um buffer circular cobrindo a janela (3 h). A reta de mínimos quadrados
+é mantida pelas somas n, Σx, Σx², Σy e Σxy: cada amostra nova só ajusta
+a contribuição do intervalo em aberto, a entrada de um intervalo soma
+um ponto e a saída do mais antigo subtrai outro, tudo em O(1) e com
+inteiros pequenos (x = intervalo relativo ao mais antigo, y = Pa
+relativos a PRESSURE_REF), sem percorrer a janela.
+
+A tendência (hPa/3 h), a pressão reduzida ao nível do mar e a estação
+do ano dão o código Zambretti (A-Z) e o texto da previsão.
+"""
+import time
+from array import array
+
+WINDOW_S = 10800                # Janela da tendência (3 h)
+TREND_S = 10800                 # Tendência expressa em hPa por 3 h (Zambretti)
+SLOT_S = 600                    # Um ponto da regressão a cada 10 min
+SLOTS = WINDOW_S // SLOT_S
+MIN_SPAN_S = 3600               # Tendência só com pelo menos 1 h de dados
+PRESSURE_REF = 100000           # Pa (y pequeno nas somas)
+TREND_THRESHOLD = 1.6           # hPa/3 h: acima disso subindo, abaixo de -1.6 caindo
+MIN_VALID_YEAR = 2024           # Antes disso o relógio não foi acertado (boot volta a 2000)
+
+TREND_FALLING = -1
+TREND_STEADY = 0
+TREND_RISING = 1
+
+# Códigos Zambretti (Negretti & Zambra) pela tendência
+_FALLING = "BDHORUVXZ"
+_STEADY = "ABEKNPSWXZ"
+_RISING = "ABCFGIJLMQTYZ"
+
+# Textos curtos, sem acentos (fonte do display)
+FORECASTS = {
+    'A': "Tempo bom estavel",
+    'B': "Tempo bom",
+    'C': "Melhorando",
+    'D': "Bom, ficando instavel",
+    'E': "Bom, possiveis pancadas",
+    'F': "Razoavel, melhorando",
+    'G': "Pancadas, depois bom",
+    'H': "Razoavel, pancadas depois",
+    'I': "Pancadas, melhorando",
+    'J': "Variavel, melhorando",
+    'K': "Pancadas provaveis",
+    'L': "Instavel, abrindo depois",
+    'M': "Instavel, deve melhorar",
+    'N': "Pancadas com abertas",
+    'O': "Pancadas, mais instavel",
+    'P': "Variavel, alguma chuva",
+    'Q': "Instavel, curtas abertas",
+    'R': "Instavel, chuva depois",
+    'S': "Instavel, chuva as vezes",
+    'T': "Muito instavel",
+    'U': "Chuva, piorando",
+    'V': "Chuva, muito instavel",
+    'W': "Chuva frequente",
+    'X': "Muito instavel, chuva",
+    'Y': "Tempestade, pode melhorar",
+    'Z': "Tempestade, muita chuva",
+}
+
+def sea_level_pressure(pressure, altitude, temperature=15.0):
+    """Pressão reduzida ao nível do mar (mesmas unidades de pressure)"""
+    if not altitude:
+        return pressure
+    k = 0.0065 * altitude
+    return pressure * (1 - k / (temperature + k + 273.15)) ** -5.257
+
+def is_summer(timestamp, southern=True):
+    """
+    Verão/primavera (metade quente do ano) no hemisfério dado, ou None
+    se o relógio ainda não foi acertado (estação do ano desconhecida)
+    """
+    year, month = time.localtime(timestamp)[:2]
+    if year < MIN_VALID_YEAR:
+        return None
+    warm = 4 <= month <= 9
+    return not warm if southern else warm
+
+def zambretti(pressure_hpa, trend, summer):
+    """
+    Código Zambretti (letra A-Z) a partir da pressão ao nível do mar
+    (hPa), da tendência (TREND_*) e da estação (None: sem ajuste sazonal)
+    """
+    # Ajuste sazonal: subida no verão e queda no inverno pesam mais
+    if trend == TREND_RISING:
+        if summer:
+            pressure_hpa += 7
+        z = int(round(185 - 0.16 * pressure_hpa)) - 20
+        table = _RISING
+    elif trend == TREND_FALLING:
+        if summer is False:
+            pressure_hpa -= 7
+        z = int(round(127 - 0.12 * pressure_hpa)) - 1
+        table = _FALLING
+    else:
+        z = int(round(144 - 0.13 * pressure_hpa)) - 10
+        table = _STEADY
+    if z < 0:
+        z = 0
+    elif z >= len(table):
+        z = len(table) - 1
+    return table[z]
+
+class Forecaster:
+    def __init__(self, altitude=0, southern=True, slot_s=SLOT_S, window_s=WINDOW_S):
+        """
+        Args:
+            altitude: Altitude da estação em metros (redução ao nível do mar)
+            southern: Estação no hemisfério sul (estação do ano invertida)
+            slot_s: Duração de cada ponto da regressão em segundos
+            window_s: Janela da tendência em segundos
+        """
+        self.altitude = altitude
+        self.southern = southern
+        self.slot_s = slot_s
+        self.capacity = window_s // slot_s
+        # Buffer circular: número do intervalo e média (Pa relativos a PRESSURE_REF)
+        self._slot = array('i', [0] * self.capacity)
+        self._value = array('i', [0] * self.capacity)
+        self._first = 0             # Índice do ponto mais antigo
+        self.n = 0
+        self._base = 0              # x = intervalo - _base
+        self._sx = 0
+        self._sxx = 0
+        self._sy = 0
+        self._sxy = 0
+        # Intervalo em aberto (último ponto do buffer)
+        self._open_sum = 0
+        self._open_count = 0
+        self.pressure = None        # Última pressão ao nível do mar (hPa)
+        self.trend = None           # hPa/3 h, ou None sem dados suficientes
+        self.code = None            # Letra Zambretti
+        self.text = None
+
+    # --- Somas da regressão ---
+
+    def _add_point(self, x, y):
+        self.n += 1
+        self._sx += x
+        self._sxx += x * x
+        self._sy += y
+        self._sxy += x * y
+
+    def _remove_point(self, x, y):
+        self.n -= 1
+        self._sx -= x
+        self._sxx -= x * x
+        self._sy -= y
+        self._sxy -= x * y
+
+    def _rebase(self, base):
+        """Move a origem de x para `base` sem recalcular as somas"""
+        d = base - self._base
+        if d:
+            n = self.n
+            self._sxy -= d * self._sy
+            self._sxx -= 2 * d * self._sx - n * d * d
+            self._sx -= n * d
+            self._base = base
+
+    def _drop_oldest(self):
+        i = self._first
+        self._remove_point(self._slot[i] - self._base, self._value[i])
+        self._first = i + 1 if i + 1 < self.capacity else 0
+        if self.n:
+            self._rebase(self._slot[self._first])
+
+    def slope(self):
+        """Inclinação da reta em Pa por intervalo, ou None com menos de 2 pontos"""
+        n = self.n
+        den = n * self._sxx - self._sx * self._sx
+        if n < 2 or den == 0:
+            return None
+        return (n * self._sxy - self._sx * self._sy) / den
+
+    # --- Entrada ---
+
+    def add(self, timestamp, pressure, temperature=None):
+        """
+        Inclui uma amostra e atualiza a previsão.
+
+        Args:
+            timestamp: Segundos (time.time())
+            pressure: Pressão na estação em Pa
+            temperature: Temperatura em °C para a redução ao nível do mar (opcional)
+
+        Returns:
+            True se um intervalo novo começou (bom momento para salvar state())
+        """
+        slot = timestamp // self.slot_s
+        y = int(round(pressure)) - PRESSURE_REF
+        new_slot = False
+        last = (self._first + self.n - 1) % self.capacity
+        if self.n and self._slot[last] == slot:
+            # Mesmo intervalo: só troca a contribuição da média em aberto
+            self._open_sum += y
+            self._open_count += 1
+            mean = self._open_sum // self._open_count
+            delta = mean - self._value[last]
+            if delta:
+                self._value[last] = mean
+                self._sy += delta
+                self._sxy += (slot - self._base) * delta
+        else:
+            if self.n and slot < self._slot[last]:
+                # Relógio voltou (ajuste de hora): recomeça a janela
+                self.reset()
+            new_slot = self.n > 0
+            # Saem os pontos fora da janela (e o mais antigo, se cheio)
+            while self.n and (self._slot[self._first] <= slot - self.capacity or self.n == self.capacity):
+                self._drop_oldest()
+            if not self.n:
+                self._base = slot
+            last = (self._first + self.n) % self.capacity
+            self._slot[last] = slot
+            self._value[last] = y
+            self._add_point(slot - self._base, y)
+            self._open_sum = y
+            self._open_count = 1
+        self._update(timestamp, pressure, temperature)
+        return new_slot
+
+    def reset(self):
+        self._first = self.n = 0
+        self._sx = self._sxx = self._sy = self._sxy = 0
+        self._open_sum = self._open_count = 0
+        self.trend = self.code = self.text = None
+
+    def _update(self, timestamp, pressure, temperature):
+        t = 15.0 if temperature is None else temperature
+        self.pressure = sea_level_pressure(pressure, self.altitude, t) / 100
+        span = (self._slot[(self._first + self.n - 1) % self.capacity] - self._slot[self._first]) * self.slot_s
+        slope = self.slope()
+        if slope is None or span < MIN_SPAN_S:
+            self.trend = self.code = self.text = None
+            return
+        self.trend = slope * (TREND_S / self.slot_s) / 100
+        if self.trend > TREND_THRESHOLD:
+            direction = TREND_RISING
+        elif self.trend < -TREND_THRESHOLD:
+            direction = TREND_FALLING
+        else:
+            direction = TREND_STEADY
+        self.code = zambretti(self.pressure, direction, is_summer(timestamp, self.southern))
+        self.text = FORECASTS[self.code]
+
+    def fields(self):
+        """Campos para a API (/api/latest), ou None sem previsão"""
+        if self.code is None:
+            return None
+        return {'pressure_trend': round(self.trend, 2), 'forecast_code': self.code, 'forecast': self.text}
+
+    # --- Estado entre resets (memória RTC) ---
+
+    def state(self):
+        """Pontos da janela em forma compacta para persist.rtc_set"""
+        points = []
+        for k in range(self.n):
+            i = (self._first + k) % self.capacity
+            points.append(self._slot[i])
+            points.append(self._value[i])
+        return [self.slot_s, points]
+
+    def restore(self, state):
+        """Recarrega a janela salva por state() (ignora estado incompatível)"""
+        if not state or state[0] != self.slot_s:
+            return
+        self.reset()
+        points = state[1]
+        for k in range(0, min(len(points), 2 * self.capacity), 2):
+            slot, y = points[k], points[k + 1]
+            if not self.n:
+                self._base = slot
+            i = (self._first + self.n) % self.capacity
+            self._slot[i] = slot
+            self._value[i] = y
+            self._add_point(slot - self._base, y)
+        # O intervalo em aberto volta com peso de uma amostra
+        self._open_sum = points[-1] if points else 0
+        self._open_count = 1 if points else 0
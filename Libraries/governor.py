@@ -0,0 +1,131 @@
+"""
+Governador de frequência da CPU para ESP32
+
+Mantém a CPU em 80 MHz (economia de energia) e sobe para 240 MHz apenas
+durante rajadas curtas limitadas por CPU (composição de tela, expansão
+de glifos, compressão, respostas HTTP). Contabiliza o tempo gasto em
+cada estado para comparar latência e consumo.
+
+As rajadas podem vir das duas threads (DHT11 na thread de aquisição,
+display na principal): a contagem de aninhamento e a troca de
+frequência ficam sob um lock, quando o firmware tem _thread.
+
+Uso:
+    governor = Governor()
+    governor.start()
+    with governor.burst():
+        desenha_tela()
+    governor.idle(8000)
+"""
+import time
+import machine
+
+try:
+    from _thread import allocate_lock
+except ImportError:
+    allocate_lock = None
+
+IDLE_FREQ = 80000000
+BURST_FREQ = 240000000
+
+# Estados contabilizados
+STATE_IDLE = 0      # CPU acordada em frequência baixa
+STATE_BURST = 1     # CPU em frequência alta
+STATE_SLEEP = 2     # Dormindo (sleep_ms ou lightsleep)
+STATE_NAMES = ("idle", "burst", "sleep")
+
+class _NoLock:
+    """Substituto do lock sem _thread (uma thread só)"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+class Governor:
+    def __init__(self, idle_freq=IDLE_FREQ, burst_freq=BURST_FREQ, lightsleep=False):
+        """
+        Args:
+            idle_freq: Frequência fora das rajadas (Hz)
+            burst_freq: Frequência durante as rajadas (Hz)
+            lightsleep: Usa machine.lightsleep() em idle() em vez de sleep_ms
+        """
+        self.idle_freq = idle_freq
+        self.burst_freq = burst_freq
+        self.lightsleep = lightsleep
+        self.state_ms = [0, 0, 0]
+        self.bursts = 0
+        self._state = STATE_IDLE
+        self._since = time.ticks_ms()
+        self._depth = 0
+        self._lock = allocate_lock() if allocate_lock is not None else _NoLock()
+
+    def _switch(self, state):
+        """Contabiliza o tempo do estado atual e troca de estado"""
+        now = time.ticks_ms()
+        self.state_ms[self._state] += time.ticks_diff(now, self._since)
+        self._since = now
+        self._state = state
+
+    def start(self):
+        """Coloca a CPU na frequência de economia"""
+        with self._lock:
+            machine.freq(self.idle_freq)
+            self._switch(STATE_IDLE)
+
+    def burst(self):
+        """Context manager para uma rajada em frequência alta"""
+        return self
+
+    def __enter__(self):
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self._switch(STATE_BURST)
+                machine.freq(self.burst_freq)
+                self.bursts += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0:
+                machine.freq(self.idle_freq)
+                self._switch(STATE_IDLE)
+        return False
+
+    def idle(self, ms):
+        """Dorme ms milissegundos em frequência baixa"""
+        with self._lock:
+            bursting = self._depth
+            if not bursting:
+                self._switch(STATE_SLEEP)
+        if bursting:
+            # Dentro de uma rajada (desta ou da outra thread): apenas espera
+            time.sleep_ms(ms)
+            return
+        if self.lightsleep:
+            machine.lightsleep(ms)
+        else:
+            time.sleep_ms(ms)
+        with self._lock:
+            if not self._depth:
+                self._switch(STATE_IDLE)
+
+    def stats(self):
+        """Retorna o tempo (ms) em cada estado e o número de rajadas"""
+        with self._lock:
+            self._switch(self._state)
+        stats = {"bursts": self.bursts}
+        for i in range(len(STATE_NAMES)):
+            stats[STATE_NAMES[i]] = self.state_ms[i]
+        return stats
+
+    def report(self):
+        """Imprime a distribuição de tempo entre os estados"""
+        stats = self.stats()
+        total = sum(self.state_ms) or 1
+        parts = []
+        for i in range(len(STATE_NAMES)):
+            parts.append(f"{STATE_NAMES[i]} {self.state_ms[i] * 100 // total}%")
+        print(f"CPU: {', '.join(parts)} ({stats['bursts']} rajadas)")
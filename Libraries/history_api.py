@@ -0,0 +1,211 @@
+"""
+Endpoint /api/history: séries históricas reduzidas para gráficos
+
+    GET /api/history?span=86400&points=240[&fmt=csv]
+
+Escolhe a fonte mais grossa (agregados por dia, hora, minuto ou o log
+bruto) que ainda fornece `points` pontos no período e que o cobre
+inteiro, reduz as amostras em `points` intervalos pela média e envia a
+resposta em blocos (Transfer-Encoding: chunked). A memória usada é a de
+um bloco de saída, qualquer que seja o período pedido.
+
+Formato binário (little-endian):
+
+    cabeçalho: "TH" | versão (uint8) | canais (uint8) | largura do
+               intervalo em s (uint32) | início em tempo Unix (uint32)
+    pontos:    timestamp Unix (uint32) | média de cada canal (int32,
+               ponto fixo de reading.py; MISSING se sem dado)
+
+Com fmt=csv envia "ts,bmp_temp,..." com os valores já convertidos.
+"""
+import struct
+import time
+import reading
+from rollup import TIERS
+from webserver import UNIX_EPOCH_OFFSET, BAD_REQUEST, start_chunked, write_chunk, end_chunked
+
+VERSION = 1
+HEADER_FMT = "<2sBBII"
+POINT_FMT = "<I5i"
+POINT_SIZE = struct.calcsize(POINT_FMT)
+MISSING = -0x80000000
+
+DEFAULT_SPAN = 86400
+DEFAULT_POINTS = 240
+MAX_POINTS = 1000
+CHUNK_POINTS = 16
+
+SOURCE_RAW = 255
+
+def choose_source(span, points, raw_period, raw_coverage, capacities):
+    """
+    Escolhe a fonte dos dados para um período.
+
+    Percorre do nível mais grosso para o mais fino e para no primeiro que
+    cobre o período com pelo menos `points` pontos. Se nenhum tiver pontos
+    suficientes, fica com o mais fino que cobre o período.
+
+    Returns:
+        (nível de rollup ou SOURCE_RAW, duração de cada registro em s)
+    """
+    sources = [(tier, TIERS[tier][1], TIERS[tier][1] * capacities[tier])
+               for tier in range(len(TIERS) - 1, -1, -1)]
+    sources.append((SOURCE_RAW, raw_period, raw_period * raw_coverage))
+    best = None
+    for source, period, coverage in sources:
+        if coverage < span:
+            continue
+        best = (source, period)
+        if span // period >= points:
+            break
+    if best is None:
+        best = (sources[0][0], sources[0][1])
+    return best
+
+def _int_param(request, name, default, low, high):
+    value = request.param(name)
+    if value is None:
+        return default
+    value = int(value)
+    if value < low or value > high:
+        raise ValueError(name)
+    return value
+
+class _Reducer:
+    """Acumula médias por intervalo e grava os pontos em um buffer fixo"""
+    def __init__(self, t0, width, csv):
+        self.t0 = t0
+        self.width = width
+        self.csv = csv
+        self.bucket = -1
+        self.sums = [0] * reading.NUM_CHANNELS
+        self.counts = [0] * reading.NUM_CHANNELS
+        self.buf = bytearray(CHUNK_POINTS * POINT_SIZE)
+        self.lines = []
+        self.pending = 0
+
+    def add(self, ts, channel, vsum, count):
+        bucket = (ts - self.t0) // self.width
+        if bucket != self.bucket:
+            self.emit()
+            self.bucket = bucket
+        self.sums[channel] += vsum
+        self.counts[channel] += count
+
+    def emit(self):
+        """Fecha o intervalo atual gravando sua média no buffer"""
+        counts = self.counts
+        if self.bucket < 0 or not any(counts):
+            return
+        ts = self.t0 + self.bucket * self.width + UNIX_EPOCH_OFFSET
+        sums = self.sums
+        means = [sums[ch] // counts[ch] if counts[ch] else MISSING
+                 for ch in range(reading.NUM_CHANNELS)]
+        if self.csv:
+            line = [str(ts)]
+            for ch in range(reading.NUM_CHANNELS):
+                scale = reading.CHANNEL_SCALES[ch]
+                if means[ch] == MISSING:
+                    line.append("")
+                elif scale == 1:
+                    line.append(str(means[ch]))
+                else:
+                    line.append(str(means[ch] / scale))
+            self.lines.append(",".join(line))
+        else:
+            struct.pack_into(POINT_FMT, self.buf, self.pending * POINT_SIZE, ts, *means)
+        self.pending += 1
+        for ch in range(reading.NUM_CHANNELS):
+            sums[ch] = 0
+            counts[ch] = 0
+
+    def take(self):
+        """Conteúdo pronto para envio (esvazia o buffer)"""
+        if self.csv:
+            data = ("\n".join(self.lines) + "\n").encode() if self.lines else b""
+            self.lines = []
+        else:
+            data = memoryview(self.buf)[:self.pending * POINT_SIZE]
+        self.pending = 0
+        return data
+
+def _raw_samples(history, t0, reducer):
+    """Gera após cada amostra bruta se o buffer de saída encheu"""
+    for rec in history.query(t0):
+        ts, flags = rec[1], rec[2]
+        for ch in range(reading.NUM_CHANNELS):
+            if flags & (1 << ch):
+                reducer.add(ts, ch, rec[3 + ch], 1)
+        yield reducer.pending == CHUNK_POINTS
+
+def _rollup_samples(rollups, tier, t0, reducer):
+    """Gera após cada agregado se o buffer de saída encheu"""
+    for rec in rollups.query(tier, t0):
+        start = rec[0]
+        for ch in range(reading.NUM_CHANNELS):
+            i = 1 + ch * 5
+            if rec[i]:
+                reducer.add(start, ch, rec[i + 3], rec[i])
+        yield reducer.pending == CHUNK_POINTS
+
+def history_route(history, rollups, raw_period):
+    """
+    Cria o handler de /api/history para WebServer.routes.
+
+    Args:
+        history: TimeSeriesLog com o log bruto
+        rollups: RollupEngine com os agregados
+        raw_period: Intervalo entre registros do log bruto (s)
+    """
+    capacities = [t.capacity for t in rollups.tiers]
+
+    async def handler(server, request, writer):
+        try:
+            span = _int_param(request, b"span", DEFAULT_SPAN, 60, 0x7FFFFFFF)
+            points = _int_param(request, b"points", DEFAULT_POINTS, 1, MAX_POINTS)
+        except ValueError:
+            await server._send(writer, request, BAD_REQUEST)
+            return True
+        csv = request.param(b"fmt") == b"csv"
+
+        coverage = history.usage()[1]
+        source, period = choose_source(span, points, raw_period, coverage, capacities)
+        width = max(period, span // points)
+        t0 = int(time.time()) - span
+        t0 -= t0 % width
+        reducer = _Reducer(t0, width, csv)
+
+        if csv:
+            content_type = b"text/csv"
+        else:
+            content_type = b"application/octet-stream"
+        if not await start_chunked(writer, request, content_type):
+            return True
+
+        if csv:
+            head = "ts," + ",".join(reading.CHANNEL_KEYS) + "\n"
+            await write_chunk(writer, head.encode())
+        else:
+            await write_chunk(writer, struct.pack(HEADER_FMT, b"TH", VERSION, reading.NUM_CHANNELS,
+                                                  width, t0 + UNIX_EPOCH_OFFSET))
+
+        if source == SOURCE_RAW:
+            samples = _raw_samples(history, t0, reducer)
+        else:
+            samples = _rollup_samples(rollups, source, t0, reducer)
+        # Lê e reduz um bloco por rajada de CPU; envia fora dela, cedendo o loop de eventos
+        done = False
+        while not done:
+            with server.burst():
+                for full in samples:
+                    if full:
+                        break
+                else:
+                    reducer.emit()
+                    done = True
+                chunk = reducer.take()
+            await write_chunk(writer, chunk)
+        await end_chunked(writer)
+        return True
+
+    return handler
@@ -0,0 +1,333 @@
+"""
+Publicação das leituras por MQTT em lotes, com fila na flash
+
+- add() acumula as amostras em um lote codificado com tscodec (alguns
+  bytes por amostra); a cada `batch_size` amostras o lote fica pronto.
+- run() é uma tarefa asyncio: liga o rádio, conecta, publica os lotes
+  (QoS 1, aguardando o PUBACK), desconecta e desliga o rádio. O loop de
+  leitura nunca espera pela rede.
+- Sem conexão, os lotes vão para uma fila de arquivos na flash; ao
+  reconectar a fila é esvaziada com limite de taxa, do mais antigo para
+  o mais novo, e os lotes novos têm prioridade.
+- message() envia mensagens avulsas (ex.: alertas) em outro tópico, na
+  próxima sessão e antes dos lotes; ficam só na RAM.
+
+O cliente MQTT (MqttClient) implementa só CONNECT, PUBLISH QoS 1 e
+DISCONNECT sobre streams asyncio, então funciona tanto no uasyncio
+quanto no CPython. Qualquer objeto com os mesmos métodos assíncronos
+connect/publish/disconnect pode ser injetado (ex.: um broker falso).
+"""
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+import os
+import struct
+import time
+from tscodec import Encoder, write_varint
+
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    # CPython (testes no computador)
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+class MqttClient:
+    """Cliente MQTT 3.1.1 mínimo (QoS 1) sobre streams asyncio"""
+    def __init__(self, server, port=1883, client_id="estacao", keepalive=60, timeout_s=10):
+        self.server = server
+        self.port = port
+        self.client_id = client_id
+        self.keepalive = keepalive
+        self.timeout_s = timeout_s
+        self._reader = None
+        self._writer = None
+        self._pid = 0
+
+    @staticmethod
+    def _packet(kind, body):
+        head = bytearray([kind])
+        write_varint(head, len(body))
+        return head + body
+
+    @staticmethod
+    def _string(s):
+        return struct.pack("!H", len(s)) + s
+
+    async def _expect(self, kind):
+        packet = await asyncio.wait_for(self._reader.readexactly(4), self.timeout_s)
+        if packet[0] != kind or packet[1] != 2:
+            raise OSError("resposta MQTT inesperada")
+        return packet
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.server, self.port), self.timeout_s)
+        body = (self._string(b"MQTT") + bytes([4, 0x02]) + struct.pack("!H", self.keepalive) +
+                self._string(self.client_id.encode()))
+        self._writer.write(self._packet(0x10, body))
+        await self._writer.drain()
+        ack = await self._expect(0x20)
+        if ack[3] != 0:
+            raise OSError(f"broker recusou a conexão (código {ack[3]})")
+
+    async def publish(self, topic, payload):
+        self._pid = self._pid % 0xFFFF + 1
+        body = self._string(topic) + struct.pack("!H", self._pid) + payload
+        self._writer.write(self._packet(0x32, body))
+        await self._writer.drain()
+        ack = await self._expect(0x40)
+        if struct.unpack("!H", ack[2:4])[0] != self._pid:
+            raise OSError("PUBACK com id errado")
+
+    async def disconnect(self):
+        if self._writer is None:
+            return
+        try:
+            self._writer.write(b"\xe0\x00")
+            await self._writer.drain()
+            self._writer.close()
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+        self._reader = self._writer = None
+
+class Spool:
+    """Fila FIFO de lotes na flash, um arquivo por lote"""
+    def __init__(self, path="/mqtt", max_files=64):
+        self.path = path
+        self.max_files = max_files
+        self.dropped = 0
+        try:
+            os.mkdir(path)
+        except OSError:
+            pass
+        ids = [int(name[1:7]) for name in os.listdir(path)
+               if name.startswith("q") and name.endswith(".bin")]
+        self.head = min(ids) if ids else 0      # Mais antigo
+        self.tail = max(ids) + 1 if ids else 0  # Próximo a gravar
+
+    def _name(self, n):
+        return f"{self.path}/q{n:06d}.bin"
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def push(self, payload):
+        if len(self) >= self.max_files:
+            # Fila cheia: descarta o lote mais antigo
+            self.pop()
+            self.dropped += 1
+        with open(self._name(self.tail), "wb") as f:
+            f.write(payload)
+        self.tail += 1
+
+    def peek(self):
+        with open(self._name(self.head), "rb") as f:
+            return f.read()
+
+    def pop(self):
+        try:
+            os.remove(self._name(self.head))
+        except OSError:
+            pass
+        self.head += 1
+        if self.head == self.tail:
+            self.head = self.tail = 0
+
+class MqttPublisher:
+    def __init__(self, client, topic, batch_size=16, spool=None, radio=None,
+                 max_queue=4, drain_per_s=2, retry_s=30, max_retry_s=600):
+        """
+        Args:
+            client: Objeto com connect/publish/disconnect assíncronos (MqttClient)
+            topic: Tópico dos lotes (bytes)
+            batch_size: Amostras por lote
+            spool: Fila na flash (Spool) para os lotes não enviados
+            radio: Objeto com on()/off() assíncronos, ou None se o Wi-Fi fica ligado
+            max_queue: Lotes prontos em RAM antes de ir para a flash
+            drain_per_s: Lotes da fila da flash enviados por segundo
+            retry_s, max_retry_s: Espera inicial e máxima entre tentativas
+        """
+        self.client = client
+        self.topic = topic
+        self.batch_size = batch_size
+        self.spool = spool
+        self.radio = radio
+        self.max_queue = max_queue
+        self.drain_interval = 1 / drain_per_s
+        self.retry_s = retry_s
+        self.max_retry_s = max_retry_s
+        self._backoff = retry_s
+        self._queue = []
+        self._messages = []
+        self._encoder = None
+        self._ready = asyncio.Event()
+
+        # Métricas
+        self.samples = 0
+        self.published = 0
+        self.published_samples = 0
+        self.bytes_sent = 0
+        self.spooled = 0
+        self.dropped = 0
+        self.failures = 0
+        self.radio_on_ms = 0
+        self.connected = False
+
+    def add(self, timestamp, flags, values):
+        """Acrescenta uma amostra ao lote atual (não bloqueia)"""
+        if self._encoder is None:
+            self._encoder = Encoder()
+        self._encoder.add(timestamp, flags, values)
+        self.samples += 1
+        if self._encoder.count >= self.batch_size:
+            self._enqueue(bytes(self._encoder.getvalue()))
+            self._encoder = None
+
+    def message(self, topic, payload):
+        """Mensagem avulsa em outro tópico (descarta a mais antiga acima de max_queue)"""
+        if len(self._messages) >= self.max_queue:
+            self._messages.pop(0)
+            self.dropped += 1
+        self._messages.append((topic, payload))
+        self._ready.set()
+
+    def _enqueue(self, payload):
+        if len(self._queue) >= self.max_queue:
+            oldest = self._queue.pop(0)
+            if self.spool is not None:
+                self.spool.push(oldest)
+                self.spooled += 1
+            else:
+                self.dropped += 1
+        self._queue.append(payload)
+        self._ready.set()
+
+    def spill(self):
+        """Grava na flash os lotes em RAM e o lote incompleto (antes de desligar)"""
+        if self.spool is None:
+            return
+        if self._encoder is not None and self._encoder.count:
+            self._queue.append(bytes(self._encoder.getvalue()))
+            self._encoder = None
+        while self._queue:
+            self.spool.push(self._queue.pop(0))
+            self.spooled += 1
+
+    def backlog(self):
+        """Lotes aguardando envio (RAM + flash)"""
+        return len(self._messages) + len(self._queue) + (len(self.spool) if self.spool is not None else 0)
+
+    async def _send(self, payload):
+        await self.client.publish(self.topic, payload)
+        self.published += 1
+        self.published_samples += payload_count(payload)
+        self.bytes_sent += len(payload)
+
+    async def _session(self):
+        """Uma sessão: conecta, envia tudo o que houver e desconecta"""
+        await self.client.connect()
+        self.connected = True
+        while True:
+            if self._messages:
+                topic, payload = self._messages[0]
+                await self.client.publish(topic, payload)
+                self._messages.pop(0)
+                self.bytes_sent += len(payload)
+            elif self._queue:
+                await self._send(self._queue[0])
+                self._queue.pop(0)
+            elif self.spool is not None and len(self.spool):
+                await self._send(self.spool.peek())
+                self.spool.pop()
+                await asyncio.sleep(self.drain_interval)
+            else:
+                break
+        await self.client.disconnect()
+        self.connected = False
+
+    async def run(self):
+        """Tarefa de envio (asyncio.create_task(publisher.run()))"""
+        while True:
+            if not self.backlog():
+                await self._ready.wait()
+            self._ready.clear()
+
+            t0 = ticks_ms()
+            try:
+                if self.radio is not None:
+                    await self.radio.on()
+                await self._session()
+                self._backoff = self.retry_s
+                wait = 0
+            except (OSError, EOFError, asyncio.TimeoutError) as e:
+                print(f"MQTT erro: {e}")
+                self.failures += 1
+                self.connected = False
+                await self.client.disconnect()
+                # Os lotes em RAM vão para a flash até a próxima tentativa
+                if self.spool is not None:
+                    while self._queue:
+                        self.spool.push(self._queue.pop(0))
+                        self.spooled += 1
+                wait = self._backoff
+                self._backoff = min(self._backoff * 2, self.max_retry_s)
+            finally:
+                if self.radio is not None:
+                    self.radio.off()
+                self.radio_on_ms += ticks_diff(ticks_ms(), t0)
+            if wait:
+                await asyncio.sleep(wait)
+
+    def stats(self):
+        return {
+            "samples": self.samples,
+            "published": self.published,
+            "published_samples": self.published_samples,
+            "bytes_sent": self.bytes_sent,
+            "spooled": self.spooled,
+            "dropped": self.dropped + (self.spool.dropped if self.spool is not None else 0),
+            "backlog": self.backlog(),
+            "failures": self.failures,
+            "radio_on_ms": self.radio_on_ms,
+        }
+
+def payload_count(payload):
+    """Número de amostras em um lote (percorre os varints sem decodificar)"""
+    channels = payload[3]
+    fields = channels + 2
+    varints = 0
+    for i in range(4, len(payload)):
+        if not payload[i] & 0x80:
+            varints += 1
+    return varints // fields
+
+class WifiRadio:
+    """Liga o Wi-Fi só durante o envio dos lotes"""
+    def __init__(self, wlan, ssid, password, timeout_s=15):
+        self.wlan = wlan
+        self.ssid = ssid
+        self.password = password
+        self.timeout_s = timeout_s
+
+    async def on(self):
+        self.wlan.active(True)
+        if not self.wlan.isconnected():
+            self.wlan.connect(self.ssid, self.password)
+            for _ in range(self.timeout_s * 10):
+                if self.wlan.isconnected():
+                    return
+                await asyncio.sleep(0.1)
+            raise OSError("Wi-Fi não conectou")
+
+    def off(self):
+        try:
+            self.wlan.disconnect()
+        except OSError:
+            pass
+        self.wlan.active(False)
@@ -0,0 +1,80 @@
+"""
+Estado persistente entre resets para MicroPython em ESP32
+
+- Memória RTC: sobrevive a resets de software, watchdog e deep sleep
+  (perdida apenas ao desligar). Barata de escrever, não gasta a flash.
+- Arquivos JSON na flash: sobrevivem a tudo, mas devem ser escritos
+  apenas em eventos (boot, falhas), nunca a cada ciclo.
+"""
+import json
+import os
+
+try:
+    from machine import RTC
+    _rtc = RTC()
+except Exception:
+    _rtc = None
+
+# Cópia em RAM do conteúdo da memória RTC
+_rtc_data = None
+
+def rtc_load():
+    """Carrega (uma vez) o dicionário guardado na memória RTC"""
+    global _rtc_data
+    if _rtc_data is None:
+        _rtc_data = {}
+        if _rtc is not None:
+            try:
+                raw = _rtc.memory()
+                if raw:
+                    _rtc_data = json.loads(raw)
+            except Exception:
+                # Conteúdo corrompido ou de outra versão - descarta
+                _rtc_data = {}
+    return _rtc_data
+
+def rtc_get(key, default=None):
+    """Retorna um valor da memória RTC"""
+    return rtc_load().get(key, default)
+
+def rtc_set(key, value):
+    """Grava um valor na memória RTC"""
+    data = rtc_load()
+    if value is None:
+        if key not in data:
+            return
+        del data[key]
+    else:
+        data[key] = value
+    if _rtc is not None:
+        try:
+            _rtc.memory(json.dumps(data))
+        except Exception as e:
+            print(f"Erro gravando memória RTC: {e}")
+
+def rtc_clear():
+    """Apaga todo o conteúdo da memória RTC"""
+    global _rtc_data
+    _rtc_data = {}
+    if _rtc is not None:
+        _rtc.memory(b"")
+
+def load(path, default=None):
+    """Lê um arquivo JSON da flash, retornando default se não existir"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save(path, data):
+    """Grava um arquivo JSON na flash de forma atômica (tmp + rename)"""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.rename(tmp, path)
+        return True
+    except OSError as e:
+        print(f"Erro gravando {path}: {e}")
+        return False
@@ -0,0 +1,129 @@
+"""
+Detecção do início da chuva por interrupção
+
+Duas fontes, conforme a ligação do módulo de chuva:
+
+- Saída digital (DO): o comparador do módulo vai a LOW quando a placa
+  molha (limiar no trimpot). A borda de descida gera uma IRQ e, com
+  esp32.wake_on_ext0 (pino RTC), também acorda o ESP32 do light sleep
+  e do deep sleep. O ext0 acorda pelo nível, não pela borda: com a
+  placa molhada todo sleep voltaria na hora, então o despertar é
+  desligado no início da chuva e religado quando a DO volta a HIGH.
+- Sem DO: um Timer lê o ADC a cada `period_ms` e compara com o limiar;
+  só rearma depois de voltar acima de limiar + histerese. O Timer para
+  no light sleep, então com lightsleep use a DO.
+
+A IRQ só agenda o tratamento com micropython.schedule (referência ao
+método criada uma vez, sem alocar no contexto da interrupção); o
+callback `on_onset` roda na thread principal, entre instruções, e
+`take()` avisa o loop principal para encerrar a espera.
+"""
+import time
+import micropython
+from machine import Pin, Timer
+
+class RainWatch:
+    def __init__(self, on_onset, pin=None, adc=None, threshold=0, hysteresis=0,
+                 period_ms=1000, holdoff_ms=0, timer_id=0):
+        """
+        Args:
+            on_onset: Função chamada (sem argumentos) no início da chuva
+            pin: Pino da saída DO do módulo (None = vigia pelo ADC)
+            adc: ADC do sensor de chuva (modo sem DO)
+            threshold: Contagem do ADC abaixo da qual está molhado
+            hysteresis: Margem acima do limiar para rearmar
+            period_ms: Intervalo de leitura do ADC pelo Timer
+            holdoff_ms: Bordas seguintes ignoradas por esse tempo após um início
+            timer_id: Timer de hardware usado no modo ADC
+        """
+        self.on_onset = on_onset
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.holdoff_ms = holdoff_ms
+        self.onsets = 0
+        self.triggered = False
+        self.last_onset_ms = None
+        self._armed = True
+        self._pin = None
+        self._wake_armed = False
+        self._adc = adc
+        self._timer = None
+        # Referências fixas para micropython.schedule()
+        self._handle_ref = self._handle
+        self._check_ref = self._check
+
+        if pin is not None:
+            self._pin = Pin(pin, Pin.IN)
+            self._pin.irq(handler=self._irq, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+            self._arm_wake(self._pin.value() == 1)
+        else:
+            self._timer = Timer(timer_id)
+            self._timer.init(period=period_ms, mode=Timer.PERIODIC, callback=self._tick)
+
+    # --- Contexto de interrupção: só agenda ---
+
+    def _irq(self, pin):
+        micropython.schedule(self._handle_ref, 0)
+
+    def _tick(self, timer):
+        # Leitura do ADC fora do callback do Timer
+        micropython.schedule(self._check_ref, 0)
+
+    # --- Thread principal ---
+
+    def _arm_wake(self, armed):
+        """Liga (placa seca) ou desliga (molhada) o despertar pelo ext0"""
+        if armed == self._wake_armed:
+            return
+        import esp32
+        esp32.wake_on_ext0(self._pin if armed else None, esp32.WAKEUP_ALL_LOW)
+        self._wake_armed = armed
+
+    def _handle(self, _):
+        # Decide pelo nível atual: ignora pulsos curtos da saída
+        if self._pin.value() == 0:
+            self._arm_wake(False)
+            self._onset()
+        else:
+            self._arm_wake(True)
+
+    def _check(self, _):
+        value = self._adc.read()
+        if value < self.threshold:
+            if self._armed:
+                self._armed = False
+                self._onset()
+        elif value > self.threshold + self.hysteresis:
+            self._armed = True
+
+    def _onset(self):
+        now = time.ticks_ms()
+        if self.last_onset_ms is not None and time.ticks_diff(now, self.last_onset_ms) < self.holdoff_ms:
+            return
+        self.last_onset_ms = now
+        self.onsets += 1
+        self.triggered = True
+        self.on_onset()
+
+    def wet(self):
+        """Estado atual da saída DO (modo ADC: último estado do limiar)"""
+        if self._pin is not None:
+            return self._pin.value() == 0
+        return not self._armed
+
+    def take(self):
+        """True uma vez depois de cada início de chuva (encerra a espera do loop)"""
+        # A borda de subida pode se perder durante o sleep: religa pelo nível
+        if self._pin is not None and not self._wake_armed and self._pin.value() == 1:
+            self._arm_wake(True)
+        if self.triggered:
+            self.triggered = False
+            return True
+        return False
+
+    def deinit(self):
+        if self._pin is not None:
+            self._pin.irq(handler=None)
+            self._arm_wake(False)
+        if self._timer is not None:
+            self._timer.deinit()
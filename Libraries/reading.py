@@ -0,0 +1,75 @@
+"""
+Registro de leitura de tamanho fixo da estação meteorológica
+
+Cada amostra é um timestamp, um campo de flags e um valor inteiro em
+ponto fixo por canal. O mesmo layout é usado pelos buffers entre
+threads, pelos logs na flash e pelos protocolos de transmissão.
+"""
+import struct
+
+# Canais (índice no registro)
+CH_BMP_TEMP = 0         # BMP280 temperatura (0.01 °C)
+CH_BMP_PRESSURE = 1     # BMP280 pressão (1 Pa)
+CH_DHT_TEMP = 2         # DHT11 temperatura (0.01 °C)
+CH_DHT_HUMIDITY = 3     # DHT11 umidade (0.01 %)
+CH_RAIN = 4             # Sensor de chuva (contagem do ADC)
+NUM_CHANNELS = 5
+
+# Chave de cada canal no dicionário de dados e divisor do ponto fixo
+CHANNEL_KEYS = ('bmp_temp', 'bmp_pressure', 'dht_temp', 'dht_humidity', 'rain_value')
+CHANNEL_SCALES = (100, 1, 100, 100, 1)
+
+# Flags: bits 0-4 = canal válido, bits 8-10 = erro no sensor
+FLAG_BMP_ERROR = 0x100
+FLAG_DHT_ERROR = 0x200
+FLAG_RAIN_ERROR = 0x400
+_ERROR_FLAGS = (('bmp_error', FLAG_BMP_ERROR), ('dht_error', FLAG_DHT_ERROR), ('rain_error', FLAG_RAIN_ERROR))
+
+# timestamp (uint32), flags (uint16), canais (int32)
+RECORD_FMT = "<IH5i"
+RECORD_SIZE = struct.calcsize(RECORD_FMT)
+
+def encode(data, values):
+    """
+    Converte um dicionário de dados em valores de ponto fixo.
+
+    Args:
+        data: Dicionário com as chaves de CHANNEL_KEYS e *_error
+        values: Lista/array de NUM_CHANNELS inteiros preenchida in-place
+
+    Returns:
+        flags da amostra
+    """
+    flags = 0
+    for ch in range(NUM_CHANNELS):
+        value = data.get(CHANNEL_KEYS[ch])
+        if value is None:
+            values[ch] = 0
+        else:
+            values[ch] = int(round(value * CHANNEL_SCALES[ch]))
+            flags |= 1 << ch
+    for key, flag in _ERROR_FLAGS:
+        if key in data:
+            flags |= flag
+    return flags
+
+def decode(flags, values):
+    """Converte valores de ponto fixo de volta para um dicionário de dados"""
+    data = {}
+    for ch in range(NUM_CHANNELS):
+        if flags & (1 << ch):
+            scale = CHANNEL_SCALES[ch]
+            data[CHANNEL_KEYS[ch]] = values[ch] / scale if scale != 1 else values[ch]
+    for key, flag in _ERROR_FLAGS:
+        if flags & flag:
+            data[key] = "Erro"
+    return data
+
+def pack_into(buf, offset, timestamp, flags, values):
+    """Escreve uma amostra em buf a partir de offset"""
+    struct.pack_into(RECORD_FMT, buf, offset, timestamp, flags,
+                     values[0], values[1], values[2], values[3], values[4])
+
+def unpack_from(buf, offset=0):
+    """Lê uma amostra: (timestamp, flags, c0, c1, c2, c3, c4)"""
+    return struct.unpack_from(RECORD_FMT, buf, offset)
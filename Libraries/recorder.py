@@ -0,0 +1,232 @@
+"""
+Gravação dos dados brutos dos sensores para reprodução no computador
+
+Proxies em volta do I2C, do DHT11 e do ADC gravam exatamente o que o
+hardware respondeu (bytes dos registradores, os 5 bytes ou as durações
+dos pulsos do DHT11, contagens do ADC), separados por marcas de ciclo.
+No computador, Simulator/replay.py alimenta os drivers e o código
+atual de compensação/classificação com esses dados, sem a placa:
+
+    RPL1 | eventos: tipo (uint8) + campos
+
+    EV_CYCLE       timestamp (uint32)
+    EV_I2C         endereço, registrador, n (uint8), n bytes lidos
+    EV_ADC         pino (uint8), contagem (uint16)
+    EV_DHT         pino (uint8), 5 bytes (umid., dec., temp., dec., checksum)
+    EV_DHT_PULSES  pino (uint8), 40 durações em us (uint8, saturadas)
+    EV_DHT_FAIL    pino (uint8), errno (uint8)
+    EV_SAMPLE      amostra processada (reading.RECORD_FMT), para comparação
+
+Os eventos são acumulados em um buffer de uma página da flash (4096
+bytes) e gravados de uma vez; um reset perde no máximo a página atual.
+"""
+import struct
+import reading
+
+MAGIC = b"RPL1"
+PAGE_SIZE = 4096
+
+EV_CYCLE = 0
+EV_I2C = 1
+EV_ADC = 2
+EV_DHT = 3
+EV_DHT_PULSES = 4
+EV_DHT_FAIL = 5
+EV_SAMPLE = 6
+
+class Recorder:
+    def __init__(self, stream, max_bytes=0):
+        """
+        Args:
+            stream: Arquivo aberto em modo binário (ou a UART) que recebe os eventos
+            max_bytes: Para de gravar depois desse tamanho (0 = sem limite)
+        """
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.written = 0
+        self.full = False
+        self._buf = bytearray(PAGE_SIZE)
+        self._mv = memoryview(self._buf)
+        self._pos = 0
+        self._write(MAGIC)
+
+    @classmethod
+    def open(cls, path, max_bytes=0):
+        """Cria o arquivo de gravação (e o diretório, se preciso)"""
+        import os
+        directory = path.rsplit("/", 1)[0]
+        if directory:
+            try:
+                os.mkdir(directory)
+            except OSError:
+                pass
+        return cls(open(path, "wb"), max_bytes)
+
+    def _reserve(self, size):
+        """Posição no buffer para um evento de `size` bytes, ou -1 se cheio"""
+        if self.full:
+            return -1
+        if self.max_bytes and self.written + self._pos + size > self.max_bytes:
+            self.flush()
+            self.full = True
+            print("Gravação: limite de tamanho atingido - parando")
+            return -1
+        if self._pos + size > PAGE_SIZE:
+            self.flush()
+        pos = self._pos
+        self._pos += size
+        return pos
+
+    def _write(self, data):
+        pos = self._reserve(len(data))
+        if pos >= 0:
+            self._buf[pos:pos + len(data)] = data
+
+    def flush(self):
+        if self._pos:
+            self.stream.write(self._mv[:self._pos])
+            # O littlefs só efetiva os dados no flush/close do arquivo
+            try:
+                self.stream.flush()
+            except AttributeError:
+                pass
+            self.written += self._pos
+            self._pos = 0
+
+    def close(self):
+        self.flush()
+        try:
+            self.stream.close()
+        except AttributeError:
+            pass
+
+    # --- Eventos ---
+
+    def cycle(self, timestamp):
+        pos = self._reserve(5)
+        if pos >= 0:
+            struct.pack_into("<BI", self._buf, pos, EV_CYCLE, timestamp)
+
+    def sample(self, timestamp, flags, values):
+        pos = self._reserve(1 + reading.RECORD_SIZE)
+        if pos >= 0:
+            self._buf[pos] = EV_SAMPLE
+            reading.pack_into(self._buf, pos + 1, timestamp, flags, values)
+
+    def i2c_read(self, addr, reg, data):
+        n = len(data)
+        pos = self._reserve(4 + n)
+        if pos >= 0:
+            buf = self._buf
+            buf[pos] = EV_I2C
+            buf[pos + 1] = addr
+            buf[pos + 2] = reg
+            buf[pos + 3] = n
+            buf[pos + 4:pos + 4 + n] = data
+
+    def adc_read(self, pin, value):
+        pos = self._reserve(4)
+        if pos >= 0:
+            struct.pack_into("<BBH", self._buf, pos, EV_ADC, pin, value)
+
+    def dht_bytes(self, pin, data):
+        pos = self._reserve(7)
+        if pos >= 0:
+            self._buf[pos] = EV_DHT
+            self._buf[pos + 1] = pin
+            self._buf[pos + 2:pos + 7] = data
+
+    def dht_pulses(self, pin, pulses):
+        pos = self._reserve(42)
+        if pos >= 0:
+            buf = self._buf
+            buf[pos] = EV_DHT_PULSES
+            buf[pos + 1] = pin
+            for i in range(40):
+                p = pulses[i]
+                buf[pos + 2 + i] = p if p < 255 else 255
+
+    def dht_fail(self, pin, code):
+        pos = self._reserve(3)
+        if pos >= 0:
+            self._buf[pos] = EV_DHT_FAIL
+            self._buf[pos + 1] = pin
+            self._buf[pos + 2] = code & 0xFF
+
+    # --- Proxies dos periféricos ---
+
+    def i2c(self, i2c):
+        return RecordingI2C(i2c, self)
+
+    def adc(self, adc, pin):
+        return RecordingADC(adc, pin, self)
+
+    def dht(self, sensor, pin):
+        return RecordingDHT(sensor, pin, self)
+
+class RecordingI2C:
+    """machine.I2C que grava os bytes lidos de cada registrador"""
+    def __init__(self, i2c, recorder):
+        self._i2c = i2c
+        self._rec = recorder
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *args, **kwargs):
+        data = self._i2c.readfrom_mem(addr, memaddr, nbytes, *args, **kwargs)
+        self._rec.i2c_read(addr, memaddr, data)
+        return data
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *args, **kwargs):
+        self._i2c.readfrom_mem_into(addr, memaddr, buf, *args, **kwargs)
+        self._rec.i2c_read(addr, memaddr, buf)
+
+    def __getattr__(self, name):
+        return getattr(self._i2c, name)
+
+class RecordingADC:
+    """machine.ADC que grava cada contagem lida"""
+    def __init__(self, adc, pin, recorder):
+        self._adc = adc
+        self._pin = pin
+        self._rec = recorder
+
+    def read(self):
+        value = self._adc.read()
+        self._rec.adc_read(self._pin, value)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self._adc, name)
+
+class RecordingDHT:
+    """
+    DHT11 que grava a resposta bruta: as durações dos pulsos
+    (Libraries/dht11.py) ou os 5 bytes (módulo dht do MicroPython)
+    """
+    def __init__(self, sensor, pin, recorder):
+        self._sensor = sensor
+        self._pin = pin
+        self._rec = recorder
+
+    def _record(self):
+        pulses = getattr(self._sensor, "_pulses", None)
+        if pulses is not None:
+            self._rec.dht_pulses(self._pin, pulses)
+        else:
+            self._rec.dht_bytes(self._pin, self._sensor.buf)
+
+    def measure(self):
+        try:
+            result = self._sensor.measure()
+        except OSError as e:
+            # Sem resposta do sensor: nada foi lido
+            self._rec.dht_fail(self._pin, e.args[0] if e.args and isinstance(e.args[0], int) else 0)
+            raise
+        except Exception:
+            # Erro de checksum: os bytes lidos explicam a falha
+            self._record()
+            raise
+        self._record()
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._sensor, name)
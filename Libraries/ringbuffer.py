@@ -0,0 +1,53 @@
+"""
+Buffer circular de um produtor e um consumidor (SPSC) sem lock
+
+Os registros têm tamanho fixo e ficam em um bytearray alocado uma única
+vez. O produtor só escreve em `head` e o consumidor só escreve em
+`tail`; como a atribuição de um inteiro é atômica no MicroPython, as
+duas threads não precisam de lock. Uma posição fica sempre vazia para
+distinguir buffer cheio de buffer vazio.
+"""
+import reading
+
+class RingBuffer:
+    def __init__(self, capacity, record_size=reading.RECORD_SIZE):
+        """
+        Args:
+            capacity: Número máximo de registros guardados
+            record_size: Tamanho de cada registro em bytes
+        """
+        self.capacity = capacity + 1
+        self.record_size = record_size
+        self.buf = bytearray(self.capacity * record_size)
+        self.head = 0       # Próxima posição de escrita (produtor)
+        self.tail = 0       # Próxima posição de leitura (consumidor)
+        self.dropped = 0    # Amostras descartadas com o buffer cheio
+
+    def __len__(self):
+        return (self.head - self.tail) % self.capacity
+
+    def push(self, timestamp, flags, values):
+        """Produtor: grava uma amostra. Retorna False se o buffer está cheio"""
+        head = self.head
+        nxt = head + 1
+        if nxt == self.capacity:
+            nxt = 0
+        if nxt == self.tail:
+            self.dropped += 1
+            return False
+        reading.pack_into(self.buf, head * self.record_size, timestamp, flags, values)
+        # Publica somente depois que o registro está completo
+        self.head = nxt
+        return True
+
+    def pop(self):
+        """Consumidor: retorna a amostra mais antiga ou None se vazio"""
+        tail = self.tail
+        if tail == self.head:
+            return None
+        sample = reading.unpack_from(self.buf, tail * self.record_size)
+        tail += 1
+        if tail == self.capacity:
+            tail = 0
+        self.tail = tail
+        return sample
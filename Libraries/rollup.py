@@ -0,0 +1,258 @@
+"""
+Agregados incrementais em múltiplas resoluções (minuto/hora/dia)
+
+Para cada canal e cada nível mantém count, min, max, soma e soma dos
+quadrados do intervalo em aberto. Cada amostra custa O(1) por nível;
+quando o intervalo fecha, o agregado é gravado como um registro de
+tamanho fixo em um arquivo circular ao lado do log bruto.
+
+Consultas sobre períodos longos leem algumas centenas de agregados em
+vez de dezenas de milhares de amostras.
+
+Cada registro leva um número de sequência de escrita: a posição de
+escrita é recuperada pelo maior seq, não pelo maior início, porque o
+relógio volta perto de 2000 a cada boot sem hora sincronizada. Como em
+tslog.py, um recuo do relógio abre uma nova época e as consultas só
+leem os agregados da época atual.
+"""
+import struct
+import persist
+import reading
+from tslog import CLOCK_SLACK_S
+
+# (nome, duração do intervalo em segundos, capacidade padrão em registros)
+TIERS = (
+    ("minute", 60, 360),       # 6 horas
+    ("hour", 3600, 336),       # 14 dias
+    ("day", 86400, 365),       # 1 ano
+)
+TIER_MINUTE = 0
+TIER_HOUR = 1
+TIER_DAY = 2
+
+# Campos por canal no acumulador
+_COUNT = 0
+_MIN = 1
+_MAX = 2
+_SUM = 3
+_SUMSQ = 4
+_FIELDS = 5
+
+# início do intervalo (uint32) + por canal: count, min, max, soma, soma dos quadrados
+# count em uint32: um dia com amostras a cada 1 s passa de 65535
+# Por último o seq de escrita (uint32)
+_CHANNEL_FMT = "Iiiqq"
+RECORD_FMT = "<I" + _CHANNEL_FMT * reading.NUM_CHANNELS + "I"
+RECORD_SIZE = struct.calcsize(RECORD_FMT)
+_SEQ_OFFSET = RECORD_SIZE - 4
+_EMPTY = 0xFFFFFFFF
+
+def mean(count, vsum, scale=1):
+    """Média de um agregado (None se vazio)"""
+    if not count:
+        return None
+    return vsum / count / scale
+
+def stddev(count, vsum, vsumsq, scale=1):
+    """Desvio padrão populacional de um agregado (None se vazio)"""
+    if not count:
+        return None
+    m = vsum / count
+    var = vsumsq / count - m * m
+    return (var if var > 0 else 0) ** 0.5 / scale
+
+class _Tier:
+    def __init__(self, path, name, period, capacity):
+        self.name = name
+        self.period = period
+        self.capacity = capacity
+        self.file_name = f"{path}/rollup_{name}.bin"
+        self.start = None                       # Início do intervalo em aberto
+        self.acc = [0] * (_FIELDS * reading.NUM_CHANNELS)
+        self.head = 0                           # Próxima posição no arquivo
+        self.seq = 0                            # Seq do próximo registro
+        self.epoch_seq = 0                      # Seq do primeiro registro da época atual
+        self.last_start = None                  # Início do último registro gravado
+        self._open()
+
+    def _open(self):
+        size = self.capacity * RECORD_SIZE
+        try:
+            import os
+            ok = os.stat(self.file_name)[6] == size
+        except OSError:
+            ok = False
+        if not ok:
+            with open(self.file_name, "wb") as f:
+                blank = b"\xff" * RECORD_SIZE
+                for _ in range(self.capacity):
+                    f.write(blank)
+            self.head = 0
+        else:
+            self._recover()
+        self.file = open(self.file_name, "r+b")
+
+    def _read_key(self, f, i, buf):
+        """(início, seq) do registro i"""
+        f.seek(i * RECORD_SIZE)
+        f.readinto(buf)
+        start = struct.unpack_from("<I", buf)[0]
+        f.seek(i * RECORD_SIZE + _SEQ_OFFSET)
+        f.readinto(buf)
+        return start, struct.unpack_from("<I", buf)[0]
+
+    def _recover(self):
+        """Posição após o registro mais recente (maior seq) e início da época"""
+        newest = -1
+        head = 0
+        buf = bytearray(4)
+        with open(self.file_name, "rb") as f:
+            for i in range(self.capacity):
+                start, seq = self._read_key(f, i, buf)
+                if start != _EMPTY and seq > newest:
+                    newest = seq
+                    head = i + 1
+                    self.last_start = start
+            self.head = head % self.capacity
+            self.seq = newest + 1
+            # Época atual: último registro cujo início é menor que o anterior
+            prev = None
+            for k in range(self.capacity):
+                start, seq = self._read_key(f, (self.head + k) % self.capacity, buf)
+                if start == _EMPTY:
+                    continue
+                if prev is not None and start + CLOCK_SLACK_S < prev:
+                    self.epoch_seq = seq
+                prev = start
+
+    def reset(self, start):
+        self.start = start
+        acc = self.acc
+        for i in range(0, len(acc), _FIELDS):
+            acc[i + _COUNT] = 0
+            acc[i + _SUM] = 0
+            acc[i + _SUMSQ] = 0
+
+    def add(self, flags, values):
+        acc = self.acc
+        for ch in range(reading.NUM_CHANNELS):
+            if not flags & (1 << ch):
+                continue
+            v = values[ch]
+            i = ch * _FIELDS
+            if acc[i + _COUNT] == 0:
+                acc[i + _MIN] = v
+                acc[i + _MAX] = v
+            elif v < acc[i + _MIN]:
+                acc[i + _MIN] = v
+            elif v > acc[i + _MAX]:
+                acc[i + _MAX] = v
+            acc[i + _COUNT] += 1
+            acc[i + _SUM] += v
+            acc[i + _SUMSQ] += v * v
+
+    def write(self):
+        """Grava o intervalo em aberto no arquivo circular"""
+        acc = self.acc
+        if not any(acc[i] for i in range(_COUNT, len(acc), _FIELDS)):
+            return
+        for i in range(0, len(acc), _FIELDS):
+            if not acc[i + _COUNT]:
+                acc[i + _MIN] = 0
+                acc[i + _MAX] = 0
+        self.file.seek(self.head * RECORD_SIZE)
+        self.file.write(struct.pack(RECORD_FMT, self.start, *acc, self.seq))
+        self.file.flush()
+        self.head = (self.head + 1) % self.capacity
+        self.seq += 1
+        self.last_start = self.start
+
+class RollupEngine:
+    def __init__(self, path="/log", capacities=None, state_file=None):
+        """
+        Args:
+            path: Diretório dos arquivos (o mesmo do log bruto)
+            capacities: Capacidade de cada nível (minuto, hora, dia)
+            state_file: JSON com os intervalos em aberto (gravado a cada minuto fechado)
+        """
+        self.tiers = []
+        for i in range(len(TIERS)):
+            name, period, capacity = TIERS[i]
+            if capacities is not None:
+                capacity = capacities[i]
+            self.tiers.append(_Tier(path, name, period, capacity))
+        self.state_file = state_file or f"{path}/rollup_open.json"
+        self._restore()
+
+    def _restore(self):
+        """Recupera os intervalos em aberto salvos antes do último reset"""
+        state = persist.load(self.state_file, None)
+        if not state:
+            return
+        for tier, saved in zip(self.tiers, state):
+            # Intervalo que já está no arquivo (estado salvo antes do último
+            # fechamento) é descartado; nova época só por recuo visto em add()
+            if saved and (tier.last_start is None or saved[0] > tier.last_start):
+                tier.start = saved[0]
+                tier.acc[:] = saved[1]
+
+    def save_state(self):
+        """Salva os intervalos em aberto na flash"""
+        persist.save(self.state_file, [[t.start, t.acc] if t.start is not None else None
+                                       for t in self.tiers])
+
+    def add(self, timestamp, flags, values):
+        """Acrescenta uma amostra a todos os níveis - O(1) por nível"""
+        closed = False
+        for tier in self.tiers:
+            start = timestamp - timestamp % tier.period
+            if tier.start != start:
+                if tier.start is not None:
+                    tier.write()
+                    closed = True
+                if tier.last_start is not None and start + CLOCK_SLACK_S < tier.last_start:
+                    # Relógio voltou: os agregados anteriores saem das consultas
+                    tier.epoch_seq = tier.seq
+                tier.reset(start)
+            tier.add(flags, values)
+        # Salva a cada intervalo fechado (um por minuto): o estado salvo
+        # nunca fica atrás do que já foi gravado nos arquivos
+        if closed:
+            self.save_state()
+
+    def current(self, tier):
+        """Agregado do intervalo em aberto: (início, [(count, min, max, soma, somaq), ...])"""
+        t = self.tiers[tier]
+        acc = t.acc
+        return t.start, [tuple(acc[i:i + _FIELDS]) for i in range(0, len(acc), _FIELDS)]
+
+    def query(self, tier, t0=0, t1=None, include_open=True):
+        """
+        Gera os agregados de um nível com início em [t0, t1), do mais
+        antigo para o mais novo (ordem de escrita, só da época atual),
+        lendo um registro por vez.
+
+        Yields:
+            (início, c0_count, c0_min, c0_max, c0_sum, c0_sumsq, c1_count, ...)
+        """
+        t = self.tiers[tier]
+        buf = bytearray(RECORD_SIZE)
+        with open(t.file_name, "rb") as f:
+            for k in range(t.capacity):
+                i = (t.head + k) % t.capacity
+                f.seek(i * RECORD_SIZE)
+                f.readinto(buf)
+                rec = struct.unpack(RECORD_FMT, buf)
+                start = rec[0]
+                if start == _EMPTY or rec[-1] < t.epoch_seq or start < t0:
+                    continue
+                if t1 is not None and start >= t1:
+                    break
+                yield rec[:-1]
+        if include_open and t.start is not None and t.start >= t0 and (t1 is None or t.start < t1):
+            yield (t.start,) + tuple(t.acc)
+
+    def close(self):
+        self.save_state()
+        for tier in self.tiers:
+            tier.file.close()
@@ -7,6 +7,7 @@
 import time
 from micropython import const
 import ustruct as struct
+import framebuf
 
 # commands
 ST7789_NOP = const(0x00)
@@ -118,6 +119,9 @@ class ST7789:
         self._ystart = ystart
         self.rotation = rotation
         self.buffer = bytearray(_BUFFER_SIZE * 2)
+        # Buffer de um caractere reaproveitado por text()
+        self._char_buf = bytearray(8)
+        self._char_fb = framebuf.FrameBuffer(self._char_buf, 8, 8, framebuf.MONO_VLSB)
         self.init()
 
     def init(self):
@@ -222,13 +226,11 @@ class ST7789:
 
     def text(self, text, x, y, color, background=BLACK):
         """Draw text at the given position."""
-        import framebuf
         if not 0 <= x < self.width or not 0 <= y < self.height:
             return
         
-        buffer = bytearray(8)
-        
-        framebuf_obj = framebuf.FrameBuffer(buffer, 8, 8, framebuf.MONO_VLSB)
+        buffer = self._char_buf
+        framebuf_obj = self._char_fb
         
         for char in text:
             framebuf_obj.fill(0)
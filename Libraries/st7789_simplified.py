@@ -2,6 +2,106 @@
 import machine
 import time
 
+# Fonte 8x8 (ASCII 32-126), criada uma única vez no import do módulo
+_FONT = (
+    b'\x00\x00\x00\x00\x00\x00\x00\x00', # Space
+    b'\x10\x10\x10\x10\x10\x00\x10\x00', # !
+    b'\x28\x28\x00\x00\x00\x00\x00\x00', # "
+    b'\x28\x28\x7c\x28\x7c\x28\x28\x00', # #
+    b'\x10\x3c\x50\x38\x14\x78\x10\x00', # $
+    b'\x60\x64\x08\x10\x20\x4c\x0c\x00', # %
+    b'\x20\x50\x50\x20\x54\x48\x34\x00', # &
+    b'\x10\x10\x00\x00\x00\x00\x00\x00', # '
+    b'\x08\x10\x20\x20\x20\x10\x08\x00', # (
+    b'\x20\x10\x08\x08\x08\x10\x20\x00', # )
+    b'\x00\x28\x10\x7c\x10\x28\x00\x00', # *
+    b'\x00\x10\x10\x7c\x10\x10\x00\x00', # +
+    b'\x00\x00\x00\x00\x00\x10\x10\x20', # ,
+    b'\x00\x00\x00\x7c\x00\x00\x00\x00', # -
+    b'\x00\x00\x00\x00\x00\x30\x30\x00', # .
+    b'\x00\x04\x08\x10\x20\x40\x00\x00', # /
+    b'\x38\x44\x4c\x54\x64\x44\x38\x00', # 0
+    b'\x10\x30\x10\x10\x10\x10\x38\x00', # 1
+    b'\x38\x44\x04\x08\x10\x20\x7c\x00', # 2
+    b'\x38\x44\x04\x18\x04\x44\x38\x00', # 3
+    b'\x08\x18\x28\x48\x7c\x08\x08\x00', # 4
+    b'\x7c\x40\x78\x04\x04\x44\x38\x00', # 5
+    b'\x18\x20\x40\x78\x44\x44\x38\x00', # 6
+    b'\x7c\x04\x08\x10\x20\x20\x20\x00', # 7
+    b'\x38\x44\x44\x38\x44\x44\x38\x00', # 8
+    b'\x38\x44\x44\x3c\x04\x08\x30\x00', # 9
+    b'\x00\x30\x30\x00\x30\x30\x00\x00', # :
+    b'\x00\x30\x30\x00\x30\x10\x20\x00', # ;
+    b'\x08\x10\x20\x40\x20\x10\x08\x00', # 
+    b'\x00\x00\x7c\x00\x7c\x00\x00\x00', # =
+    b'\x20\x10\x08\x04\x08\x10\x20\x00', # >
+    b'\x38\x44\x04\x08\x10\x00\x10\x00', # ?
+    b'\x38\x44\x5c\x54\x5c\x40\x38\x00', # @
+    b'\x38\x44\x44\x7c\x44\x44\x44\x00', # A
+    b'\x78\x24\x24\x38\x24\x24\x78\x00', # B
+    b'\x38\x44\x40\x40\x40\x44\x38\x00', # C
+    b'\x78\x24\x24\x24\x24\x24\x78\x00', # D
+    b'\x7c\x40\x40\x78\x40\x40\x7c\x00', # E
+    b'\x7c\x40\x40\x78\x40\x40\x40\x00', # F
+    b'\x38\x44\x40\x5c\x44\x44\x3c\x00', # G
+    b'\x44\x44\x44\x7c\x44\x44\x44\x00', # H
+    b'\x38\x10\x10\x10\x10\x10\x38\x00', # I
+    b'\x04\x04\x04\x04\x04\x44\x38\x00', # J
+    b'\x44\x48\x50\x60\x50\x48\x44\x00', # K
+    b'\x40\x40\x40\x40\x40\x40\x7c\x00', # L
+    b'\x44\x6c\x54\x54\x44\x44\x44\x00', # M
+    b'\x44\x64\x64\x54\x4c\x4c\x44\x00', # N
+    b'\x38\x44\x44\x44\x44\x44\x38\x00', # O
+    b'\x78\x44\x44\x78\x40\x40\x40\x00', # P
+    b'\x38\x44\x44\x44\x54\x48\x34\x00', # Q
+    b'\x78\x44\x44\x78\x50\x48\x44\x00', # R
+    b'\x38\x44\x40\x38\x04\x44\x38\x00', # S
+    b'\x7c\x10\x10\x10\x10\x10\x10\x00', # T
+    b'\x44\x44\x44\x44\x44\x44\x38\x00', # U
+    b'\x44\x44\x44\x44\x44\x28\x10\x00', # V
+    b'\x44\x44\x44\x54\x54\x54\x28\x00', # W
+    b'\x44\x44\x28\x10\x28\x44\x44\x00', # X
+    b'\x44\x44\x44\x28\x10\x10\x10\x00', # Y
+    b'\x7c\x04\x08\x10\x20\x40\x7c\x00', # Z
+    b'\x38\x20\x20\x20\x20\x20\x38\x00', # [
+    b'\x00\x40\x20\x10\x08\x04\x00\x00', # \
+    b'\x38\x08\x08\x08\x08\x08\x38\x00', # ]
+    b'\x10\x28\x44\x00\x00\x00\x00\x00', # ^
+    b'\x00\x00\x00\x00\x00\x00\x00\xfc', # _
+    b'\x20\x10\x00\x00\x00\x00\x00\x00', # `
+    b'\x00\x00\x38\x04\x3c\x44\x3c\x00', # a
+    b'\x40\x40\x58\x64\x44\x44\x78\x00', # b
+    b'\x00\x00\x38\x44\x40\x44\x38\x00', # c
+    b'\x04\x04\x34\x4c\x44\x44\x3c\x00', # d
+    b'\x00\x00\x38\x44\x7c\x40\x38\x00', # e
+    b'\x18\x24\x20\x70\x20\x20\x20\x00', # f
+    b'\x00\x00\x3c\x44\x44\x3c\x04\x38', # g
+    b'\x40\x40\x58\x64\x44\x44\x44\x00', # h
+    b'\x10\x00\x30\x10\x10\x10\x38\x00', # i
+    b'\x08\x00\x18\x08\x08\x08\x48\x30', # j
+    b'\x40\x40\x48\x50\x60\x50\x48\x00', # k
+    b'\x30\x10\x10\x10\x10\x10\x38\x00', # l
+    b'\x00\x00\x68\x54\x54\x44\x44\x00', # m
+    b'\x00\x00\x58\x64\x44\x44\x44\x00', # n
+    b'\x00\x00\x38\x44\x44\x44\x38\x00', # o
+    b'\x00\x00\x78\x44\x44\x78\x40\x40', # p
+    b'\x00\x00\x3c\x44\x44\x3c\x04\x04', # q
+    b'\x00\x00\x58\x64\x40\x40\x40\x00', # r
+    b'\x00\x00\x38\x40\x38\x04\x78\x00', # s
+    b'\x20\x20\x70\x20\x20\x24\x18\x00', # t
+    b'\x00\x00\x44\x44\x44\x4c\x34\x00', # u
+    b'\x00\x00\x44\x44\x44\x28\x10\x00', # v
+    b'\x00\x00\x44\x44\x54\x54\x28\x00', # w
+    b'\x00\x00\x44\x28\x10\x28\x44\x00', # x
+    b'\x00\x00\x44\x44\x44\x3c\x04\x38', # y
+    b'\x00\x00\x7c\x08\x10\x20\x7c\x00', # z
+    b'\x08\x10\x10\x20\x10\x10\x08\x00', # {
+    b'\x10\x10\x10\x00\x10\x10\x10\x00', # |
+    b'\x20\x10\x10\x08\x10\x10\x20\x00', # }
+    b'\x00\x00\x24\x48\x00\x00\x00\x00', # ~
+    b'\x00\x00\x00\x00\x00\x00\x00\x00',
+)
+
 class ST7789:
     # Constantes de cores
     BLACK = 0x0000
@@ -203,106 +303,6 @@ class ST7789:
         
     def text(self, text, x, y, color, font_size=1, bg_color=None):
         """Método básico para desenhar texto (caracteres ASCII)"""
-        # Caracteres básicos 8x8
-        from micropython import const
-        _FONT = (
-            b'\x00\x00\x00\x00\x00\x00\x00\x00', # Space
-            b'\x10\x10\x10\x10\x10\x00\x10\x00', # !
-            b'\x28\x28\x00\x00\x00\x00\x00\x00', # "
-            b'\x28\x28\x7c\x28\x7c\x28\x28\x00', # #
-            b'\x10\x3c\x50\x38\x14\x78\x10\x00', # $
-            b'\x60\x64\x08\x10\x20\x4c\x0c\x00', # %
-            b'\x20\x50\x50\x20\x54\x48\x34\x00', # &
-            b'\x10\x10\x00\x00\x00\x00\x00\x00', # '
-            b'\x08\x10\x20\x20\x20\x10\x08\x00', # (
-            b'\x20\x10\x08\x08\x08\x10\x20\x00', # )
-            b'\x00\x28\x10\x7c\x10\x28\x00\x00', # *
-            b'\x00\x10\x10\x7c\x10\x10\x00\x00', # +
-            b'\x00\x00\x00\x00\x00\x10\x10\x20', # ,
-            b'\x00\x00\x00\x7c\x00\x00\x00\x00', # -
-            b'\x00\x00\x00\x00\x00\x30\x30\x00', # .
-            b'\x00\x04\x08\x10\x20\x40\x00\x00', # /
-            b'\x38\x44\x4c\x54\x64\x44\x38\x00', # 0
-            b'\x10\x30\x10\x10\x10\x10\x38\x00', # 1
-            b'\x38\x44\x04\x08\x10\x20\x7c\x00', # 2
-            b'\x38\x44\x04\x18\x04\x44\x38\x00', # 3
-            b'\x08\x18\x28\x48\x7c\x08\x08\x00', # 4
-            b'\x7c\x40\x78\x04\x04\x44\x38\x00', # 5
-            b'\x18\x20\x40\x78\x44\x44\x38\x00', # 6
-            b'\x7c\x04\x08\x10\x20\x20\x20\x00', # 7
-            b'\x38\x44\x44\x38\x44\x44\x38\x00', # 8
-            b'\x38\x44\x44\x3c\x04\x08\x30\x00', # 9
-            b'\x00\x30\x30\x00\x30\x30\x00\x00', # :
-            b'\x00\x30\x30\x00\x30\x10\x20\x00', # ;
-            b'\x08\x10\x20\x40\x20\x10\x08\x00', # 
-            b'\x00\x00\x7c\x00\x7c\x00\x00\x00', # =
-            b'\x20\x10\x08\x04\x08\x10\x20\x00', # >
-            b'\x38\x44\x04\x08\x10\x00\x10\x00', # ?
-            b'\x38\x44\x5c\x54\x5c\x40\x38\x00', # @
-            b'\x38\x44\x44\x7c\x44\x44\x44\x00', # A
-            b'\x78\x24\x24\x38\x24\x24\x78\x00', # B
-            b'\x38\x44\x40\x40\x40\x44\x38\x00', # C
-            b'\x78\x24\x24\x24\x24\x24\x78\x00', # D
-            b'\x7c\x40\x40\x78\x40\x40\x7c\x00', # E
-            b'\x7c\x40\x40\x78\x40\x40\x40\x00', # F
-            b'\x38\x44\x40\x5c\x44\x44\x3c\x00', # G
-            b'\x44\x44\x44\x7c\x44\x44\x44\x00', # H
-            b'\x38\x10\x10\x10\x10\x10\x38\x00', # I
-            b'\x04\x04\x04\x04\x04\x44\x38\x00', # J
-            b'\x44\x48\x50\x60\x50\x48\x44\x00', # K
-            b'\x40\x40\x40\x40\x40\x40\x7c\x00', # L
-            b'\x44\x6c\x54\x54\x44\x44\x44\x00', # M
-            b'\x44\x64\x64\x54\x4c\x4c\x44\x00', # N
-            b'\x38\x44\x44\x44\x44\x44\x38\x00', # O
-            b'\x78\x44\x44\x78\x40\x40\x40\x00', # P
-            b'\x38\x44\x44\x44\x54\x48\x34\x00', # Q
-            b'\x78\x44\x44\x78\x50\x48\x44\x00', # R
-            b'\x38\x44\x40\x38\x04\x44\x38\x00', # S
-            b'\x7c\x10\x10\x10\x10\x10\x10\x00', # T
-            b'\x44\x44\x44\x44\x44\x44\x38\x00', # U
-            b'\x44\x44\x44\x44\x44\x28\x10\x00', # V
-            b'\x44\x44\x44\x54\x54\x54\x28\x00', # W
-            b'\x44\x44\x28\x10\x28\x44\x44\x00', # X
-            b'\x44\x44\x44\x28\x10\x10\x10\x00', # Y
-            b'\x7c\x04\x08\x10\x20\x40\x7c\x00', # Z
-            b'\x38\x20\x20\x20\x20\x20\x38\x00', # [
-            b'\x00\x40\x20\x10\x08\x04\x00\x00', # \
-            b'\x38\x08\x08\x08\x08\x08\x38\x00', # ]
-            b'\x10\x28\x44\x00\x00\x00\x00\x00', # ^
-            b'\x00\x00\x00\x00\x00\x00\x00\xfc', # _
-            b'\x20\x10\x00\x00\x00\x00\x00\x00', # `
-            b'\x00\x00\x38\x04\x3c\x44\x3c\x00', # a
-            b'\x40\x40\x58\x64\x44\x44\x78\x00', # b
-            b'\x00\x00\x38\x44\x40\x44\x38\x00', # c
-            b'\x04\x04\x34\x4c\x44\x44\x3c\x00', # d
-            b'\x00\x00\x38\x44\x7c\x40\x38\x00', # e
-            b'\x18\x24\x20\x70\x20\x20\x20\x00', # f
-            b'\x00\x00\x3c\x44\x44\x3c\x04\x38', # g
-            b'\x40\x40\x58\x64\x44\x44\x44\x00', # h
-            b'\x10\x00\x30\x10\x10\x10\x38\x00', # i
-            b'\x08\x00\x18\x08\x08\x08\x48\x30', # j
-            b'\x40\x40\x48\x50\x60\x50\x48\x00', # k
-            b'\x30\x10\x10\x10\x10\x10\x38\x00', # l
-            b'\x00\x00\x68\x54\x54\x44\x44\x00', # m
-            b'\x00\x00\x58\x64\x44\x44\x44\x00', # n
-            b'\x00\x00\x38\x44\x44\x44\x38\x00', # o
-            b'\x00\x00\x78\x44\x44\x78\x40\x40', # p
-            b'\x00\x00\x3c\x44\x44\x3c\x04\x04', # q
-            b'\x00\x00\x58\x64\x40\x40\x40\x00', # r
-            b'\x00\x00\x38\x40\x38\x04\x78\x00', # s
-            b'\x20\x20\x70\x20\x20\x24\x18\x00', # t
-            b'\x00\x00\x44\x44\x44\x4c\x34\x00', # u
-            b'\x00\x00\x44\x44\x44\x28\x10\x00', # v
-            b'\x00\x00\x44\x44\x54\x54\x28\x00', # w
-            b'\x00\x00\x44\x28\x10\x28\x44\x00', # x
-            b'\x00\x00\x44\x44\x44\x3c\x04\x38', # y
-            b'\x00\x00\x7c\x08\x10\x20\x7c\x00', # z
-            b'\x08\x10\x10\x20\x10\x10\x08\x00', # {
-            b'\x10\x10\x10\x00\x10\x10\x10\x00', # |
-            b'\x20\x10\x10\x08\x10\x10\x20\x00', # }
-            b'\x00\x00\x24\x48\x00\x00\x00\x00', # ~
-            b'\x00\x00\x00\x00\x00\x00\x00\x00',
-        )
         
         x_orig = x
         for char in text:
@@ -0,0 +1,187 @@
+"""
+Supervisor de tarefas baseado no watchdog de hardware (machine.WDT)
+
+Cada tarefa (sensores, display, rede) precisa fazer check-in dentro do
+seu prazo. O watchdog só é alimentado quando todas as tarefas estão
+saudáveis, então tanto uma tarefa atrasada quanto um travamento dentro
+de uma chamada I2C/DHT11 resultam em reset em poucos segundos.
+
+A tarefa em execução fica registrada na memória RTC ("breadcrumb"), que
+sobrevive ao reset do watchdog. No boot seguinte, boot_report() grava a
+causa do reset e a tarefa travada em um arquivo na flash.
+"""
+import time
+import machine
+import persist
+
+# Timeout do watchdog de hardware (ms)
+WDT_TIMEOUT_MS = 6000
+
+# Arquivo com o histórico de resets
+STATE_FILE = "supervisor.json"
+HISTORY_SIZE = 8
+
+# Com condição de despertar, sleep() verifica a condição nesse intervalo
+WAKE_POLL_MS = 250
+
+_RESET_CAUSES = {}
+for _name in ("PWRON_RESET", "HARD_RESET", "WDT_RESET", "DEEPSLEEP_RESET", "SOFT_RESET"):
+    if hasattr(machine, _name):
+        _RESET_CAUSES[getattr(machine, _name)] = _name[:-6]
+
+def reset_cause_name(cause=None):
+    """Retorna o nome da causa do reset (PWRON, WDT, SOFT...)"""
+    if cause is None:
+        cause = machine.reset_cause()
+    return _RESET_CAUSES.get(cause, str(cause))
+
+class Supervisor:
+    def __init__(self, timeout_ms=WDT_TIMEOUT_MS, state_file=STATE_FILE):
+        """
+        Args:
+            timeout_ms: Timeout do watchdog de hardware em ms
+            state_file: Arquivo JSON com o histórico de resets
+        """
+        self.timeout_ms = timeout_ms
+        self.state_file = state_file
+        self._wdt = None
+        # nome -> [prazo_ms, ultimo_checkin_ms]
+        self._tasks = {}
+        self._running = None
+        self.stalled_task = None
+        # Função usada para dormir em sleep() (ex.: Governor.idle)
+        self.sleep_ms = time.sleep_ms
+
+    def add_task(self, name, deadline_ms):
+        """Registra uma tarefa que deve fazer check-in a cada deadline_ms"""
+        self._tasks[name] = [deadline_ms, time.ticks_ms()]
+
+    def remove_task(self, name):
+        """Remove uma tarefa da supervisão"""
+        self._tasks.pop(name, None)
+
+    def start(self):
+        """Liga o watchdog de hardware (não pode ser desligado depois)"""
+        if self._wdt is None:
+            self._wdt = machine.WDT(timeout=self.timeout_ms)
+            print(f"✓ Watchdog ativo ({self.timeout_ms}ms)")
+        now = time.ticks_ms()
+        for task in self._tasks.values():
+            task[1] = now
+
+    def begin(self, name):
+        """Marca o início da execução de uma tarefa (breadcrumb na RTC)"""
+        self._running = name
+        persist.rtc_set("sv_task", name)
+
+    def end(self, name, ok=True):
+        """Marca o fim da execução; ok=True conta como check-in"""
+        if ok:
+            self.checkin(name)
+        self._running = None
+        persist.rtc_set("sv_task", None)
+
+    def checkin(self, name):
+        """Registra que a tarefa está saudável"""
+        task = self._tasks.get(name)
+        if task is not None:
+            task[1] = time.ticks_ms()
+
+    def stalled(self):
+        """Retorna o nome da primeira tarefa fora do prazo, ou None"""
+        now = time.ticks_ms()
+        for name, task in self._tasks.items():
+            if time.ticks_diff(now, task[1]) > task[0]:
+                return name
+        return None
+
+    def feed(self):
+        """Alimenta o watchdog somente se todas as tarefas estão saudáveis"""
+        name = self.stalled()
+        if name is None:
+            if self._wdt is not None:
+                self._wdt.feed()
+            return True
+
+        if name != self.stalled_task:
+            # Registra a tarefa travada antes do watchdog resetar a placa
+            self.stalled_task = name
+            print(f"✗ Tarefa '{name}' fora do prazo - aguardando watchdog")
+            persist.rtc_set("sv_stall", name)
+        return False
+
+    def sleep(self, seconds, wake=None):
+        """
+        Dorme alimentando o watchdog em intervalos menores que o timeout.
+        wake: função verificada a cada WAKE_POLL_MS; True encerra o sono antes
+        """
+        # Conta o tempo real: sleep_ms pode voltar antes (lightsleep acordado)
+        end = time.ticks_add(time.ticks_ms(), int(seconds * 1000))
+        step = self.timeout_ms // 3
+        if wake is not None and step > WAKE_POLL_MS:
+            step = WAKE_POLL_MS
+        while True:
+            self.feed()
+            if wake is not None and wake():
+                break
+            remaining = time.ticks_diff(end, time.ticks_ms())
+            if remaining <= 0:
+                break
+            self.sleep_ms(step if remaining > step else remaining)
+        self.feed()
+
+    async def sleep_async(self, seconds, wake=None):
+        """Como sleep(), mas cedendo o loop de eventos (asyncio)"""
+        try:
+            import asyncio
+        except ImportError:
+            import uasyncio as asyncio
+        end = time.ticks_add(time.ticks_ms(), int(seconds * 1000))
+        step = self.timeout_ms // 3
+        if wake is not None and step > WAKE_POLL_MS:
+            step = WAKE_POLL_MS
+        while True:
+            self.feed()
+            if wake is not None and wake():
+                break
+            remaining = time.ticks_diff(end, time.ticks_ms())
+            if remaining <= 0:
+                break
+            await asyncio.sleep((step if remaining > step else remaining) / 1000)
+        self.feed()
+
+    def reset(self, reason):
+        """Registra o motivo e reinicia a placa imediatamente"""
+        persist.rtc_set("sv_stall", reason)
+        machine.reset()
+
+    def boot_report(self):
+        """
+        Registra a causa do último reset e a tarefa travada (se houver).
+        Deve ser chamado uma vez no início do boot.
+
+        Returns:
+            dict com boots, cause, task e history
+        """
+        cause = reset_cause_name()
+        # Tarefa travada: detectada pelo supervisor ou em execução no reset
+        task = persist.rtc_get("sv_stall") or persist.rtc_get("sv_task")
+        persist.rtc_set("sv_stall", None)
+        persist.rtc_set("sv_task", None)
+
+        state = persist.load(self.state_file, None) or {"boots": 0, "history": []}
+        state["boots"] += 1
+        state["cause"] = cause
+        state["task"] = task
+        if cause != "PWRON" or task:
+            history = state["history"]
+            history.append([time.time(), cause, task])
+            if len(history) > HISTORY_SIZE:
+                del history[0]
+        persist.save(self.state_file, state)
+
+        if task:
+            print(f"Último reset: {cause} (tarefa travada: {task})")
+        else:
+            print(f"Último reset: {cause}")
+        return state
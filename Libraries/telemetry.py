@@ -0,0 +1,87 @@
+"""
+Telemetria binária em quadros pela serial
+
+Substitui os print() do loop por quadros compactos, montados em um
+buffer pré-alocado (sem formatar texto nem criar strings por ciclo):
+
+    0xA5 0x5A | tamanho (uint8) | tipo (uint8) | payload | crc16 (uint16)
+
+O CRC-16/CCITT-FALSE cobre tamanho, tipo e payload. O sincronismo de
+dois bytes + CRC permite que o leitor no computador ignore texto
+misturado na mesma serial (mensagens de boot, REPL) e se ressincronize.
+Decodificador: Host_tools/telemetry_decoder.py
+"""
+import struct
+import sys
+import reading
+from crc16 import crc16
+
+SYNC = b"\xa5\x5a"
+HEADER_SIZE = 4
+CRC_SIZE = 2
+MAX_PAYLOAD = 255
+
+# Tipos de quadro
+TYPE_READING = 1        # Amostra no formato de reading.RECORD_FMT
+TYPE_STATS = 2          # Estatísticas do ciclo (STATS_FMT)
+TYPE_EVENT = 3          # Evento (EVENT_FMT)
+TYPE_TEXT = 4           # Mensagem de texto UTF-8
+
+# ciclo (uint32), leitura dos sensores em ms, display em ms, erros
+# consecutivos (uint16), memória livre em bytes (uint32)
+STATS_FMT = "<IHHHI"
+STATS_SIZE = struct.calcsize(STATS_FMT)
+# código (uint8), argumento (int32)
+EVENT_FMT = "<Bi"
+EVENT_SIZE = struct.calcsize(EVENT_FMT)
+
+# Códigos de evento (em telemetry_events.py, reexportados aqui)
+from telemetry_events import EV_BOOT, EV_SENSOR_FAIL, EV_WIFI_UP, EV_WIFI_DOWN, EV_HISTORY_ERROR, EV_SHUTDOWN
+
+def _default_stream():
+    return getattr(sys.stdout, "buffer", sys.stdout)
+
+class Telemetry:
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream: Objeto com write(bytes) (UART ou sys.stdout.buffer)
+        """
+        self.stream = stream if stream is not None else _default_stream()
+        self._buf = bytearray(HEADER_SIZE + MAX_PAYLOAD + CRC_SIZE)
+        self._buf[0:2] = SYNC
+        self._mv = memoryview(self._buf)
+        self.frames = 0
+
+    def _send(self, frame_type, size):
+        """Completa o cabeçalho e o CRC de um payload já gravado no buffer"""
+        buf = self._buf
+        buf[2] = size
+        buf[3] = frame_type
+        end = HEADER_SIZE + size
+        struct.pack_into("<H", buf, end, crc16(buf, 2, end))
+        self.stream.write(self._mv[:end + CRC_SIZE])
+        self.frames += 1
+
+    def reading(self, timestamp, flags, values):
+        """Envia uma amostra"""
+        reading.pack_into(self._buf, HEADER_SIZE, timestamp, flags, values)
+        self._send(TYPE_READING, reading.RECORD_SIZE)
+
+    def stats(self, cycle, sensor_ms, display_ms, errors, mem_free):
+        """Envia as estatísticas de um ciclo"""
+        struct.pack_into(STATS_FMT, self._buf, HEADER_SIZE, cycle,
+                         min(sensor_ms, 0xFFFF), min(display_ms, 0xFFFF),
+                         min(errors, 0xFFFF), mem_free)
+        self._send(TYPE_STATS, STATS_SIZE)
+
+    def event(self, code, arg=0):
+        """Envia um evento"""
+        struct.pack_into(EVENT_FMT, self._buf, HEADER_SIZE, code, arg)
+        self._send(TYPE_EVENT, EVENT_SIZE)
+
+    def text(self, message):
+        """Envia uma mensagem de texto (truncada em MAX_PAYLOAD bytes)"""
+        data = message.encode()[:MAX_PAYLOAD]
+        self._buf[HEADER_SIZE:HEADER_SIZE + len(data)] = data
+        self._send(TYPE_TEXT, len(data))
@@ -0,0 +1,12 @@
+"""
+Códigos de evento da telemetria (quadros TYPE_EVENT de telemetry.py)
+
+Separados do telemetry.py para que o display_data os use sem carregar
+o módulo (e a tabela do CRC) com ENABLE_TELEMETRY = False.
+"""
+EV_BOOT = 1             # arg = número do boot
+EV_SENSOR_FAIL = 2      # arg = erros consecutivos
+EV_WIFI_UP = 3
+EV_WIFI_DOWN = 4
+EV_HISTORY_ERROR = 5
+EV_SHUTDOWN = 6
@@ -0,0 +1,128 @@
+"""
+Codec compacto para as séries temporais da estação
+
+Formato de um bloco:
+    cabeçalho: b"TS" | versão (1 byte) | número de canais (1 byte)
+    registros: sequência de varints, NUM_CHANNELS + 2 por registro
+
+- timestamp: delta-of-delta em zigzag varint (amostras regulares
+  custam 1 byte); o primeiro registro guarda o timestamp absoluto
+- flags: XOR com as flags anteriores (normalmente 0 = 1 byte)
+- canais: delta do valor em ponto fixo (0.01 °C, 1 Pa, ...) em zigzag
+  varint; o primeiro registro guarda o delta em relação a zero
+
+A decodificação é feita em streaming: decode() é um gerador que produz
+um registro por vez, sem montar a série inteira na memória.
+"""
+import reading
+
+MAGIC = b"TS"
+VERSION = 1
+HEADER_SIZE = 4
+
+def zigzag(n):
+    """Mapeia inteiros com sinal para sem sinal (0, -1, 1, -2 -> 0, 1, 2, 3)"""
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+def unzigzag(n):
+    return (n >> 1) ^ -(n & 1)
+
+def write_varint(out, n):
+    """Acrescenta um inteiro sem sinal em varint (7 bits por byte) a out"""
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def read_varint(buf, pos):
+    """Lê um varint de buf a partir de pos, retorna (valor, nova posição)"""
+    result = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+class Encoder:
+    def __init__(self, channels=reading.NUM_CHANNELS, out=None):
+        """
+        Args:
+            channels: Número de canais por registro
+            out: bytearray de saída (um novo é criado se None)
+        """
+        self.channels = channels
+        self.out = bytearray() if out is None else out
+        self.out.extend(MAGIC)
+        self.out.append(VERSION)
+        self.out.append(channels)
+        self.count = 0
+        self._ts = 0
+        self._delta = 0
+        self._flags = 0
+        self._values = [0] * channels
+
+    def add(self, timestamp, flags, values):
+        """Codifica um registro"""
+        out = self.out
+        if self.count == 0:
+            write_varint(out, timestamp)
+        else:
+            delta = timestamp - self._ts
+            write_varint(out, zigzag(delta - self._delta))
+            self._delta = delta
+        self._ts = timestamp
+
+        write_varint(out, flags ^ self._flags)
+        self._flags = flags
+
+        prev = self._values
+        for ch in range(self.channels):
+            v = values[ch]
+            write_varint(out, zigzag(v - prev[ch]))
+            prev[ch] = v
+        self.count += 1
+
+    def getvalue(self):
+        return self.out
+
+def encode(records, channels=reading.NUM_CHANNELS):
+    """Codifica uma sequência de (timestamp, flags, c0, c1, ...)"""
+    enc = Encoder(channels)
+    for rec in records:
+        enc.add(rec[0], rec[1], rec[2:])
+    return enc.getvalue()
+
+def decode(buf):
+    """
+    Gera os registros de um bloco codificado.
+
+    Yields:
+        (timestamp, flags, c0, c1, ...)
+    """
+    if buf[0:2] != MAGIC or buf[2] != VERSION:
+        raise ValueError("bloco TS inválido")
+    channels = buf[3]
+    pos = HEADER_SIZE
+    end = len(buf)
+    ts = 0
+    delta = 0
+    flags = 0
+    values = [0] * channels
+    first = True
+    while pos < end:
+        n, pos = read_varint(buf, pos)
+        if first:
+            ts = n
+            first = False
+        else:
+            delta += unzigzag(n)
+            ts += delta
+        n, pos = read_varint(buf, pos)
+        flags ^= n
+        for ch in range(channels):
+            n, pos = read_varint(buf, pos)
+            values[ch] += unzigzag(n)
+        yield (ts, flags) + tuple(values)
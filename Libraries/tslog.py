@@ -0,0 +1,351 @@
+"""
+Log circular de séries temporais na flash do ESP32
+
+As leituras são gravadas como registros binários de 32 bytes em
+arquivos de segmento pré-alocados, usados como um log circular:
+
+    timestamp (uint32) | flags (uint16) | 5 canais (int32) | seq (uint32) | crc16
+
+- Escrita somente por acréscimo: um registro nunca é reescrito até que
+  o segmento inteiro seja reciclado, o mais antigo primeiro.
+- As escritas são agrupadas em blocos que dividem a página da flash
+  (4096 bytes), então nenhuma escrita cruza o limite de uma página.
+- Os segmentos são usados em rodízio, espalhando o desgaste.
+- Não há arquivo de índice: a posição de escrita é recuperada no boot
+  pelo número de sequência e CRC de cada registro.
+- Um índice esparso em RAM guarda o timestamp e o seq do primeiro
+  registro de cada página. Consultas por intervalo fazem uma busca
+  binária nas páginas e depois uma leitura sequencial limitada, com
+  memória constante independente do tamanho do histórico.
+- As consultas supõem timestamps crescentes. Se o relógio volta (boot
+  sem hora sincronizada, quando time.time() recomeça perto de 2000),
+  append() fecha o segmento e abre uma nova época; as consultas só
+  enxergam a época atual. No boot a época é recuperada pelo índice: a
+  última página cujo timestamp é menor que o da página anterior.
+"""
+import os
+import struct
+from array import array
+import reading
+from crc16 import crc16
+
+LOG_RECORD_FMT = "<IH5iIH"
+LOG_RECORD_SIZE = 32
+FLASH_PAGE_SIZE = 4096
+RECORDS_PER_PAGE = FLASH_PAGE_SIZE // LOG_RECORD_SIZE
+_SEQ_OFFSET = 26
+_CRC_OFFSET = 30
+_EMPTY = 0xFFFFFFFF
+CLOCK_SLACK_S = 60          # Recuos menores (correção do NTP) não abrem época
+
+def pack_record(buf, offset, seq, timestamp, flags, values):
+    """Escreve um registro de log (com seq e CRC) em buf"""
+    reading.pack_into(buf, offset, timestamp, flags, values)
+    struct.pack_into("<I", buf, offset + _SEQ_OFFSET, seq)
+    crc = crc16(buf, offset, offset + _CRC_OFFSET)
+    struct.pack_into("<H", buf, offset + _CRC_OFFSET, crc)
+
+def record_seq(buf, offset=0):
+    """Retorna o seq do registro em buf, ou None se o CRC não confere"""
+    crc = struct.unpack_from("<H", buf, offset + _CRC_OFFSET)[0]
+    if crc != crc16(buf, offset, offset + _CRC_OFFSET):
+        return None
+    return struct.unpack_from("<I", buf, offset + _SEQ_OFFSET)[0]
+
+class TimeSeriesLog:
+    def __init__(self, path="/log", segments=12, segment_size=32768, flush_records=8):
+        """
+        Args:
+            path: Diretório dos arquivos de segmento
+            segments: Número de segmentos do log circular
+            segment_size: Tamanho de cada segmento em bytes (múltiplo da página)
+            flush_records: Registros acumulados em RAM antes de gravar na flash
+        """
+        if segment_size % FLASH_PAGE_SIZE:
+            raise ValueError("segment_size deve ser múltiplo de 4096")
+        if FLASH_PAGE_SIZE % (flush_records * LOG_RECORD_SIZE):
+            raise ValueError("flush_records * 32 deve dividir 4096")
+        self.path = path
+        self.segments = segments
+        self.segment_size = segment_size
+        self.records_per_segment = segment_size // LOG_RECORD_SIZE
+        self.pages_per_segment = segment_size // FLASH_PAGE_SIZE
+        self.flush_records = flush_records
+
+        # Índice esparso: timestamp e seq do primeiro registro de cada página
+        pages = segments * self.pages_per_segment
+        self._index_ts = array('I', [_EMPTY] * pages)
+        self._index_seq = array('I', [0] * pages)
+
+        self._pending = bytearray(flush_records * LOG_RECORD_SIZE)
+        self._pending_count = 0
+        self._rec = bytearray(LOG_RECORD_SIZE)
+        self._file = None
+
+        self.head_seg = 0       # Segmento em escrita
+        self.head_idx = 0       # Próximo registro no segmento
+        self.next_seq = 0       # Seq do próximo registro
+        self.epoch_seq = 0      # Seq do primeiro registro da época atual
+        self.last_ts = 0        # Timestamp do último registro
+        self.appended = 0
+        self.epochs = 0         # Recuos do relógio desde o boot
+
+        self._prepare()
+        self._recover()
+        self._build_index()
+        self._find_epoch()
+        self._open_head()
+
+    def _segment_path(self, seg):
+        return f"{self.path}/seg{seg:02d}.bin"
+
+    def _prepare(self):
+        """Cria o diretório e pré-aloca os segmentos (preenchidos com 0xFF)"""
+        try:
+            os.mkdir(self.path)
+        except OSError:
+            pass
+        blank = b"\xff" * 512
+        for seg in range(self.segments):
+            name = self._segment_path(seg)
+            try:
+                if os.stat(name)[6] == self.segment_size:
+                    continue
+            except OSError:
+                pass
+            print(f"Criando segmento {name}")
+            with open(name, "wb") as f:
+                for _ in range(self.segment_size // 512):
+                    f.write(blank)
+
+    def _read_seq(self, f, idx):
+        f.seek(idx * LOG_RECORD_SIZE)
+        f.readinto(self._rec)
+        return record_seq(self._rec)
+
+    def _recover(self):
+        """Encontra o segmento mais novo e a posição de escrita"""
+        newest = None
+        newest_seq = -1
+        for seg in range(self.segments):
+            with open(self._segment_path(seg), "rb") as f:
+                seq = self._read_seq(f, 0)
+            if seq is not None and seq > newest_seq:
+                newest, newest_seq = seg, seq
+        if newest is None:
+            return
+
+        # Busca binária pelo último registro com seq == seq0 + índice
+        with open(self._segment_path(newest), "rb") as f:
+            lo, hi = 0, self.records_per_segment - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if self._read_seq(f, mid) == newest_seq + mid:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            self._read_seq(f, lo)
+        self.last_ts = struct.unpack_from("<I", self._rec)[0]
+        self.head_seg = newest
+        self.head_idx = lo + 1
+        self.next_seq = newest_seq + lo + 1
+        print(f"Log recuperado: seg {newest}, registro {self.head_idx}, seq {self.next_seq}")
+
+    def _build_index(self):
+        """Lê o primeiro registro de cada página válida para montar o índice"""
+        ppp = self.pages_per_segment
+        for seg in range(self.segments):
+            with open(self._segment_path(seg), "rb") as f:
+                seq0 = self._read_seq(f, 0)
+                if seq0 is None:
+                    continue
+                for page in range(ppp):
+                    idx = page * RECORDS_PER_PAGE
+                    if page and self._read_seq(f, idx) != seq0 + idx:
+                        break
+                    self._index_ts[seg * ppp + page] = struct.unpack_from("<I", self._rec)[0]
+                    self._index_seq[seg * ppp + page] = seq0 + idx
+
+    def _find_epoch(self):
+        """Início da época atual: última página onde o relógio voltou"""
+        prev = None
+        for k in range(len(self._index_ts)):
+            page = self._page(k)
+            ts = self._index_ts[page]
+            if ts == _EMPTY:
+                continue
+            if prev is not None and ts + CLOCK_SLACK_S < prev:
+                self.epoch_seq = self._index_seq[page]
+            prev = ts
+        if self.epoch_seq:
+            print(f"Log: época atual desde o seq {self.epoch_seq}")
+
+    def _open_head(self):
+        if self.head_idx >= self.records_per_segment:
+            self._rotate()
+            return
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._segment_path(self.head_seg), "r+b")
+
+    def _rotate(self):
+        """Passa para o próximo segmento, reciclando o mais antigo"""
+        self.head_seg = (self.head_seg + 1) % self.segments
+        self.head_idx = 0
+        # As páginas do segmento reciclado saem do índice
+        ppp = self.pages_per_segment
+        for i in range(self.head_seg * ppp, (self.head_seg + 1) * ppp):
+            self._index_ts[i] = _EMPTY
+        self._open_head()
+
+    def _new_epoch(self, timestamp):
+        """Relógio voltou: a nova época começa num segmento novo"""
+        print(f"Log: relógio voltou ({self.last_ts} -> {timestamp}), nova época no seq {self.next_seq}")
+        self.flush()
+        if self.head_idx:
+            self._rotate()
+        self.epoch_seq = self.next_seq
+        self.epochs += 1
+
+    def append(self, timestamp, flags, values):
+        """Acrescenta uma amostra ao log"""
+        if timestamp + CLOCK_SLACK_S < self.last_ts:
+            self._new_epoch(timestamp)
+        self.last_ts = timestamp
+        idx = self.head_idx + self._pending_count
+        if idx % RECORDS_PER_PAGE == 0:
+            page = self.head_seg * self.pages_per_segment + idx // RECORDS_PER_PAGE
+            self._index_ts[page] = timestamp
+            self._index_seq[page] = self.next_seq
+        pack_record(self._pending, self._pending_count * LOG_RECORD_SIZE,
+                    self.next_seq, timestamp, flags, values)
+        self.next_seq += 1
+        self._pending_count += 1
+        self.appended += 1
+        # Grava ao completar um bloco alinhado, mesmo após um flush()
+        # parcial, para que nenhuma escrita cruze a página ou o segmento
+        if (self.head_idx + self._pending_count) % self.flush_records == 0:
+            self.flush()
+
+    def flush(self):
+        """Grava na flash os registros acumulados em RAM"""
+        count = self._pending_count
+        if not count:
+            return
+        # Os registros pendentes nunca cruzam o fim do segmento, pois
+        # append() grava ao atingir cada múltiplo de flush_records
+        self._file.seek(self.head_idx * LOG_RECORD_SIZE)
+        self._file.write(memoryview(self._pending)[:count * LOG_RECORD_SIZE])
+        self._file.flush()
+        self._pending_count = 0
+        self.head_idx += count
+        if self.head_idx >= self.records_per_segment:
+            self._rotate()
+
+    def segment_order(self):
+        """Segmentos do mais antigo para o mais novo"""
+        for i in range(1, self.segments + 1):
+            yield (self.head_seg + i) % self.segments
+
+    def _page(self, k):
+        """Posição no índice da k-ésima página, da mais antiga para a mais nova"""
+        ppp = self.pages_per_segment
+        seg = (self.head_seg + 1 + k // ppp) % self.segments
+        return seg * ppp + k % ppp
+
+    def query(self, t0=0, t1=None, chunk_records=16):
+        """
+        Gera as amostras com timestamp em [t0, t1), da mais antiga para a
+        mais nova, só da época atual do relógio. Busca binária no índice
+        esparso + leitura sequencial em blocos de chunk_records registros.
+
+        Yields:
+            (seq, timestamp, flags, c0, c1, c2, c3, c4)
+        """
+        index = self._index_ts
+        seqs = self._index_seq
+        epoch = self.epoch_seq
+        total = len(index)
+        lo = 0
+        while lo < total and (index[self._page(lo)] == _EMPTY or seqs[self._page(lo)] < epoch):
+            lo += 1
+        hi = total - 1
+        while hi >= lo and index[self._page(hi)] == _EMPTY:
+            hi -= 1
+
+        last_seq = -1
+        if lo <= hi:
+            # Última página que começa em ou antes de t0
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if index[self._page(mid)] <= t0:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            for rec in self._read_from(self._page(lo), t0, t1, chunk_records):
+                if rec is None:
+                    return
+                last_seq = rec[0]
+                yield rec
+
+        # Amostras ainda em RAM (não gravadas na flash)
+        for i in range(self._pending_count):
+            offset = i * LOG_RECORD_SIZE
+            seq = struct.unpack_from("<I", self._pending, offset + _SEQ_OFFSET)[0]
+            rec = reading.unpack_from(self._pending, offset)
+            if seq <= last_seq or rec[0] < t0:
+                continue
+            if t1 is not None and rec[0] >= t1:
+                return
+            yield (seq,) + rec
+
+    def _read_from(self, page, t0, t1, chunk_records):
+        """Leitura sequencial a partir de uma página; produz None ao passar de t1"""
+        ppp = self.pages_per_segment
+        seg = page // ppp
+        idx = (page % ppp) * RECORDS_PER_PAGE
+        expected = self._index_seq[page]
+        buf = bytearray(chunk_records * LOG_RECORD_SIZE)
+        for _ in range(self.segments + 1):
+            with open(self._segment_path(seg), "rb") as f:
+                while idx < self.records_per_segment:
+                    if seg == self.head_seg and idx >= self.head_idx:
+                        return
+                    f.seek(idx * LOG_RECORD_SIZE)
+                    n = f.readinto(buf) // LOG_RECORD_SIZE
+                    for i in range(n):
+                        offset = i * LOG_RECORD_SIZE
+                        if record_seq(buf, offset) != expected:
+                            return
+                        expected += 1
+                        rec = reading.unpack_from(buf, offset)
+                        if rec[0] < t0:
+                            continue
+                        if t1 is not None and rec[0] >= t1:
+                            yield None
+                            return
+                        yield (expected - 1,) + rec
+                    idx += n
+            if seg == self.head_seg:
+                return
+            seg = (seg + 1) % self.segments
+            idx = 0
+
+    def scan(self, chunk_records=16):
+        """Gera todas as amostras da época atual, da mais antiga para a mais nova"""
+        return self.query(0, None, chunk_records)
+
+    def last(self, seconds, now):
+        """Amostras dos últimos `seconds` segundos até `now`"""
+        return self.query(now - seconds, None)
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def usage(self):
+        """Retorna (registros gravados, capacidade em registros)"""
+        capacity = self.segments * self.records_per_segment
+        return min(self.next_seq, capacity), capacity
@@ -0,0 +1,357 @@
+"""
+Servidor HTTP assíncrono (asyncio) da estação meteorológica
+
+Roda no mesmo loop de eventos que a leitura dos sensores:
+- "/" serve o painel pré-renderizado e guardado como bytes, com ETag/304
+- "/api/latest" serve a última leitura em JSON. A resposta completa
+  (cabeçalho + corpo) é montada uma vez por amostra em publish() e
+  reenviada a todos os clientes, sem criar objetos por requisição.
+- "/events" transmite cada nova leitura por Server-Sent Events. O evento
+  é codificado uma única vez em publish() e o mesmo buffer é enviado a
+  todos os assinantes; clientes lentos são desconectados em vez de
+  acumular dados na RAM. Transições de alertas (alert()) vão como
+  eventos "alert" no mesmo buffer da leitura seguinte.
+- Conexões keep-alive, número máximo de clientes simultâneos e timeout
+  de inatividade, para que vários celulares não atrasem os sensores.
+- A montagem das respostas roda dentro de `burst()` (a estação atribui
+  governor.burst); nunca há await dentro de uma rajada, então a espera
+  pelos sockets fica na frequência baixa.
+
+Funciona também no CPython (asyncio padrão), o que permite testar o
+servidor no Linux.
+"""
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+import time
+import reading
+from crc16 import crc16
+
+# Timestamps do MicroPython no ESP32 contam a partir de 2000-01-01
+UNIX_EPOCH_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
+
+MAX_HEADER_LINES = 24
+
+_STATUS = {
+    200: b"200 OK",
+    304: b"304 Not Modified",
+    400: b"400 Bad Request",
+    404: b"404 Not Found",
+    405: b"405 Method Not Allowed",
+    503: b"503 Service Unavailable",
+}
+
+class _NoBurst:
+    """Rajada nula (sem governador de frequência)"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+def build_response(status, body=b"", content_type=b"text/plain", extra=b""):
+    """Monta uma resposta HTTP completa em bytes"""
+    head = b"HTTP/1.1 " + _STATUS[status] + b"\r\nContent-Type: " + content_type + b"\r\n"
+    if status != 304:
+        head += b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+    return head + extra + b"\r\n" + body
+
+_NOT_FOUND = build_response(404, b"nao encontrado\n")
+_NOT_ALLOWED = build_response(405, b"metodo nao suportado\n")
+_BUSY = build_response(503, b"ocupado\n", extra=b"Connection: close\r\nRetry-After: 5\r\n")
+_NO_DATA = build_response(503, b"sem dados\n", extra=b"Retry-After: 5\r\n")
+_STREAM_HEAD = (b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\n\r\nretry: 5000\n\n")
+_PING = b": ping\n\n"
+BAD_REQUEST = build_response(400, b"parametro invalido\n")
+
+async def start_chunked(writer, request, content_type):
+    """Envia o cabeçalho de uma resposta com Transfer-Encoding: chunked"""
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: " + content_type +
+                 b"\r\nTransfer-Encoding: chunked\r\nCache-Control: no-cache\r\n\r\n")
+    await writer.drain()
+    return request.method != b"HEAD"
+
+async def write_chunk(writer, data):
+    """Envia um bloco (bytes ou memoryview) da resposta chunked"""
+    if not len(data):
+        return
+    writer.write(("%x\r\n" % len(data)).encode())
+    writer.write(data)
+    writer.write(b"\r\n")
+    await writer.drain()
+
+async def end_chunked(writer):
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+class Request:
+    """Requisição em análise (um objeto reaproveitado por conexão)"""
+    def __init__(self):
+        self.method = b""
+        self.path = b""
+        self.query = b""
+        self.etag = None
+        self.keep_alive = True
+
+    def parse_line(self, line):
+        parts = line.split()
+        if len(parts) < 3:
+            return False
+        self.method = parts[0]
+        target = parts[1]
+        q = target.find(b"?")
+        if q >= 0:
+            self.path, self.query = target[:q], target[q + 1:]
+        else:
+            self.path, self.query = target, b""
+        self.etag = None
+        self.keep_alive = parts[2] == b"HTTP/1.1"
+        return True
+
+    def parse_header(self, line):
+        colon = line.find(b":")
+        if colon < 0:
+            return
+        name = line[:colon].strip().lower()
+        if name == b"if-none-match":
+            self.etag = line[colon + 1:].strip()
+        elif name == b"connection":
+            value = line[colon + 1:].strip().lower()
+            if value == b"close":
+                self.keep_alive = False
+            elif value == b"keep-alive":
+                self.keep_alive = True
+
+    def param(self, name, default=None):
+        """Valor de um parâmetro da query string (bytes)"""
+        for item in self.query.split(b"&"):
+            if item.startswith(name + b"="):
+                return item[len(name) + 1:]
+        return default
+
+class WebServer:
+    def __init__(self, port=80, max_clients=4, keepalive_s=10, max_requests=100,
+                 max_streams=2, drain_s=3, ping_s=30):
+        """
+        Args:
+            port: Porta TCP
+            max_clients: Conexões simultâneas (as excedentes recebem 503)
+            keepalive_s: Tempo máximo de espera por uma nova requisição
+            max_requests: Requisições por conexão antes de fechá-la
+            max_streams: Assinantes de /events simultâneos (dentro de max_clients)
+            drain_s: Tempo máximo para um assinante receber um evento
+            ping_s: Intervalo do comentário de keep-alive sem novas leituras
+        """
+        self.port = port
+        self.max_clients = max_clients
+        self.keepalive_s = keepalive_s
+        self.max_requests = max_requests
+        self.max_streams = max_streams
+        self.drain_s = drain_s
+        self.ping_s = ping_s
+        self.clients = 0
+        self.streams = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.rejected = 0
+        self.events_sent = 0
+        self.dropped = 0
+        self._server = None
+        # caminho -> (resposta completa, resposta 304, etag)
+        self._pages = {}
+        # caminho -> corrotina handler(server, request, writer)
+        self.routes = {b"/events": WebServer._stream}
+        self._latest = None
+        self._latest_304 = None
+        self._latest_etag = None
+        # Evento SSE da última leitura; o Event é trocado a cada publish()
+        self._event = None
+        self._event_ready = asyncio.Event()
+        self._alerts = []
+        # Context manager de rajada de CPU (ex.: governor.burst)
+        self.burst = _NoBurst
+
+    def add_page(self, path, body, content_type=b"text/html; charset=utf-8"):
+        """Registra uma página estática, pré-renderizada com ETag"""
+        etag = ('"%04x-%d"' % (crc16(body), len(body))).encode()
+        headers = b"ETag: " + etag + b"\r\nCache-Control: no-cache\r\n"
+        self._pages[path] = (build_response(200, body, content_type, headers),
+                             build_response(304, b"", content_type, headers),
+                             etag)
+
+    def publish(self, timestamp, flags, values, extra=None):
+        """
+        Monta a resposta de /api/latest para uma nova amostra.
+
+        Args:
+            timestamp: Timestamp da amostra (relógio do dispositivo)
+            flags, values: Amostra no formato de reading.py
+            extra: dict opcional de campos adicionais (str ou número)
+        """
+        with self.burst():
+            self._publish(timestamp, flags, values, extra)
+
+    def _publish(self, timestamp, flags, values, extra):
+        ts = timestamp + UNIX_EPOCH_OFFSET
+        parts = ['{"ts":%d,"flags":%d' % (ts, flags)]
+        for ch in range(reading.NUM_CHANNELS):
+            if flags & (1 << ch):
+                scale = reading.CHANNEL_SCALES[ch]
+                if scale == 1:
+                    parts.append(',"%s":%d' % (reading.CHANNEL_KEYS[ch], values[ch]))
+                else:
+                    parts.append(',"%s":%.2f' % (reading.CHANNEL_KEYS[ch], values[ch] / scale))
+        if extra:
+            for key, value in extra.items():
+                if isinstance(value, str):
+                    parts.append(',"%s":"%s"' % (key, value))
+                else:
+                    parts.append(',"%s":%s' % (key, value))
+        parts.append("}")
+        body = "".join(parts).encode()
+        etag = ('"%d"' % ts).encode()
+        headers = b"ETag: " + etag + b"\r\nCache-Control: no-cache\r\n"
+        self._latest = build_response(200, body, b"application/json", headers)
+        self._latest_304 = build_response(304, b"", b"application/json", headers)
+        self._latest_etag = etag
+
+        # Evento SSE: mesmo JSON, um único buffer para todos os assinantes
+        self._event = b"id: " + str(ts).encode() + b"\ndata: " + body + b"\n\n"
+        if self._alerts:
+            self._event = b"".join(self._alerts) + self._event
+            self._alerts = []
+        ready, self._event_ready = self._event_ready, asyncio.Event()
+        ready.set()
+
+    def alert(self, payload):
+        """Transição de alerta (JSON em bytes) para /events, junto com a próxima leitura"""
+        self._alerts.append(b"event: alert\ndata: " + payload + b"\n\n")
+
+    async def start(self, host="0.0.0.0"):
+        """Abre o socket e começa a aceitar conexões"""
+        self._server = await asyncio.start_server(self._handle, host, self.port)
+        print(f"✓ Servidor HTTP na porta {self.port}")
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        if self.clients >= self.max_clients:
+            self.rejected += 1
+            try:
+                writer.write(_BUSY)
+                await writer.drain()
+            except Exception:
+                pass
+            await self._close(writer)
+            return
+
+        self.clients += 1
+        request = Request()
+        try:
+            for _ in range(self.max_requests):
+                line = await asyncio.wait_for(reader.readline(), self.keepalive_s)
+                if not line or not request.parse_line(line):
+                    break
+                for _ in range(MAX_HEADER_LINES):
+                    header = await asyncio.wait_for(reader.readline(), self.keepalive_s)
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    request.parse_header(header)
+                else:
+                    break
+
+                self.requests += 1
+                keep = await self._dispatch(request, writer)
+                if not (keep and request.keep_alive):
+                    break
+        except (asyncio.TimeoutError, OSError):
+            pass
+        except Exception as e:
+            print(f"Erro HTTP: {e}")
+        finally:
+            self.clients -= 1
+            await self._close(writer)
+
+    async def _dispatch(self, request, writer):
+        """Responde a uma requisição. Retorna False para fechar a conexão"""
+        if request.method not in (b"GET", b"HEAD"):
+            await self._send(writer, request, _NOT_ALLOWED)
+            return True
+
+        path = request.path
+        handler = self.routes.get(path)
+        if handler is not None:
+            return await handler(self, request, writer)
+
+        if path == b"/api/latest":
+            if self._latest is None:
+                response = _NO_DATA
+            elif request.etag == self._latest_etag:
+                self.not_modified += 1
+                response = self._latest_304
+            else:
+                response = self._latest
+        else:
+            page = self._pages.get(path)
+            if page is None:
+                response = _NOT_FOUND
+            elif request.etag == page[2]:
+                self.not_modified += 1
+                response = page[1]
+            else:
+                response = page[0]
+        await self._send(writer, request, response)
+        return True
+
+    async def _stream(self, request, writer):
+        """Transmite as leituras por Server-Sent Events até o cliente sair"""
+        if self.streams >= self.max_streams:
+            self.rejected += 1
+            await self._send(writer, request, _BUSY)
+            return False
+        writer.write(_STREAM_HEAD)
+        await writer.drain()
+        if request.method == b"HEAD":
+            return False
+
+        self.streams += 1
+        try:
+            event = self._event
+            while True:
+                if event is not None:
+                    writer.write(event)
+                    # Cliente lento: desconecta em vez de acumular eventos
+                    try:
+                        await asyncio.wait_for(writer.drain(), self.drain_s)
+                    except asyncio.TimeoutError:
+                        self.dropped += 1
+                        return False
+                    if event is not _PING:
+                        self.events_sent += 1
+                ready = self._event_ready
+                try:
+                    await asyncio.wait_for(ready.wait(), self.ping_s)
+                    event = self._event
+                except asyncio.TimeoutError:
+                    event = _PING
+        finally:
+            self.streams -= 1
+
+    async def _send(self, writer, request, response):
+        if request.method == b"HEAD":
+            end = response.find(b"\r\n\r\n")
+            response = response[:end + 4]
+        writer.write(response)
+        await writer.drain()
+
+    async def _close(self, writer):
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except Exception:
+            pass
@@ -0,0 +1,9 @@
+"""
+Simulador do hardware da estação para rodar o firmware no CPython
+
+- clock: relógio virtual (ticks, sleep, Timers, watchdog)
+- models: clima, BMP280 em nível de registradores, DHT11, sensor de chuva
+- board: placa com os dispositivos e contadores; install() ativa os
+  módulos simulados do MicroPython em Simulator/mpy
+- run: roda o main() do Display_data/display_data.py
+"""
@@ -0,0 +1,97 @@
+"""
+Placa ESP32 simulada: relógio, dispositivos ligados aos pinos e contadores
+
+Os módulos em Simulator/mpy (machine, dht, micropython, utime, network,
+esp32) consultam a placa instalada em `current`. install() coloca esses
+módulos no caminho de import e troca o `time` pelo relógio virtual.
+"""
+import gc
+import os
+import random
+import sys
+
+from Simulator.clock import VirtualClock
+
+# Constantes de machine.reset_cause() no ESP32
+PWRON_RESET = 1
+HARD_RESET = 2
+WDT_RESET = 3
+DEEPSLEEP_RESET = 4
+SOFT_RESET = 5
+
+HEAP_SIZE = 111168              # Heap típico do MicroPython no ESP32 sem PSRAM
+
+MPY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mpy")
+
+# Placa em uso pelos módulos simulados
+current = None
+
+class Board:
+    def __init__(self, clock=None, seed=1):
+        """
+        Args:
+            clock: VirtualClock (um novo se None)
+            seed: Semente do gerador usado pelos modelos de falha
+        """
+        self.clock = clock or VirtualClock()
+        self.rng = random.Random(seed)
+        self.i2c_devices = {}       # endereço -> modelo (read/write de registradores)
+        self.dht = {}               # pino -> DHT11Model
+        self.adc = {}               # pino -> modelo com read()
+        self.levels = {}            # pino -> nível lógico
+        self.irqs = {}              # pino -> (handler, trigger, Pin)
+        self.rtc_memory = b""
+        self.reset_cause = PWRON_RESET
+        self.cpu_freq = 160000000
+        self.wakeup = None          # Configuração do esp32.wake_on_ext0/ext1
+        self.spi_present = True     # False: display desconectado (SPI falha ao iniciar)
+
+        # Contadores
+        self.i2c_transactions = 0
+        self.i2c_bytes = 0
+        self.spi_writes = 0
+        self.spi_bytes = 0
+        self.adc_reads = 0
+        self.wdt_feeds = 0
+        self.lightsleep_ms = 0
+
+    def attach_i2c(self, addr, model):
+        self.i2c_devices[addr] = model
+
+    def attach_dht(self, pin, model):
+        self.dht[pin] = model
+
+    def attach_adc(self, pin, model):
+        self.adc[pin] = model
+
+    def drive(self, pin, level):
+        """Muda o nível de um pino de entrada, disparando a IRQ configurada"""
+        old = self.levels.get(pin, 0)
+        self.levels[pin] = level
+        irq = self.irqs.get(pin)
+        if irq is None or old == level:
+            return
+        handler, trigger, obj = irq
+        if trigger & (1 if level else 2):       # IRQ_RISING / IRQ_FALLING
+            handler(obj)
+
+    def reboot(self, cause):
+        """Reset: a memória RTC sobrevive, pinos e periféricos voltam ao padrão"""
+        self.clock.reboot()
+        self.levels = {}
+        self.irqs = {}
+        self.reset_cause = cause
+        if cause in (PWRON_RESET, HARD_RESET):
+            self.rtc_memory = b""
+
+def install(board):
+    """Instala a placa e os módulos simulados do MicroPython"""
+    global current
+    current = board
+    if MPY_DIR not in sys.path:
+        sys.path.insert(0, MPY_DIR)
+    import utime
+    sys.modules["time"] = utime
+    gc.mem_free = lambda: HEAP_SIZE - gc.mem_alloc()
+    gc.mem_alloc = lambda: 0
+    return board
@@ -0,0 +1,125 @@
+"""
+Relógio virtual do simulador
+
+O tempo só avança quando o código da estação dorme (time.sleep*,
+lightsleep) ou quando uma operação de barramento cobra o seu custo
+(I2C, SPI, DHT11). Assim um ciclo de 8 s leva microssegundos reais e
+o watchdog, os Timers e o micropython.schedule disparam nos instantes
+exatos do tempo simulado.
+"""
+import heapq
+
+TICKS_PERIOD = 1 << 30          # ticks_ms/ticks_us dão a volta como no ESP32
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALF = TICKS_PERIOD // 2
+
+# 2025-06-01 00:00 UTC: início padrão do tempo simulado (reprodutível)
+DEFAULT_EPOCH = 1748736000
+
+class WatchdogReset(BaseException):
+    """O watchdog expirou (BaseException: o firmware não consegue capturar)"""
+
+class MachineReset(BaseException):
+    """machine.reset() ou deepsleep(): a placa reinicia com a causa indicada"""
+    def __init__(self, cause):
+        super().__init__(cause)
+        self.cause = cause
+
+class VirtualClock:
+    def __init__(self, epoch=DEFAULT_EPOCH):
+        """
+        Args:
+            epoch: Horário Unix (s) correspondente ao instante zero
+        """
+        self.epoch = epoch
+        self.ns = 0
+        self.slept_ns = 0
+        # Função chamada a cada sleep; True encerra o programa (KeyboardInterrupt)
+        self.stop = None
+        self._timers = []       # heap de (instante_ns, ordem, timer)
+        self._order = 0
+        self._scheduled = []
+        self._wdt_timeout = 0
+        self._wdt_fed = 0
+
+    # --- Leitura do tempo ---
+
+    def time(self):
+        return self.epoch + self.ns // 1000000000
+
+    def time_ns(self):
+        return self.epoch * 1000000000 + self.ns
+
+    def ticks_ms(self):
+        return (self.ns // 1000000) & TICKS_MAX
+
+    def ticks_us(self):
+        return (self.ns // 1000) & TICKS_MAX
+
+    # --- Avanço do tempo ---
+
+    def charge(self, ns):
+        """Custo de uma operação de barramento (não dispara eventos)"""
+        self.ns += ns
+
+    def sleep_ns(self, ns):
+        """Espera do firmware: avança o tempo e verifica a condição de parada"""
+        if ns > 0:
+            self.slept_ns += ns
+            self.advance(ns)
+        if self.stop is not None and self.stop():
+            raise KeyboardInterrupt
+
+    def advance(self, ns):
+        """Avança o tempo disparando Timers, callbacks agendados e o watchdog"""
+        target = self.ns + ns
+        self._run_scheduled()
+        timers = self._timers
+        while timers and timers[0][0] <= target:
+            due, _, timer = heapq.heappop(timers)
+            if due > self.ns:
+                self.ns = due
+            self._check_wdt()
+            if timer.active:
+                if timer.period_ns:
+                    self.add_timer(timer, due + timer.period_ns)
+                else:
+                    timer.active = False
+                timer.fire()
+            self._run_scheduled()
+        if target > self.ns:
+            self.ns = target
+        self._check_wdt()
+
+    # --- Eventos ---
+
+    def add_timer(self, timer, due_ns):
+        self._order += 1
+        heapq.heappush(self._timers, (due_ns, self._order, timer))
+
+    def schedule(self, func, arg):
+        """micropython.schedule(): roda antes do próximo avanço do tempo"""
+        self._scheduled.append((func, arg))
+
+    def _run_scheduled(self):
+        while self._scheduled:
+            func, arg = self._scheduled.pop(0)
+            func(arg)
+
+    def watchdog(self, timeout_ms):
+        self._wdt_timeout = timeout_ms * 1000000
+        self._wdt_fed = self.ns
+
+    def feed(self):
+        self._wdt_fed = self.ns
+
+    def _check_wdt(self):
+        if self._wdt_timeout and self.ns - self._wdt_fed > self._wdt_timeout:
+            self.ns = self._wdt_fed + self._wdt_timeout
+            raise WatchdogReset()
+
+    def reboot(self):
+        """Reset da placa: o tempo continua, mas Timers e watchdog param"""
+        self._timers = []
+        self._scheduled = []
+        self._wdt_timeout = 0
@@ -0,0 +1,349 @@
+"""
+Modelos do clima e dos sensores usados pelo simulador
+
+- SyntheticWeather / CsvWeather: séries de temperatura, pressão,
+  umidade e intensidade de chuva em função do horário Unix.
+- BMP280Model: mapa de registradores do BMP280 (ID, calibração,
+  ctrl_meas, config, dados brutos de 20 bits). Os valores brutos são
+  obtidos invertendo a compensação inteira do datasheet, então o driver
+  Libraries/bmp280.py roda sem alterações e devolve o clima simulado.
+- DHT11Model: leitura inteira com falhas (OSError) e travamentos
+  configuráveis.
+- RainModel: contagens do ADC de 12 bits do sensor de chuva (seco ~3600).
+"""
+import bisect
+import csv
+import errno
+import math
+import random
+import struct
+
+# --- Clima ---
+
+def _noise(t, k):
+    """Ruído pseudoaleatório determinístico em [-1, 1) para o instante t"""
+    x = math.sin(t * 12.9898 + k * 78.233) * 43758.5453
+    return 2 * (x - math.floor(x)) - 1
+
+class SyntheticWeather:
+    def __init__(self, seed=1, temp_mean=22.0, temp_swing=6.0, pressure_mean=101325.0,
+                 rain_chance=0.3):
+        """
+        Args:
+            seed: Semente dos eventos de chuva e das frentes de pressão
+            temp_mean, temp_swing: Temperatura média e amplitude diária (°C)
+            pressure_mean: Pressão média ao nível da estação (Pa)
+            rain_chance: Probabilidade de uma chuva em cada dia
+        """
+        self.seed = seed
+        self.temp_mean = temp_mean
+        self.temp_swing = temp_swing
+        self.pressure_mean = pressure_mean
+        self.rain_chance = rain_chance
+        self.phase = random.Random(seed).random() * 2 * math.pi
+        self._day = None
+        self._event = None
+
+    def _rain(self, t):
+        """Intensidade da chuva (0..1): no máximo um evento por dia"""
+        day = int(t // 86400)
+        if day != self._day:
+            rng = random.Random(self.seed * 1000003 + day)
+            self._day = day
+            self._event = None
+            if rng.random() < self.rain_chance:
+                start = day * 86400 + rng.uniform(0, 79200)
+                self._event = (start, rng.uniform(1200, 10800), rng.uniform(0.3, 1.0))
+        if self._event is None:
+            return 0.0
+        start, duration, peak = self._event
+        x = (t - start) / duration
+        if not 0 <= x < 1:
+            return 0.0
+        return peak * math.sin(math.pi * x)
+
+    def at(self, t):
+        """Retorna (temperatura °C, pressão Pa, umidade %, chuva 0..1)"""
+        rain = self._rain(t)
+        hour = (t % 86400) / 3600
+        front = math.sin(2 * math.pi * t / (5.3 * 86400) + self.phase)
+        temp = (self.temp_mean + self.temp_swing * math.sin(2 * math.pi * (hour - 9) / 24)
+                + 2 * front - 4 * rain + 0.05 * _noise(t, 1))
+        pressure = (self.pressure_mean + 600 * front + 100 * math.sin(4 * math.pi * hour / 24)
+                    - 300 * rain + 3 * _noise(t, 2))
+        humidity = self.temp_mean + 33 - 2.5 * (temp - self.temp_mean) + 35 * rain + _noise(t, 3)
+        return temp, pressure, min(max(humidity, 5.0), 99.0), rain
+
+class CsvWeather:
+    """Série gravada em CSV: t (s), temp_c, pressure_pa, humidity, rain (0..1)"""
+    def __init__(self, path):
+        rows = []
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                rows.append((float(row["t"]), float(row["temp_c"]), float(row["pressure_pa"]),
+                             float(row["humidity"]), float(row.get("rain") or 0)))
+        if len(rows) < 2:
+            raise ValueError(f"{path}: a série precisa de pelo menos 2 linhas")
+        rows.sort()
+        t0 = rows[0][0]
+        self.times = [r[0] - t0 for r in rows]
+        self.rows = rows
+        self.period = self.times[-1]
+        self.start = None
+
+    def at(self, t):
+        """Interpolação linear, repetindo a série ao chegar no fim"""
+        if self.start is None:
+            self.start = t
+        x = (t - self.start) % self.period
+        i = min(bisect.bisect_right(self.times, x), len(self.times) - 1)
+        t0, t1 = self.times[i - 1], self.times[i]
+        k = (x - t0) / (t1 - t0) if t1 > t0 else 0.0
+        a, b = self.rows[i - 1], self.rows[i]
+        return tuple(a[j] + (b[j] - a[j]) * k for j in range(1, 5))
+
+# --- BMP280 ---
+
+# Coeficientes do exemplo do datasheet (seção 8.2)
+DATASHEET_CALIBRATION = (27504, 26435, -1000, 36477, -10685, 3024, 2855, 140, -7, 15500, -14600, 6000)
+_CALIBRATION_FMT = "<HhhHhhhhhhhh"
+_SKIPPED = 0x80000                  # Valor bruto de um canal desligado (oversampling 0)
+_OVERSAMPLING = (0, 1, 2, 4, 8, 16, 16, 16)
+_STANDBY_US = (500, 62500, 125000, 250000, 500000, 1000000, 2000000, 4000000)
+
+def compensate_temperature(adc_t, cal):
+    """Retorna (t_fine, temperatura em centésimos de °C)"""
+    t1, t2, t3 = cal[0], cal[1], cal[2]
+    var1 = (((adc_t >> 3) - (t1 << 1)) * t2) >> 11
+    var2 = (((((adc_t >> 4) - t1) * ((adc_t >> 4) - t1)) >> 12) * t3) >> 14
+    t_fine = var1 + var2
+    return t_fine, (t_fine * 5 + 128) >> 8
+
+def compensate_pressure(adc_p, t_fine, cal):
+    """Retorna a pressão em Q24.8 (Pa * 256), como no datasheet"""
+    p1, p2, p3, p4, p5, p6, p7, p8, p9 = cal[3:]
+    var1 = t_fine - 128000
+    var2 = var1 * var1 * p6
+    var2 = var2 + ((var1 * p5) << 17)
+    var2 = var2 + (p4 << 35)
+    var1 = ((var1 * var1 * p3) >> 8) + ((var1 * p2) << 12)
+    var1 = ((1 << 47) + var1) * p1 >> 33
+    if var1 == 0:
+        return 0
+    p = 1048576 - adc_p
+    p = (((p << 31) - var2) * 3125) // var1
+    var1 = (p9 * (p >> 13) * (p >> 13)) >> 25
+    var2 = (p8 * p) >> 19
+    return ((p + var1 + var2) >> 8) + (p7 << 4)
+
+def raw_temperature(temp_c, cal):
+    """Menor valor bruto de 20 bits cuja compensação atinge temp_c"""
+    target = round(temp_c * 100)
+    lo, hi = 0, (1 << 20) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if compensate_temperature(mid, cal)[1] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def raw_pressure(pressure_pa, t_fine, cal):
+    """Valor bruto de 20 bits cuja compensação mais se aproxima de pressure_pa"""
+    target = round(pressure_pa * 256)
+    lo, hi = 0, (1 << 20) - 1
+    # A pressão compensada diminui com o valor bruto
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if compensate_pressure(mid, t_fine, cal) > target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+class BMP280Model:
+    REG_ID = 0xD0
+    REG_RESET = 0xE0
+    REG_STATUS = 0xF3
+    REG_CTRL_MEAS = 0xF4
+    REG_CONFIG = 0xF5
+    REG_DATA = 0xF7
+    CHIP_ID = 0x58
+
+    def __init__(self, weather, clock, calibration=DATASHEET_CALIBRATION, fail_rate=0.0, rng=None):
+        """
+        Args:
+            weather: Fonte do clima (método at(t))
+            clock: VirtualClock
+            calibration: Coeficientes dig_T1..dig_P9 gravados na NVM simulada
+            fail_rate: Probabilidade de uma transação I2C falhar (OSError)
+        """
+        self.weather = weather
+        self.clock = clock
+        self.cal = calibration
+        self.fail_rate = fail_rate
+        self.rng = rng or random.Random(0)
+        self.regs = bytearray(256)
+        self.measurements = 0
+        self._reset()
+
+    def _reset(self):
+        regs = self.regs
+        regs[:] = bytes(256)
+        regs[self.REG_ID] = self.CHIP_ID
+        struct.pack_into(_CALIBRATION_FMT, regs, 0x88, *self.cal)
+        regs[self.REG_DATA:self.REG_DATA + 6] = b"\x80\x00\x00\x80\x00\x00"
+        self._last_ns = None
+        self._filtered = None
+
+    def _check(self):
+        if self.fail_rate and self.rng.random() < self.fail_rate:
+            raise OSError(errno.ETIMEDOUT)
+
+    def read(self, reg, n):
+        self._check()
+        if reg + n > self.REG_DATA and reg < self.REG_DATA + 6:
+            self._update()
+        return bytes(self.regs[reg:reg + n])
+
+    def write(self, reg, data):
+        self._check()
+        for i, b in enumerate(data):
+            r = reg + i
+            if r == self.REG_RESET:
+                if b == 0xB6:
+                    self._reset()
+            elif r in (self.REG_CTRL_MEAS, self.REG_CONFIG):
+                self.regs[r] = b
+                if r == self.REG_CTRL_MEAS and b & 3 in (1, 2):
+                    # Modo forçado: uma medição e volta ao modo sleep
+                    self._measure()
+                    self.regs[r] = b & 0xFC
+
+    def _update(self):
+        """Modo normal: nova medição a cada t_standby + tempo de conversão"""
+        ctrl = self.regs[self.REG_CTRL_MEAS]
+        if ctrl & 3 != 3:
+            return
+        now = self.clock.ns
+        period = _STANDBY_US[self.regs[self.REG_CONFIG] >> 5] * 1000 + 5000000
+        if self._last_ns is None or now - self._last_ns >= period:
+            self._measure()
+
+    def _measure(self):
+        self._last_ns = self.clock.ns
+        self.measurements += 1
+        temp, pressure = self.weather.at(self.clock.ns / 1e9 + self.clock.epoch)[:2]
+        # Filtro IIR do sensor (coeficiente em config[4:2])
+        coef = (0, 2, 4, 8, 16, 16, 16, 16)[(self.regs[self.REG_CONFIG] >> 2) & 7]
+        if coef and self._filtered is not None:
+            temp = self._filtered[0] + (temp - self._filtered[0]) / coef
+            pressure = self._filtered[1] + (pressure - self._filtered[1]) / coef
+        self._filtered = (temp, pressure)
+
+        ctrl = self.regs[self.REG_CTRL_MEAS]
+        adc_t = raw_temperature(temp, self.cal)
+        t_fine = compensate_temperature(adc_t, self.cal)[0]
+        adc_p = raw_pressure(pressure, t_fine, self.cal)
+        if not _OVERSAMPLING[ctrl >> 5]:
+            adc_t = _SKIPPED
+        if not _OVERSAMPLING[(ctrl >> 2) & 7]:
+            adc_p = _SKIPPED
+        regs = self.regs
+        for reg, adc in ((self.REG_DATA, adc_p), (self.REG_DATA + 3, adc_t)):
+            regs[reg] = adc >> 12
+            regs[reg + 1] = (adc >> 4) & 0xFF
+            regs[reg + 2] = (adc & 0x0F) << 4
+
+# --- DHT11 ---
+
+class DHT11Model:
+    def __init__(self, weather, clock, fail_rate=0.0, hang_rate=0.0, rng=None, resolution=1):
+        """
+        Args:
+            weather: Fonte do clima (método at(t))
+            clock: VirtualClock
+            fail_rate: Probabilidade de uma leitura falhar (timeout/checksum)
+            hang_rate: Probabilidade de a leitura travar até o watchdog
+            resolution: 1 para o DHT11, 0.1 para o DHT22
+        """
+        self.weather = weather
+        self.clock = clock
+        self.fail_rate = fail_rate
+        self.hang_rate = hang_rate
+        self.rng = rng or random.Random(0)
+        self.resolution = resolution
+        self.reads = 0
+        self.errors = 0
+        self.hangs = 0
+
+    def measure(self):
+        """Retorna (temperatura, umidade) ou levanta OSError como o módulo dht"""
+        self.reads += 1
+        # Pulso de início (18 ms) + 40 bits de dados
+        self.clock.charge(23000000)
+        if self.hang_rate and self.rng.random() < self.hang_rate:
+            self.hangs += 1
+            self.clock.advance(60 * 1000000000)
+        if self.fail_rate and self.rng.random() < self.fail_rate:
+            self.errors += 1
+            raise OSError(errno.ETIMEDOUT)
+        temp, _, humidity, _ = self.weather.at(self.clock.ns / 1e9 + self.clock.epoch)
+        if self.resolution == 1:
+            return int(round(min(max(temp, 0), 50))), int(round(min(max(humidity, 20), 90)))
+        return round(temp, 1), round(humidity, 1)
+
+# --- Sensor de chuva ---
+
+class RainModel:
+    def __init__(self, weather, clock, dry=3600, wet=700, noise=20, rng=None):
+        """
+        Args:
+            weather: Fonte do clima (método at(t))
+            clock: VirtualClock
+            dry, wet: Contagens do ADC com a placa seca e encharcada
+            noise: Amplitude do ruído de cada leitura (contagens)
+        """
+        self.weather = weather
+        self.clock = clock
+        self.dry = dry
+        self.wet = wet
+        self.noise = noise
+        self.rng = rng or random.Random(0)
+        self.reads = 0
+
+    def level(self):
+        """Contagem sem ruído no instante atual"""
+        rain = self.weather.at(self.clock.ns / 1e9 + self.clock.epoch)[3]
+        return self.dry - (self.dry - self.wet) * rain
+
+    def read(self):
+        self.reads += 1
+        value = self.level() + self.rng.uniform(-self.noise, self.noise)
+        return min(max(int(value), 0), 4095)
+
+class RainComparator:
+    """
+    Saída digital (DO) do módulo de chuva: comparador com o limiar do
+    trimpot, avaliado periodicamente no relógio virtual (agendado como
+    um Timer); as mudanças de nível disparam a IRQ do pino.
+    """
+    def __init__(self, rain, board, pin, threshold=2500, period_ms=100):
+        self.rain = rain
+        self.board = board
+        self.pin = pin
+        self.threshold = threshold
+        self.period_ns = period_ms * 1000000
+        self.active = True
+        self.edges = 0
+        board.levels[pin] = self._level()
+        board.clock.add_timer(self, board.clock.ns + self.period_ns)
+
+    def _level(self):
+        return 0 if self.rain.level() < self.threshold else 1
+
+    def fire(self):
+        level = self._level()
+        if level != self.board.levels.get(self.pin, 1):
+            self.edges += 1
+            self.board.drive(self.pin, level)
@@ -0,0 +1,57 @@
+"""
+Módulo dht simulado: as leituras vêm do modelo ligado ao pino
+
+Como no MicroPython, os 5 bytes da resposta ficam em `buf` e
+temperature()/humidity() são calculados a partir deles.
+"""
+import errno
+from Simulator import board as _board
+
+class DHTBase:
+    def __init__(self, pin):
+        self.pin = pin
+        self.buf = bytearray(5)
+
+    def measure(self):
+        model = _board.current.dht.get(self.pin.id)
+        if model is None:
+            # Sensor ausente: sem resposta ao pulso de início
+            _board.current.clock.charge(20000000)
+            raise OSError(errno.ETIMEDOUT)
+        raw = getattr(model, "measure_raw", None)
+        if raw is not None:
+            self.buf[:] = raw()
+        else:
+            self._encode(*model.measure())
+        buf = self.buf
+        if (buf[0] + buf[1] + buf[2] + buf[3]) & 0xFF != buf[4]:
+            raise Exception("checksum error")
+
+    def _checksum(self):
+        buf = self.buf
+        buf[4] = (buf[0] + buf[1] + buf[2] + buf[3]) & 0xFF
+
+class DHT11(DHTBase):
+    def _encode(self, temp, humidity):
+        self.buf[0:4] = bytes((int(humidity), 0, int(temp), 0))
+        self._checksum()
+
+    def humidity(self):
+        return self.buf[0]
+
+    def temperature(self):
+        return self.buf[2]
+
+class DHT22(DHTBase):
+    def _encode(self, temp, humidity):
+        h = int(round(humidity * 10))
+        t = int(round(abs(temp) * 10)) | (0x8000 if temp < 0 else 0)
+        self.buf[0:4] = bytes((h >> 8, h & 0xFF, t >> 8, t & 0xFF))
+        self._checksum()
+
+    def humidity(self):
+        return (self.buf[0] << 8 | self.buf[1]) * 0.1
+
+    def temperature(self):
+        t = ((self.buf[2] & 0x7F) << 8 | self.buf[3]) * 0.1
+        return -t if self.buf[2] & 0x80 else t
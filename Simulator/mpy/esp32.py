@@ -0,0 +1,17 @@
+"""Módulo esp32 simulado (fontes de despertar do deep/light sleep)"""
+from Simulator import board as _board
+
+WAKEUP_ALL_LOW = False
+WAKEUP_ANY_HIGH = True
+
+def wake_on_ext0(pin, level):
+    _board.current.wakeup = None if pin is None else ("ext0", (pin.id,), level)
+
+def wake_on_ext1(pins, level):
+    _board.current.wakeup = ("ext1", tuple(p.id for p in pins), level)
+
+def wake_on_touch(wake):
+    pass
+
+def raw_temperature():
+    return 120
@@ -0,0 +1,295 @@
+"""
+Módulo machine simulado
+
+Os periféricos falam com os modelos ligados à placa em
+Simulator.board.current e cobram do relógio virtual o tempo que a
+operação levaria no barramento real.
+"""
+import errno
+from Simulator import board as _board
+from Simulator.board import PWRON_RESET, HARD_RESET, WDT_RESET, DEEPSLEEP_RESET, SOFT_RESET
+from Simulator.clock import MachineReset
+
+def freq(hz=None):
+    if hz is None:
+        return _board.current.cpu_freq
+    _board.current.cpu_freq = hz
+
+def reset_cause():
+    return _board.current.reset_cause
+
+def reset():
+    raise MachineReset(SOFT_RESET)
+
+def soft_reset():
+    raise MachineReset(SOFT_RESET)
+
+def deepsleep(ms=0):
+    board = _board.current
+    board.clock.sleep_ns(ms * 1000000)
+    raise MachineReset(DEEPSLEEP_RESET)
+
+# Light sleep com ext0: nível do pino verificado nesse passo; acordar custa WAKE_MS
+WAKE_STEP_MS = 10
+WAKE_MS = 1
+
+def lightsleep(ms=0):
+    board = _board.current
+    wakeup = board.wakeup
+    if wakeup is None or wakeup[0] != "ext0":
+        board.lightsleep_ms += ms
+        board.clock.sleep_ns(ms * 1000000)
+        return
+    # ext0 acorda pelo nível: com o pino no nível de despertar volta na hora
+    pin, level = wakeup[1][0], 1 if wakeup[2] else 0
+    slept = 0
+    while slept < ms:
+        if board.levels.get(pin, 0) == level:
+            board.clock.sleep_ns(WAKE_MS * 1000000)
+            slept += WAKE_MS
+            break
+        step = WAKE_STEP_MS if ms - slept > WAKE_STEP_MS else ms - slept
+        board.clock.sleep_ns(step * 1000000)
+        slept += step
+    board.lightsleep_ms += slept
+
+def idle():
+    _board.current.clock.sleep_ns(1000000)
+
+def unique_id():
+    return b"\x24\x0a\xc4\x00\x00\x01"
+
+def disable_irq():
+    return 0
+
+def enable_irq(state=0):
+    pass
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+    WAKE_LOW = 4
+    WAKE_HIGH = 5
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        if pull == Pin.PULL_UP and id not in _board.current.levels:
+            _board.current.levels[id] = 1
+        if value is not None:
+            self.value(value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        self.__init__(self.id, mode, pull, value)
+
+    def value(self, v=None):
+        levels = _board.current.levels
+        if v is None:
+            return levels.get(self.id, 0)
+        levels[self.id] = 1 if v else 0
+
+    __call__ = value
+
+    def on(self):
+        _board.current.levels[self.id] = 1
+
+    def off(self):
+        _board.current.levels[self.id] = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, wake=None):
+        if handler is None:
+            _board.current.irqs.pop(self.id, None)
+        else:
+            _board.current.irqs[self.id] = (handler, trigger, self)
+
+    def __repr__(self):
+        return f"Pin({self.id})"
+
+class I2C:
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, timeout=50000):
+        self.freq = freq
+        # Tempo de um byte no barramento (8 bits + ACK)
+        self._byte_ns = 9 * 1000000000 // freq
+
+    def _device(self, addr, nbytes):
+        board = _board.current
+        board.i2c_transactions += 1
+        board.i2c_bytes += nbytes
+        board.clock.charge((nbytes + 1) * self._byte_ns)
+        device = board.i2c_devices.get(addr)
+        if device is None:
+            raise OSError(errno.ENODEV)
+        return device
+
+    def scan(self):
+        _board.current.clock.charge(112 * self._byte_ns)
+        return sorted(_board.current.i2c_devices)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        return self._device(addr, nbytes + 2).read(memaddr, nbytes)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        buf[:] = self._device(addr, len(buf) + 2).read(memaddr, len(buf))
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        self._device(addr, len(buf) + 1).write(memaddr, bytes(buf))
+
+    def readfrom(self, addr, nbytes, stop=True):
+        device = self._device(addr, nbytes)
+        return device.read(getattr(device, "pointer", 0), nbytes)
+
+    def writeto(self, addr, buf, stop=True):
+        device = self._device(addr, len(buf))
+        if len(buf) > 1:
+            device.write(buf[0], bytes(buf[1:]))
+        elif buf:
+            device.pointer = buf[0]
+        return len(buf)
+
+class SoftI2C(I2C):
+    pass
+
+class SPI:
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, id=1, baudrate=1000000, polarity=0, phase=0, bits=8, firstbit=MSB,
+                 sck=None, mosi=None, miso=None):
+        if not _board.current.spi_present:
+            raise OSError(errno.ENODEV)
+        self.init(baudrate)
+
+    def init(self, baudrate=1000000, **kwargs):
+        self.baudrate = baudrate
+        self._byte_ns = 8 * 1000000000 // baudrate
+
+    def deinit(self):
+        pass
+
+    def write(self, buf):
+        board = _board.current
+        n = len(buf)
+        board.spi_writes += 1
+        board.spi_bytes += n
+        board.clock.ns += n * self._byte_ns
+
+    def read(self, nbytes, write=0x00):
+        self.write(bytes(nbytes))
+        return bytes(nbytes)
+
+    def readinto(self, buf, write=0x00):
+        self.write(buf)
+        for i in range(len(buf)):
+            buf[i] = 0
+
+    def write_readinto(self, write_buf, read_buf):
+        self.readinto(read_buf)
+
+class ADC:
+    ATTN_0DB = 0
+    ATTN_2_5DB = 1
+    ATTN_6DB = 2
+    ATTN_11DB = 3
+    WIDTH_9BIT = 0
+    WIDTH_10BIT = 1
+    WIDTH_11BIT = 2
+    WIDTH_12BIT = 3
+
+    def __init__(self, pin, atten=None):
+        self.pin = pin
+        self._atten = atten if atten is not None else ADC.ATTN_0DB
+        self._shift = 0
+
+    def atten(self, atten):
+        self._atten = atten
+
+    def width(self, width):
+        self._shift = ADC.WIDTH_12BIT - width
+
+    def read(self):
+        board = _board.current
+        board.adc_reads += 1
+        board.clock.charge(40000)
+        model = board.adc.get(self.pin.id)
+        value = model.read() if model is not None else 0
+        return value >> self._shift
+
+    def read_u16(self):
+        value = self.read() << self._shift
+        return value << 4 | value >> 8
+
+    def read_uv(self):
+        return (self.read() << self._shift) * 3300000 // 4095
+
+class _Alarm:
+    """Um agendamento no relógio virtual; init() e deinit() apenas o desativam"""
+    def __init__(self, timer, period_ns, periodic):
+        self.timer = timer
+        self.period_ns = period_ns if periodic else 0
+        self.active = True
+
+    def fire(self):
+        self.timer.callback(self.timer)
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, mode=PERIODIC, period=-1, freq=None, callback=None):
+        self.id = id
+        self.callback = None
+        self._alarm = None
+        if callback is not None:
+            self.init(mode=mode, period=period, freq=freq, callback=callback)
+
+    def init(self, mode=PERIODIC, period=-1, freq=None, callback=None):
+        self.deinit()
+        period_ns = int(1000000000 / freq) if freq is not None else period * 1000000
+        self.callback = callback
+        self._alarm = _Alarm(self, period_ns, mode == Timer.PERIODIC)
+        clock = _board.current.clock
+        clock.add_timer(self._alarm, clock.ns + period_ns)
+
+    def deinit(self):
+        if self._alarm is not None:
+            self._alarm.active = False
+            self._alarm = None
+
+class WDT:
+    def __init__(self, id=0, timeout=5000):
+        _board.current.clock.watchdog(timeout)
+
+    def feed(self):
+        board = _board.current
+        board.wdt_feeds += 1
+        board.clock.feed()
+
+class RTC:
+    def __init__(self, id=0):
+        pass
+
+    def memory(self, data=None):
+        board = _board.current
+        if data is None:
+            return board.rtc_memory
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) > 2048:
+            raise ValueError("buffer too long")
+        board.rtc_memory = bytes(data)
+
+    def datetime(self, dt=None):
+        import time
+        if dt is not None:
+            return
+        t = time.gmtime()
+        return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+
+__all__ = ["Pin", "I2C", "SoftI2C", "SPI", "ADC", "Timer", "WDT", "RTC", "freq", "reset",
+           "reset_cause", "deepsleep", "lightsleep", "idle", "unique_id",
+           "PWRON_RESET", "HARD_RESET", "WDT_RESET", "DEEPSLEEP_RESET", "SOFT_RESET"]
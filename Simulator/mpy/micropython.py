@@ -0,0 +1,29 @@
+"""Módulo micropython simulado"""
+from Simulator import board as _board
+
+def const(value):
+    return value
+
+def schedule(func, arg):
+    _board.current.clock.schedule(func, arg)
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+def opt_level(level=None):
+    return 0 if level is None else None
+
+def mem_info(verbose=False):
+    import gc
+    print(f"mem: total={_board.HEAP_SIZE}, current={gc.mem_alloc()}, free={gc.mem_free()}")
+
+def heap_lock():
+    return 0
+
+def heap_unlock():
+    return 0
+
+def _decorator(func):
+    return func
+
+native = viper = _decorator
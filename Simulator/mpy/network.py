@@ -0,0 +1,54 @@
+"""Módulo network simulado: o Wi-Fi associa CONNECT_MS depois de connect()"""
+from Simulator import board as _board
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 1000
+STAT_CONNECTING = 1001
+STAT_GOT_IP = 1010
+
+CONNECT_MS = 2000
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        self.interface = interface
+        self._active = False
+        self._connect_at = None
+        self._ssid = None
+
+    def active(self, state=None):
+        if state is None:
+            return self._active
+        self._active = bool(state)
+        if not state:
+            self._connect_at = None
+
+    def connect(self, ssid=None, key=None):
+        if not self._active:
+            raise OSError("Wi-Fi Internal Error")
+        self._ssid = ssid
+        self._connect_at = _board.current.clock.ns + CONNECT_MS * 1000000
+
+    def disconnect(self):
+        self._connect_at = None
+
+    def isconnected(self):
+        return self._connect_at is not None and _board.current.clock.ns >= self._connect_at
+
+    def status(self, param=None):
+        if param == "rssi":
+            return -60
+        if self.isconnected():
+            return STAT_GOT_IP
+        return STAT_CONNECTING if self._connect_at is not None else STAT_IDLE
+
+    def ifconfig(self, config=None):
+        return ("127.0.0.1", "255.0.0.0", "127.0.0.1", "127.0.0.1")
+
+    def config(self, *args, **kwargs):
+        if args == ("essid",):
+            return self._ssid
+        if args == ("mac",):
+            return b"\x24\x0a\xc4\x00\x00\x01"
+        return None
@@ -0,0 +1,12 @@
+"""Módulo ntptime simulado: o relógio virtual já começa na hora certa"""
+from Simulator import board as _board
+
+host = "pool.ntp.org"
+timeout = 1
+
+def time():
+    return _board.current.clock.time()
+
+def settime():
+    # A consulta ao servidor leva alguns milissegundos de rede
+    _board.current.clock.charge(30000000)
@@ -0,0 +1,54 @@
+"""
+time/utime do MicroPython sobre o relógio virtual do simulador
+
+Substitui o módulo `time` depois de Simulator.board.install(); os nomes
+que o MicroPython não tem (perf_counter, monotonic, strftime...) vêm do
+time real do CPython.
+"""
+import calendar
+import time as _time
+from Simulator import board as _board
+from Simulator.clock import TICKS_MAX, TICKS_HALF
+
+def _clock():
+    return _board.current.clock
+
+def time():
+    return _clock().time()
+
+def time_ns():
+    return _clock().time_ns()
+
+def sleep(seconds):
+    _clock().sleep_ns(int(seconds * 1000000000))
+
+def sleep_ms(ms):
+    _clock().sleep_ns(int(ms) * 1000000)
+
+def sleep_us(us):
+    _clock().sleep_ns(int(us) * 1000)
+
+def ticks_ms():
+    return _clock().ticks_ms()
+
+def ticks_us():
+    return _clock().ticks_us()
+
+ticks_cpu = ticks_us
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) & TICKS_MAX
+
+def ticks_diff(end, start):
+    return ((end - start + TICKS_HALF) & TICKS_MAX) - TICKS_HALF
+
+def gmtime(secs=None):
+    return _time.gmtime(time() if secs is None else secs)
+
+localtime = gmtime
+
+def mktime(t):
+    return calendar.timegm(tuple(t[:6]) + (0, 0, 0))
+
+def __getattr__(name):
+    return getattr(_time, name)
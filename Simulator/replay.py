@@ -0,0 +1,299 @@
+"""
+Reprodução das gravações de dados brutos (Libraries/recorder.py)
+
+Os bytes de registradores, as respostas do DHT11 e as contagens do ADC
+gravados na placa substituem o barramento: o driver do BMP280, a
+decodificação do DHT11 e o read_sensors() do display_data atuais rodam
+sobre eles, ciclo a ciclo, tão rápido quanto a CPU permite. Cada
+amostra é comparada com a que a placa calculou na hora da gravação,
+e a troca de estado do sensor de chuva é contada (oscilação no limiar).
+
+Uso (na raiz do repositório):
+    python -m Simulator.replay rec0001.rpl [rec0002.rpl ...] [--csv saida.csv]
+    python -m Simulator.replay rec0001.rpl --set RAIN_THRESHOLD_DRY=2800
+"""
+import argparse
+import contextlib
+import csv
+import errno
+import io
+import os
+import struct
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Simulator import board as sim_board  # noqa: E402
+from Simulator.run import PROJECT_DIRS, boot, parse_override  # noqa: E402
+from Simulator.clock import VirtualClock  # noqa: E402
+
+sys.path[:0] = list(PROJECT_DIRS)
+import reading  # noqa: E402
+from recorder import (MAGIC, EV_CYCLE, EV_I2C, EV_ADC, EV_DHT, EV_DHT_PULSES,  # noqa: E402
+                      EV_DHT_FAIL, EV_SAMPLE)
+
+_FIXED_SIZE = {EV_CYCLE: 4, EV_ADC: 3, EV_DHT: 6, EV_DHT_PULSES: 41, EV_DHT_FAIL: 2,
+               EV_SAMPLE: reading.RECORD_SIZE}
+
+def read_events(data):
+    """Eventos de uma gravação: lista de (tipo, bytes do evento)"""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("não é uma gravação do recorder (RPL1)")
+    events = []
+    pos = len(MAGIC)
+    end = len(data)
+    while pos < end:
+        kind = data[pos]
+        size = 3 + data[pos + 3] if kind == EV_I2C else _FIXED_SIZE.get(kind)
+        if size is None or pos + 1 + size > end:
+            break           # Página incompleta no fim (reset durante a gravação)
+        events.append((kind, data[pos + 1:pos + 1 + size]))
+        pos += 1 + size
+    return events
+
+def split_cycles(events):
+    """Separa os eventos do boot e os de cada ciclo: (boot, [(timestamp, eventos)])"""
+    boot_events = []
+    cycles = []
+    group = boot_events
+    for kind, body in events:
+        if kind == EV_CYCLE:
+            group = []
+            cycles.append((struct.unpack("<I", body)[0], group))
+        else:
+            group.append((kind, body))
+    return boot_events, cycles
+
+def cycle_sensors(station, events):
+    """Máscara (SENSOR_* do display_data) dos sensores com eventos no ciclo"""
+    which = 0
+    for kind, _ in events:
+        if kind == EV_I2C:
+            which |= station.SENSOR_BMP
+        elif kind == EV_ADC:
+            which |= station.SENSOR_RAIN
+        elif kind in (EV_DHT, EV_DHT_PULSES, EV_DHT_FAIL):
+            which |= station.SENSOR_DHT
+    return which
+
+# --- Dispositivos alimentados pela gravação ---
+
+class ReplayI2C:
+    """Imagem dos registradores de um dispositivo I2C, atualizada pelas leituras gravadas"""
+    def __init__(self):
+        self.regs = bytearray(256)
+
+    def load(self, reg, data):
+        self.regs[reg:reg + len(data)] = data
+
+    def read(self, reg, n):
+        return bytes(self.regs[reg:reg + n])
+
+    def write(self, reg, data):
+        pass
+
+class ReplayDHT:
+    """Respostas gravadas do DHT11, na ordem, para o módulo dht simulado"""
+    def __init__(self):
+        self.queue = []
+        self.underruns = 0
+        self._buf = bytearray(5)
+
+    def measure_raw(self):
+        if not self.queue:
+            # O código atual leu mais vezes do que a placa leu
+            self.underruns += 1
+            raise OSError(errno.ETIMEDOUT)
+        kind, body = self.queue.pop(0)
+        if kind == EV_DHT_FAIL:
+            raise OSError(body[1])
+        if kind == EV_DHT_PULSES:
+            # Decodifica as durações com o código atual de Libraries/dht11.py
+            import dht11
+            dht11.decode(body[1:41], self._buf)
+            return self._buf
+        return body[1:6]
+
+class ReplayADC:
+    """Contagens gravadas do ADC; repete a última se o código atual ler mais"""
+    def __init__(self):
+        self.queue = []
+        self.last = 0
+
+    def read(self):
+        if self.queue:
+            self.last = self.queue.pop(0)
+        return self.last
+
+class Replayer:
+    def __init__(self, board):
+        self.board = board
+        self.i2c = {}
+        self.dht = {}
+        self.adc = {}
+
+    def feed(self, events):
+        """Entrega ao hardware simulado os eventos de um ciclo (ou do boot)"""
+        for queue in self.dht.values():
+            queue.queue = []
+        for queue in self.adc.values():
+            queue.queue = []
+        sample = None
+        for kind, body in events:
+            if kind == EV_I2C:
+                device = self.i2c.get(body[0])
+                if device is None:
+                    device = self.i2c[body[0]] = ReplayI2C()
+                    self.board.attach_i2c(body[0], device)
+                device.load(body[1], body[3:])
+            elif kind == EV_ADC:
+                pin, value = struct.unpack("<BH", body)
+                adc = self.adc.get(pin)
+                if adc is None:
+                    adc = self.adc[pin] = ReplayADC()
+                    self.board.attach_adc(pin, adc)
+                adc.queue.append(value)
+            elif kind in (EV_DHT, EV_DHT_PULSES, EV_DHT_FAIL):
+                dht = self.dht.get(body[0])
+                if dht is None:
+                    dht = self.dht[body[0]] = ReplayDHT()
+                    self.board.attach_dht(body[0], dht)
+                dht.queue.append((kind, body))
+            elif kind == EV_SAMPLE:
+                sample = reading.unpack_from(body)
+        return sample
+
+class Stats:
+    def __init__(self):
+        self.cycles = 0
+        self.compared = 0
+        self.mismatches = [0] * reading.NUM_CHANNELS
+        self.max_diff = [0] * reading.NUM_CHANNELS
+        self.flag_mismatches = 0
+        self.errors = {"bmp_error": 0, "dht_error": 0, "rain_error": 0}
+        self.rain_changes = 0
+        self.rain_status = None
+
+    def add(self, data, flags, values, recorded):
+        self.cycles += 1
+        for key in self.errors:
+            if key in data:
+                self.errors[key] += 1
+        status = data.get('rain_status')
+        if status is not None:
+            if self.rain_status is not None and status != self.rain_status:
+                self.rain_changes += 1
+            self.rain_status = status
+        if recorded is None:
+            return True
+        self.compared += 1
+        same = True
+        if (recorded[1] & 0x1F) != (flags & 0x1F):
+            self.flag_mismatches += 1
+            same = False
+        for ch in range(reading.NUM_CHANNELS):
+            if flags & recorded[1] & (1 << ch):
+                diff = abs(values[ch] - recorded[2 + ch])
+                if diff:
+                    self.mismatches[ch] += 1
+                    self.max_diff[ch] = max(self.max_diff[ch], diff)
+                    same = False
+        return same
+
+def replay_file(path, replayer, overrides, flash, stats, writer):
+    """Reproduz uma gravação (um boot da placa)"""
+    with open(path, "rb") as f:
+        boot_events, cycles = split_cycles(read_events(f.read()))
+    if not cycles:
+        print(f"{path}: nenhum ciclo gravado")
+        return
+    clock = replayer.board.clock
+    clock.epoch = cycles[0][0]
+    clock.ns = 0
+
+    replayer.feed(boot_events)
+    kinds = {kind for kind, _ in boot_events}
+    for _, events in cycles:
+        kinds.update(kind for kind, _ in events)
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Sensores como na gravação; --set pode alterar depois
+        station = boot(flash, [("ENABLE_BMP280", EV_I2C in kinds),
+                               ("ENABLE_DHT11", bool(kinds & {EV_DHT, EV_DHT_PULSES, EV_DHT_FAIL})),
+                               ("ENABLE_RAIN_SENSOR", EV_ADC in kinds),
+                               ("ENABLE_RECORDER", False), ("VERBOSITY", 0)] + overrides)
+        from governor import Governor
+        station.governor = Governor()
+        station.safe_sensor_init()
+
+    values = [0] * reading.NUM_CHANNELS
+    quiet = io.StringIO()
+    for timestamp, events in cycles:
+        recorded = replayer.feed(events)
+        now = (timestamp - clock.epoch) * 1000000000
+        if now > clock.ns:
+            clock.ns = now
+        with contextlib.redirect_stdout(quiet):
+            # Só os sensores que a placa leu no ciclo (amostragem adaptativa),
+            # crus como a placa grava: antes dos filtros e de hold_reading()
+            data = station.read_sensors(cycle_sensors(station, events))
+        quiet.seek(0)
+        quiet.truncate()
+        flags = reading.encode(data, values)
+        same = stats.add(data, flags, values, recorded)
+        if writer is not None:
+            writer.writerow([timestamp, flags] +
+                            [data.get(key, "") for key in reading.CHANNEL_KEYS] +
+                            [data.get('rain_status', ""), "" if recorded is None else int(same)])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="+", help="Gravações (.rpl) na ordem")
+    parser.add_argument("--set", action="append", default=[], metavar="NOME=VALOR",
+                        help="Altera uma configuração do display_data (ex.: limiares da chuva)")
+    parser.add_argument("--csv", help="Grava as amostras reproduzidas em CSV")
+    args = parser.parse_args()
+
+    overrides = [parse_override(s) for s in args.set]
+    files = [os.path.abspath(p) for p in args.files]
+    csv_path = os.path.abspath(args.csv) if args.csv else None
+    flash = tempfile.mkdtemp(prefix="replay_flash_")
+    os.chdir(flash)
+    board = sim_board.install(sim_board.Board(VirtualClock()))
+    replayer = Replayer(board)
+    stats = Stats()
+
+    out = open(csv_path, "w", newline="") if csv_path else None
+    writer = None
+    if out is not None:
+        writer = csv.writer(out)
+        writer.writerow(["timestamp", "flags"] + list(reading.CHANNEL_KEYS) + ["rain_status", "igual"])
+    t0 = time.perf_counter()
+    for path in files:
+        replay_file(path, replayer, overrides, flash, stats, writer)
+    elapsed = time.perf_counter() - t0
+    if out is not None:
+        out.close()
+
+    print(f"✓ {stats.cycles} ciclos reproduzidos em {elapsed:.2f} s ({stats.cycles / elapsed:.0f} ciclos/s)")
+    print(f"Erros: BMP280 {stats.errors['bmp_error']}, DHT11 {stats.errors['dht_error']}, "
+          f"chuva {stats.errors['rain_error']}")
+    print(f"Sensor de chuva: {stats.rain_changes} trocas de estado")
+    underruns = sum(d.underruns for d in replayer.dht.values())
+    if underruns:
+        print(f"Aviso: {underruns} leituras do DHT11 além das gravadas")
+    if stats.compared:
+        total = sum(stats.mismatches) + stats.flag_mismatches
+        detail = ", ".join(f"{reading.CHANNEL_KEYS[ch]} {stats.mismatches[ch]} (máx. {stats.max_diff[ch]})"
+                           for ch in range(reading.NUM_CHANNELS) if stats.mismatches[ch])
+        if total:
+            print(f"✗ Diferenças em relação à placa: flags {stats.flag_mismatches}, {detail}")
+        else:
+            print(f"✓ {stats.compared} amostras idênticas às calculadas na placa")
+    if csv_path:
+        print(f"Amostras em {csv_path}")
+
+if __name__ == "__main__":
+    main()
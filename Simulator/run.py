@@ -0,0 +1,170 @@
+"""
+Roda o Display_data/display_data.py completo no CPython, com hardware simulado
+
+O main() da estação roda sem alterações sobre a placa simulada: BMP280
+(registradores), DHT11 e sensor de chuva seguem o clima sintético (ou
+uma série em CSV), o tempo é virtual e a flash é um diretório
+temporário. Resets do watchdog e machine.reset() reiniciam o programa
+como na placa, mantendo a memória RTC e a flash.
+
+Com servidor web ou MQTT o loop asyncio do CPython espera em tempo
+real; para testes longos deixe ENABLE_WEBSERVER e ENABLE_MQTT em False.
+
+Uso (na raiz do repositório):
+    python -m Simulator.run --cycles 5000 --set ENABLE_BMP280=True --no-display
+    python -m Simulator.run --cycles 2000 --dht-fail 0.05 --dht-hang 0.002 --verbose
+    python -m Simulator.run --weather serie.csv --set READ_INTERVAL_MS=2000
+    python -m Simulator.run --cycles 16000 --seed 2 --set RAIN_DIGITAL_PIN=35 --verbose
+"""
+import argparse
+import ast
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Módulos da biblioteca padrão carregados antes da troca do `time`
+import asyncio  # noqa: E402,F401
+import json  # noqa: E402,F401
+import random  # noqa: E402,F401
+import socket  # noqa: E402,F401
+
+from Simulator import board as sim_board  # noqa: E402
+from Simulator.clock import VirtualClock, WatchdogReset, MachineReset, DEFAULT_EPOCH  # noqa: E402
+from Simulator.models import (SyntheticWeather, CsvWeather, BMP280Model, DHT11Model, RainModel,  # noqa: E402
+                              RainComparator)
+
+PROJECT_DIRS = (os.path.join(ROOT, "Libraries"), os.path.join(ROOT, "Display_data"))
+
+def parse_override(text):
+    """NOME=VALOR (literal Python; texto se não for um literal)"""
+    name, _, value = text.partition("=")
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+def purge_project_modules():
+    """Descarta os módulos da estação (o próximo import é um boot do zero)"""
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None) or ""
+        if name == "display_data" or path.startswith(PROJECT_DIRS):
+            del sys.modules[name]
+
+def boot(flash, overrides):
+    """Importa o display_data como o main.py de um boot e aplica a configuração"""
+    purge_project_modules()
+    import display_data
+    for name, value in overrides:
+        if not hasattr(display_data, name):
+            raise SystemExit(f"Configuração desconhecida: {name}")
+        setattr(display_data, name, value)
+    # Caminhos absolutos da flash vão para o diretório simulado
+    for name in dir(display_data):
+        value = getattr(display_data, name)
+        if name.endswith("_DIR") and isinstance(value, str) and value.startswith("/"):
+            setattr(display_data, name, os.path.join(flash, value.lstrip("/")))
+    return display_data
+
+def build_board(args):
+    clock = VirtualClock(args.start)
+    board = sim_board.Board(clock, args.seed)
+    weather = CsvWeather(args.weather) if args.weather else SyntheticWeather(args.seed)
+    board.spi_present = not args.no_display
+    board.attach_i2c(args.bmp_addr, BMP280Model(weather, clock, fail_rate=args.i2c_fail, rng=board.rng))
+    return board, weather
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=1000, help="Ciclos de leitura a simular")
+    parser.add_argument("--set", action="append", default=[], metavar="NOME=VALOR",
+                        help="Altera uma configuração do display_data (pode repetir)")
+    parser.add_argument("--weather", help="Série do clima em CSV (t,temp_c,pressure_pa,humidity,rain)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--start", type=int, default=DEFAULT_EPOCH, help="Horário Unix inicial")
+    parser.add_argument("--bmp-addr", type=lambda s: int(s, 0), default=0x76)
+    parser.add_argument("--i2c-fail", type=float, default=0.0, help="Probabilidade de erro por transação I2C")
+    parser.add_argument("--dht-fail", type=float, default=0.0, help="Probabilidade de falha por leitura do DHT11")
+    parser.add_argument("--dht-hang", type=float, default=0.0, help="Probabilidade de o DHT11 travar (watchdog)")
+    parser.add_argument("--no-display", action="store_true",
+                        help="Simula o display desconectado (o desenho pixel a pixel domina o tempo real)")
+    parser.add_argument("--flash", help="Diretório da flash simulada (padrão: temporário)")
+    parser.add_argument("--verbose", action="store_true", help="Mostra a saída serial da estação")
+    args = parser.parse_args()
+
+    overrides = [parse_override(s) for s in args.set]
+    flash = os.path.abspath(args.flash or tempfile.mkdtemp(prefix="esp32_flash_"))
+    os.makedirs(flash, exist_ok=True)
+    os.chdir(flash)
+
+    board, weather = build_board(args)
+    sim_board.install(board)
+    for path in PROJECT_DIRS:
+        sys.path.insert(0, path)
+
+    clock = board.clock
+    station = {"module": None, "done": 0}
+
+    def finished():
+        module = station["module"]
+        return station["done"] + (module.loop_count if module is not None else 0) >= args.cycles
+    clock.stop = finished
+
+    resets = {"WDT": 0, "SOFT": 0, "DEEPSLEEP": 0}
+    serial = sys.stdout if args.verbose else open(os.path.join(flash, "serial.log"), "w")
+    dht_models = []
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(serial):
+        while True:
+            try:
+                module = boot(flash, overrides)
+                station["module"] = module
+                model = DHT11Model(weather, clock, args.dht_fail, args.dht_hang, board.rng)
+                dht_models.append(model)
+                board.attach_dht(module.DHT11_PIN, model)
+                rain = RainModel(weather, clock, rng=board.rng)
+                board.attach_adc(module.RAIN_SENSOR_PIN, rain)
+                if module.RAIN_DIGITAL_PIN is not None:
+                    # Saída DO ligada: comparador do módulo no pino configurado
+                    RainComparator(rain, board, module.RAIN_DIGITAL_PIN)
+                module.main()
+                break
+            except WatchdogReset:
+                print("\n*** RESET: watchdog ***\n")
+                resets["WDT"] += 1
+                cause = sim_board.WDT_RESET
+            except MachineReset as e:
+                print(f"\n*** RESET: causa {e.cause} ***\n")
+                resets["DEEPSLEEP" if e.cause == sim_board.DEEPSLEEP_RESET else "SOFT"] += 1
+                cause = e.cause
+            station["done"] += station["module"].loop_count
+            station["module"] = None
+            board.reboot(cause)
+    elapsed = time.perf_counter() - t0
+    if serial is not sys.stdout:
+        serial.close()
+
+    module = station["module"]
+    cycles = station["done"] + module.loop_count
+    virtual_s = clock.ns / 1e9
+    print(f"✓ {cycles} ciclos em {elapsed:.2f} s reais ({cycles / elapsed:.0f} ciclos/s), "
+          f"{virtual_s / 3600:.1f} h simuladas ({virtual_s / elapsed:.0f}x)")
+    print(f"Resets: {sum(resets.values())} (watchdog {resets['WDT']}, software {resets['SOFT']}, "
+          f"deep sleep {resets['DEEPSLEEP']})")
+    print(f"I2C: {board.i2c_transactions} transações, {board.i2c_bytes} bytes | "
+          f"SPI: {board.spi_writes} escritas, {board.spi_bytes // 1024} KB | ADC: {board.adc_reads} leituras")
+    print(f"DHT11: {sum(m.reads for m in dht_models)} leituras, {sum(m.errors for m in dht_models)} falhas, "
+          f"{sum(m.hangs for m in dht_models)} travamentos")
+    if module.history is not None:
+        used, capacity = module.history.usage()
+        print(f"Histórico: {used}/{capacity} registros")
+    if module.last_good_data:
+        print(f"Última leitura: {module.last_good_data}")
+    print(f"Flash simulada: {flash}" + ("" if args.verbose else " (saída serial em serial.log)"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Testes das bibliotecas da estação sobre a placa simulada
+
+A placa é instalada antes de qualquer import das bibliotecas, como em
+Simulator/run.py: `time` passa a ser o relógio virtual e machine,
+esp32, micropython vêm de Simulator/mpy. Cada teste usa um diretório
+temporário como flash; um "reset" é abandonar os objetos sem close()
+e abrir de novo sobre os mesmos arquivos.
+
+Uso (na raiz do repositório):
+    python -m pytest -q Simulator/tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from Simulator import board as sim_board  # noqa: E402
+from Simulator.clock import VirtualClock  # noqa: E402
+from Simulator.run import PROJECT_DIRS  # noqa: E402
+
+sim_board.install(sim_board.Board(VirtualClock()))
+for path in PROJECT_DIRS:
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+@pytest.fixture
+def board():
+    """Placa nova, com o relógio no início padrão do simulador"""
+    return sim_board.install(sim_board.Board(VirtualClock()))
+
+@pytest.fixture
+def flash(tmp_path, monkeypatch):
+    """Diretório da flash simulada (também o diretório atual)"""
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path)
@@ -0,0 +1,60 @@
+"""Regras de alerta (Libraries/alerts.py): histerese, duração e taxas"""
+import pytest
+
+import reading
+from alerts import AlertEngine
+
+T0 = 1748736000
+
+def engine(rules):
+    events = []
+    eng = AlertEngine(rules, lambda name, active, ts, value: events.append((name, active, ts - T0)))
+    return eng, events
+
+def feed(eng, values, key, step=10, start=0):
+    """Uma amostra a cada `step` s só com o canal `key` (valores nas unidades do canal)"""
+    ch = reading.CHANNEL_KEYS.index(key)
+    scale = reading.CHANNEL_SCALES[ch]
+    for i, v in enumerate(values):
+        row = [0] * reading.NUM_CHANNELS
+        row[ch] = int(round(v * scale))
+        eng.update(T0 + start + i * step, 1 << ch, row)
+
+def test_no_flapping_at_threshold():
+    eng, events = engine({"calor": ("dht_temp", "acima", 30, 28, 0)})
+    feed(eng, [29, 30.5, 29.5, 30.5, 29, 30.5, 28.5, 27.5, 30.5], "dht_temp")
+    # Ativa ao passar de 30, só desativa abaixo de 28
+    assert events == [("calor", True, 10), ("calor", False, 70), ("calor", True, 80)]
+
+def test_duration_filters_short_excursions():
+    eng, events = engine({"calor": ("dht_temp", "acima", 30, 28, 60)})
+    feed(eng, [31, 31, 31, 29, 31, 31, 31, 31, 31, 31, 31], "dht_temp")
+    # A primeira passagem dura 20 s; a segunda começa em 40 s e ativa em 100 s
+    assert events == [("calor", True, 100)]
+    assert eng.active() == ["calor"]
+
+def test_below_rule():
+    eng, events = engine({"seco": ("dht_humidity", "abaixo", 30, 35, 0)})
+    feed(eng, [40, 29, 33, 34.9, 35.1, 29.9], "dht_humidity")
+    assert events == [("seco", True, 10), ("seco", False, 40), ("seco", True, 50)]
+
+def test_pressure_drop_rate():
+    eng, events = engine({"tempestade": ("bmp_pressure", "desce", 200, 100, 0)})
+    # Queda de 300 Pa/h por 40 min e depois estável
+    falling = [100000 - 300 * i * 60 // 3600 for i in range(41)]
+    feed(eng, falling + [falling[-1]] * 40, "bmp_pressure", step=60)
+    assert [(name, active) for name, active, _ in events] == [("tempestade", True), ("tempestade", False)]
+    assert events[0][2] == 600                  # Primeira janela de 10 min fechada
+    assert events[1][2] == 3000                 # Primeira janela estável
+
+def test_unchanged_value_is_skipped():
+    eng, events = engine({"calor": ("dht_temp", "acima", 30, 28, 0),
+                          "frio": ("dht_temp", "abaixo", 5, 7, 0)})
+    feed(eng, [20] * 50, "dht_temp")
+    assert eng.evaluated == 2
+    assert eng.skipped == 2 * 49
+    assert events == []
+
+def test_exit_outside_entry_is_rejected():
+    with pytest.raises(ValueError):
+        AlertEngine({"calor": ("dht_temp", "acima", 30, 32, 0)})
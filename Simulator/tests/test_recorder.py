@@ -0,0 +1,49 @@
+"""Gravação dos dados brutos (Libraries/recorder.py): o que sobrevive a um reset"""
+import reading
+from recorder import Recorder, PAGE_SIZE, EV_SAMPLE
+from Simulator.replay import read_events
+
+class CommitFile:
+    """Arquivo como no littlefs: write() só fica na flash depois de flush()/close()"""
+    def __init__(self):
+        self.pending = bytearray()
+        self.committed = bytearray()
+
+    def write(self, data):
+        self.pending += data
+        return len(data)
+
+    def flush(self):
+        self.committed += self.pending
+        self.pending = bytearray()
+
+    def close(self):
+        self.flush()
+
+PER_CYCLE = 5 + 1 + reading.RECORD_SIZE     # EV_CYCLE + EV_SAMPLE
+
+def record(rec, n):
+    values = [2000, 100000, 2100, 6000, 3500]
+    for i in range(n):
+        rec.cycle(1748736000 + i)
+        rec.sample(1748736000 + i, 31, values)
+
+def test_reset_loses_at_most_the_current_page():
+    f = CommitFile()
+    rec = Recorder(f)
+    cycles = 3 * PAGE_SIZE // PER_CYCLE
+    record(rec, cycles)
+    # Reset sem close(): só o que passou por flush() sobrevive
+    assert len(f.committed) == rec.written
+    events = read_events(bytes(f.committed))
+    samples = sum(1 for kind, _ in events if kind == EV_SAMPLE)
+    assert samples >= cycles - PAGE_SIZE // PER_CYCLE - 1
+
+def test_file_on_flash(flash):
+    rec = Recorder.open(flash + "/rec/rec0001.rpl")
+    record(rec, 3 * PAGE_SIZE // PER_CYCLE)
+    # Sem close(): o arquivo já tem as páginas completas
+    with open(flash + "/rec/rec0001.rpl", "rb") as f:
+        data = f.read()
+    assert len(data) == rec.written > PAGE_SIZE
+    rec.close()
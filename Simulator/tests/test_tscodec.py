@@ -0,0 +1,48 @@
+"""Codec delta + varint (Libraries/tscodec.py): ida e volta sem perdas"""
+import random
+
+import pytest
+
+import reading
+import tscodec
+
+def series(n, seed=1):
+    rnd = random.Random(seed)
+    ts = 1748736000
+    values = [2000, 100000, 2100, 6000, 3500]
+    for i in range(n):
+        # Intervalo irregular, canais faltando e saltos grandes
+        ts += rnd.choice((10, 10, 10, 9, 11, 60))
+        flags = 31 if rnd.random() > 0.05 else rnd.randrange(32)
+        values = [v + rnd.randint(-50, 50) for v in values]
+        if i == n // 2:
+            values[1] = -values[1]
+        yield (ts, flags) + tuple(values)
+
+@pytest.mark.parametrize("value", [0, 1, -1, 63, -64, 64, 2**31 - 1, -2**31])
+def test_zigzag_varint(value):
+    out = bytearray()
+    tscodec.write_varint(out, tscodec.zigzag(value))
+    n, pos = tscodec.read_varint(out, 0)
+    assert pos == len(out)
+    assert tscodec.unzigzag(n) == value
+
+def test_round_trip():
+    records = list(series(2000))
+    assert list(tscodec.decode(tscodec.encode(records))) == records
+
+def test_round_trip_clock_step_back():
+    # Relógio volta para perto de 2000 (boot sem hora) e depois é corrigido
+    records = [(1748736000, 31, 1, 2, 3, 4, 5), (1748736010, 31, 1, 2, 3, 4, 5),
+               (12, 31, 1, 2, 3, 4, 5), (22, 0, 0, 0, 0, 0, 0),
+               (1748736100, 31, 1, 2, 3, 4, 5)]
+    assert list(tscodec.decode(tscodec.encode(records))) == records
+
+def test_regular_samples_are_compact():
+    records = list(series(1000))
+    encoded = tscodec.encode(records)
+    assert len(encoded) < len(records) * reading.RECORD_SIZE / 2
+
+def test_bad_header():
+    with pytest.raises(ValueError):
+        list(tscodec.decode(b"XX\x01\x05"))
@@ -0,0 +1,88 @@
+"""Log circular na flash (Libraries/tslog.py): recuperação depois de um reset e consultas"""
+import os
+
+from tslog import TimeSeriesLog, LOG_RECORD_SIZE
+
+T0 = 1748736000
+VALUES = [2000, 100000, 2100, 6000, 3500]
+
+def open_log(path):
+    return TimeSeriesLog(path, segments=4, segment_size=8192, flush_records=8)
+
+def append(log, start, n):
+    for i in range(start, start + n):
+        log.append(T0 + i, 31, [v + i for v in VALUES])
+
+def seqs(log):
+    return [rec[0] for rec in log.scan()]
+
+def test_reset_keeps_flushed_records(flash):
+    log = open_log(os.path.join(flash, "log"))
+    append(log, 0, 21)
+    # Reset sem close(): os 5 registros ainda em RAM se perdem
+    log = open_log(os.path.join(flash, "log"))
+    assert log.next_seq == 16
+    assert seqs(log) == list(range(16))
+    append(log, 16, 4)
+    assert seqs(log) == list(range(20))
+
+def test_recovery_after_wraparound(flash):
+    log = open_log(os.path.join(flash, "log"))
+    capacity = log.segments * log.records_per_segment
+    append(log, 0, capacity + 300)
+    log.close()
+    log = open_log(os.path.join(flash, "log"))
+    assert log.next_seq == capacity + 300
+    # O segmento em escrita foi reciclado: sobram os 3 mais recentes completos
+    found = seqs(log)
+    assert found == list(range(found[0], capacity + 300))
+    assert found[0] == capacity + 300 - 3 * log.records_per_segment - 300 % log.records_per_segment
+    rec = next(r for r in log.scan() if r[0] == capacity + 299)
+    assert rec[1] == T0 + capacity + 299
+    assert list(rec[3:]) == [v + capacity + 299 for v in VALUES]
+
+def test_partial_flush_then_reset(flash):
+    log = open_log(os.path.join(flash, "log"))
+    append(log, 0, 3)
+    log.flush()                 # Flush parcial (como no Ctrl+C)
+    append(log, 3, 13)          # Completa o bloco alinhado em 8 e mais um
+    log = open_log(os.path.join(flash, "log"))
+    assert seqs(log) == list(range(16))
+
+def test_torn_record_is_dropped(flash):
+    path = os.path.join(flash, "log")
+    log = open_log(path)
+    append(log, 0, 16)
+    log.close()
+    # Escrita interrompida: o último registro ficou pela metade
+    with open(os.path.join(path, "seg00.bin"), "r+b") as f:
+        f.seek(15 * LOG_RECORD_SIZE + 10)
+        f.write(b"\xff" * 6)
+    log = open_log(path)
+    assert log.next_seq == 15
+    assert seqs(log) == list(range(15))
+
+def test_range_query_matches_scan(flash):
+    log = open_log(os.path.join(flash, "log"))
+    append(log, 0, 1000)
+    all_records = list(log.scan())
+    for t0, t1 in ((T0, T0 + 10), (T0 + 123, T0 + 777), (T0 + 990, None), (T0 - 5, T0 + 3)):
+        expected = [r for r in all_records if r[1] >= t0 and (t1 is None or r[1] < t1)]
+        assert list(log.query(t0, t1)) == expected
+    # Inclui as amostras ainda em RAM
+    assert [r[0] for r in log.last(5, T0 + 999)] == list(range(994, 1000))
+
+def test_clock_step_back_opens_epoch(flash):
+    path = os.path.join(flash, "log")
+    log = open_log(path)
+    append(log, 0, 100)
+    # Boot sem hora: o relógio recomeça perto de 2000
+    for i in range(20):
+        log.append(100 + i, 31, VALUES)
+    assert log.epoch_seq == 100
+    assert [r[1] for r in log.scan()] == list(range(100, 120))
+    log.close()
+    # A época é recuperada no boot pelo índice
+    log = open_log(path)
+    assert log.epoch_seq == 100
+    assert [r[0] for r in log.scan()] == list(range(100, 120))
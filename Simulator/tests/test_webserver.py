@@ -0,0 +1,44 @@
+"""Servidor HTTP (Libraries/webserver.py): eventos SSE de leitura, alerta e ping"""
+import asyncio
+
+from webserver import WebServer, _PING
+from alerts import event_json
+
+VALUES = [2000, 100000, 2100, 6000, 3500]
+
+async def _read_stream(server, port, rounds):
+    await server.start("127.0.0.1")
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: x\r\n\r\n")
+    await writer.drain()
+    for step in rounds:
+        step()
+        await asyncio.sleep(0.15)
+    writer.close()
+    data = b""
+    try:
+        while True:
+            chunk = await asyncio.wait_for(reader.read(4096), 0.2)
+            if not chunk:
+                break
+            data += chunk
+    except asyncio.TimeoutError:
+        pass
+    # O handler percebe a desconexão no próximo ping
+    await asyncio.sleep(0.3)
+    server.close()
+    return data
+
+def test_sse_alert_and_ping_not_counted(flash):
+    server = WebServer(18091, ping_s=0.1)
+
+    def reading():
+        server.alert(event_json(1000, "Chuva", True, 900))
+        server.publish(1000, 31, VALUES)
+
+    data = asyncio.run(_read_stream(server, 18091, [reading, lambda: None, lambda: None]))
+    assert b"event: alert\ndata: {" in data
+    assert data.index(b"event: alert") < data.index(b"\ndata: {\"ts\"")
+    assert _PING in data
+    # Só o evento da leitura conta; os pings de keep-alive não
+    assert server.events_sent == 1
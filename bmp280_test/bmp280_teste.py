@@ -7,9 +7,10 @@ import time
 import gc
 
 # Importações de sensores
-# Presumindo que você tenha os arquivos bmp280.py e dht11.py na placa
+# Presumindo que você tenha os arquivos bmp280.py, dht11.py e derived.py na placa
 from bmp280 import BMP280
 from dht11 import DHT11
+from derived import Derived, comfort, COMFORT_LABELS
 
 # Configurações
 BMP280_SCL_PIN = 22      # GPIO para SCL do BMP280
@@ -21,6 +22,9 @@ BMP280_ADDR = 0x76       # Endereço padrão do BMP280 (use 0x77 se necessário)
 SEA_LEVEL_PRESSURE = 101325  # 1013.25 hPa (padrão)
 MAX_INIT_RETRIES = 3     # Número máximo de tentativas de inicialização
 
+# Grandezas derivadas (cache pelas leituras quantizadas)
+derived = Derived()
+
 def setup_sensors():
     """Configura e inicializa ambos os sensores com mais tentativas"""
     sensors = {}
@@ -188,30 +192,6 @@ def display_readings(readings):
     
     print("-----------------------------------------")
 
-def calculate_heat_index(temperature, humidity):
-    """
-    Calcula o índice de calor (sensação térmica) com base na temperatura e umidade
-    Temperature em Celsius, umidade em porcentagem
-    """
-    if temperature is None or humidity is None:
-        return None
-    
-    # Converter para Fahrenheit para o cálculo
-    tempF = temperature * 9/5 + 32
-    
-    # Fórmula simplificada do índice de calor
-    hi = 0.5 * (tempF + 61.0 + ((tempF - 68.0) * 1.2) + (humidity * 0.094))
-    
-    # Se estiver realmente quente, use a fórmula completa
-    if hi > 80:
-        hi = -42.379 + 2.04901523 * tempF + 10.14333127 * humidity
-        hi = hi - 0.22475541 * tempF * humidity - 6.83783e-3 * tempF**2
-        hi = hi - 5.481717e-2 * humidity**2 + 1.22874e-3 * tempF**2 * humidity
-        hi = hi + 8.5282e-4 * tempF * humidity**2 - 1.99e-6 * tempF**2 * humidity**2
-    
-    # Converter de volta para Celsius
-    return (hi - 32) * 5/9
-
 def display_environmental_analysis(readings):
     """Exibe uma análise ambiental com base nas leituras"""
     temp_bmp = readings['temp_bmp']
@@ -224,24 +204,16 @@ def display_environmental_analysis(readings):
     
     print("\n=== Análise Ambiental ===")
     
-    # Calcular sensação térmica se possível
+    # Calcular sensação térmica e ponto de orvalho se possível
     if temp_dht is not None and humidity is not None:
-        heat_index = calculate_heat_index(temp_dht, humidity)
+        heat_index, dew, abs_hum, _ = derived.compute(temp_dht, humidity)
         print(f"Sensação térmica: {format_reading(heat_index)} °C")
+        print(f"Ponto de orvalho: {format_reading(dew)} °C")
+        print(f"Umidade absoluta: {format_reading(abs_hum)} g/m³")
     
     # Análise de conforto
     if humidity is not None and temp is not None:
-        if 40 <= humidity <= 60:
-            if 20 <= temp <= 26:
-                print("Condição: Confortável")
-            elif temp < 20:
-                print("Condição: Um pouco fria")
-            else:
-                print("Condição: Um pouco quente")
-        elif humidity < 40:
-            print("Condição: Ar seco")
-        else:
-            print("Condição: Úmido")
+        print(f"Condição: {COMFORT_LABELS[comfort(temp, humidity)]}")
     
     # Tendência de clima baseada na pressão
     if pressure is not None: